@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from paw_drf.conditional import bump_validator_version
+from .models import Discussion, AIComment
+
+
+# 토론 목록(DiscussionList)에 AI 댓글이 중첩되어 있으므로 둘 다 목록 ETag 버전을 올립니다.
+@receiver(post_save, sender=Discussion)
+@receiver(post_delete, sender=Discussion)
+@receiver(post_save, sender=AIComment)
+@receiver(post_delete, sender=AIComment)
+def bump_discussion_list_version(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_validator_version('discussion'))
@@ -1,14 +1,18 @@
 from rest_framework import generics, permissions
+from paw_drf.conditional import ConditionalResponseMixin
 from .models import Discussion
 from .serializers import DiscussionSerializer
 from .permissions import IsAdminUserOrReadOnly
 from .tasks import generate_ai_comments
 
-class DiscussionList(generics.ListCreateAPIView):
+class DiscussionList(ConditionalResponseMixin, generics.ListCreateAPIView):
     queryset = Discussion.objects.all()
     serializer_class = DiscussionSerializer
     permission_classes = [IsAdminUserOrReadOnly]
 
+    # 토론과 중첩된 AI 댓글이 바뀌면 signals 에서 버전을 올립니다.
+    validator_versions = ('discussion',)
+
     def perform_create(self, serializer):
         discussion = serializer.save(author=self.request.user)
         generate_ai_comments.delay(discussion.id)
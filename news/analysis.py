@@ -0,0 +1,141 @@
+import asyncio
+import json
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from reports.schemas import NewsItemAnalysis, SchemaError, parse_json, validate_response
+from reports.services.llm_cache import llm_cache
+from reports.services.openai_client import get_async_openai_client, run_async
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = "너는 뉴스 분석 전문가야. 그리고 암호화폐에 대해 잘 알고 있어. 또한 번역도 가능해."
+
+# 분석 결과를 NewsItem 필드로 옮길 때 사용하는 필드 목록
+ANALYSIS_FIELDS = ['ai_analysis', 'translated_title', 'translated_content', 'impact', 'tickers', 'updated_at']
+
+
+def build_batch_prompt(news_items):
+    articles = [
+        {"id": item.id, "title": item.title, "content": item.content}
+        for item in news_items
+    ]
+    return f"""
+    아래 JSON 배열은 암호화폐 관련 뉴스 목록입니다. 각 기사를 분석하여 다음 정보를 제공해주세요:
+    1. 번역된 제목과 내용
+    2. 뉴스의 전반적인 감정 (Bull, Bear, Neutral 중 하나)
+    3. 뉴스에서 언급된 암호화폐 티커 심볼 (없으면 빈 리스트)
+    4. 이 뉴스가 암호화폐 시장에 미칠 수 있는 영향 (낮음, 중간, 높음 중 하나)
+    5. AI 분석 결과 (짧은 코멘트)
+
+    반드시 입력 기사의 id 를 그대로 포함하여, 기사마다 하나씩 다음 JSON 형식으로만 응답해주세요:
+    {{
+        "results": [
+            {{
+                "id": 1,
+                "translated_title": "번역된 제목",
+                "translated_content": "번역된 내용",
+                "market_sentiment": "Bull",
+                "tickers": ["BTC", "ETH"],
+                "impact": "높음",
+                "ai_analysis": "짧은코멘트"
+            }}
+        ]
+    }}
+
+    기사 목록:
+    {json.dumps(articles, ensure_ascii=False)}
+    """
+
+
+def apply_analysis(news_item, analysis):
+    """
+    분석 결과 dict 를 NewsItem 필드에 반영합니다. 저장은 호출하는 쪽에서 합니다.
+    """
+    news_item.ai_analysis = analysis
+    news_item.translated_title = analysis.get('translated_title', '')[:500]
+    news_item.translated_content = analysis.get('translated_content', '')
+    news_item.impact = analysis.get('impact', '')[:50]
+    news_item.tickers = ','.join(analysis.get('tickers', []))[:100]
+    news_item.updated_at = timezone.now()
+    return news_item
+
+
+def _parse_batch_results(content):
+    # 기사 하나가 스키마에 맞지 않아도 나머지 결과는 사용합니다.
+    data = parse_json(content)
+    results = data.get('results', []) if isinstance(data, dict) else []
+    parsed = []
+    for result in results:
+        try:
+            parsed.append(validate_response(NewsItemAnalysis, result))
+        except SchemaError as e:
+            logger.warning(f"Skipping invalid news analysis result: {e}")
+    return parsed
+
+
+async def _analyze_batch(client, semaphore, batch):
+    async with semaphore:
+        request = dict(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": build_batch_prompt(batch)}
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=500 * len(batch)
+        )
+        attempts = getattr(settings, 'OPENAI_SCHEMA_ATTEMPTS', 2)
+        results = []
+        for attempt in range(1, attempts + 1):
+            try:
+                content = await llm_cache.acompletion(client, **request)
+            except Exception as e:
+                logger.error(f"Error in OpenAI batch analysis ({len(batch)} items): {str(e)}")
+                return {}
+            try:
+                results = _parse_batch_results(content)
+                break
+            except SchemaError as e:
+                # 복구로도 읽을 수 없는 응답만 다시 요청합니다.
+                await llm_cache.ainvalidate(**request)
+                logger.error(f"Invalid OpenAI batch analysis ({attempt}/{attempts}, {len(batch)} items): {str(e)}")
+
+    expected_ids = {item.id for item in batch}
+    analyses = {}
+    for result in results:
+        if result.id in expected_ids:
+            analyses[result.id] = result.model_dump(exclude={'id'})
+    missing = expected_ids - analyses.keys()
+    if missing:
+        logger.warning(f"Batch analysis returned no result for news items {sorted(missing)}")
+    return analyses
+
+
+async def analyze_news_items_async(news_items, batch_size=None, concurrency=None):
+    """
+    뉴스 아이템들을 batch_size 개씩 묶어 한 번의 프롬프트로 분석하고,
+    최대 concurrency 개의 배치를 동시에 요청합니다.
+
+    Returns:
+        dict: NewsItem id -> 분석 결과 dict
+    """
+    batch_size = batch_size or getattr(settings, 'NEWS_ANALYSIS_BATCH_SIZE', 8)
+    concurrency = concurrency or getattr(settings, 'NEWS_ANALYSIS_CONCURRENCY', 4)
+    news_items = list(news_items)
+    batches = [news_items[i:i + batch_size] for i in range(0, len(news_items), batch_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    client = get_async_openai_client()
+    batch_results = await asyncio.gather(*(_analyze_batch(client, semaphore, batch) for batch in batches))
+
+    analyses = {}
+    for result in batch_results:
+        analyses.update(result)
+    return analyses
+
+
+def analyze_news_items(news_items, **kwargs):
+    return run_async(analyze_news_items_async(news_items, **kwargs))
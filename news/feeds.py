@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; paw_drf-rss/1.0)"
+
+
+def _conditional_headers(feed):
+    headers = {}
+    if feed.etag:
+        headers['If-None-Match'] = feed.etag
+    if feed.last_modified:
+        headers['If-Modified-Since'] = feed.last_modified
+    return headers
+
+
+async def _fetch_feed(client, semaphore, feed, timeout):
+    async with semaphore:
+        try:
+            # 느린 피드 하나가 전체를 붙잡지 않도록 피드별 전체 소요 시간에 상한을 둡니다.
+            response = await asyncio.wait_for(
+                client.get(feed.url, headers=_conditional_headers(feed)),
+                timeout=timeout,
+            )
+            if response.status_code != 304:
+                response.raise_for_status()
+            return feed, response
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout fetching feed {feed.name} ({timeout}s)")
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching feed {feed.name}: {str(e)}")
+        except Exception as e:
+            # 잘못된 URL(httpx.InvalidURL) 등 예상하지 못한 오류도 이 피드만 실패로 처리해 gather 가 중단되지 않게 합니다.
+            logger.exception(f"Unexpected error fetching feed {feed.name}: {str(e)}")
+        return feed, None
+
+
+async def fetch_feeds(feeds, concurrency=None, timeout=None):
+    """
+    RSS 피드들을 동시에 내려받습니다. 저장된 ETag / Last-Modified 로 조건부 요청을 보냅니다.
+
+    Args:
+        feeds (list): News 객체 리스트
+        concurrency (int): 동시에 요청할 최대 피드 수
+        timeout (float): 피드별 최대 소요 시간(초)
+
+    Returns:
+        list: (feed, httpx.Response 또는 실패 시 None) 튜플 리스트. 입력 순서를 유지합니다.
+              변경이 없는 피드는 status_code 304 응답입니다.
+    """
+    concurrency = concurrency or getattr(settings, 'NEWS_FETCH_CONCURRENCY', 10)
+    timeout = timeout or getattr(settings, 'NEWS_FETCH_TIMEOUT', 15)
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        headers={'User-Agent': USER_AGENT},
+        follow_redirects=True,
+        timeout=timeout,
+        limits=limits,
+    ) as client:
+        return await asyncio.gather(*(_fetch_feed(client, semaphore, feed, timeout) for feed in feeds))
+
+
+def fetch_feeds_sync(feeds, **kwargs):
+    return asyncio.run(fetch_feeds(feeds, **kwargs))
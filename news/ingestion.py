@@ -0,0 +1,89 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from paw_drf.conditional import bump_validator_version
+from .models import NewsItem
+
+logger = logging.getLogger(__name__)
+
+# 피드에서 다시 받아왔을 때 갱신 대상이 되는 필드 (AI 분석 결과 필드는 건드리지 않음)
+UPSERT_FIELDS = ['feed', 'title', 'content', 'published_date', 'image_url']
+
+
+def _field_value(obj, field):
+    # feed 는 객체 비교 대신 id 로 비교해 추가 쿼리를 막습니다.
+    return obj.feed_id if field == 'feed' else getattr(obj, field)
+
+
+def _existing_items(links):
+    return {item.link: item for item in NewsItem.objects.filter(link__in=links).only('id', 'link', *UPSERT_FIELDS)}
+
+
+def upsert_news_items(items, batch_size=500):
+    """
+    피드에서 파싱한 NewsItem 들을 link 기준으로 한 번에 저장합니다.
+
+    - 이미 저장된 link 는 한 번의 쿼리로 미리 불러옵니다.
+    - 새 link 는 bulk_create, 내용이 바뀐 항목만 bulk_update 합니다.
+    - 바뀐 것이 없는 항목은 어떤 쿼리도 만들지 않습니다.
+    - 미리 불러온 뒤 다른 실행(beat 와 수동 실행이 겹친 경우)이 같은 link 를 먼저 저장했으면
+      INSERT 가 충돌 대신 UPSERT_FIELDS 를 갱신하며, 그 행도 생성된 항목으로 반환됩니다.
+
+    Args:
+        items (list): 저장되지 않은 NewsItem 객체 리스트
+        batch_size (int): bulk 쿼리 한 번에 보낼 최대 행 수
+
+    Returns:
+        tuple: (새로 생성된 NewsItem 리스트, 갱신된 행 수)
+    """
+    by_link = {}
+    for item in items:
+        by_link[item.link] = item  # 같은 link 가 여러 번 나오면 마지막 항목을 사용
+
+    if not by_link:
+        return [], 0
+
+    existing = _existing_items(list(by_link))
+
+    to_create = []
+    to_update = []
+    changed_fields = set()
+    for link, item in by_link.items():
+        current = existing.get(link)
+        if current is None:
+            to_create.append(item)
+            continue
+        changed = [field for field in UPSERT_FIELDS if _field_value(current, field) != _field_value(item, field)]
+        if changed:
+            for field in changed:
+                setattr(current, field, getattr(item, field))
+            current.updated_at = timezone.now()  # bulk_update 는 auto_now 를 채우지 않습니다.
+            changed_fields.update(changed + ['updated_at'])
+            to_update.append(current)
+
+    if not to_create and not to_update:
+        logger.info(f"NewsItem upsert: {len(by_link)} unchanged")
+        return [], 0
+
+    with transaction.atomic():
+        created = NewsItem.objects.bulk_create(
+            to_create,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['link'],
+            update_fields=UPSERT_FIELDS + ['updated_at'],
+        )
+        if to_update:
+            NewsItem.objects.bulk_update(to_update, sorted(changed_fields), batch_size=batch_size)
+        # bulk 쿼리는 시그널이 없으므로 뉴스 목록 ETag 버전을 직접 올립니다.
+        transaction.on_commit(lambda: bump_validator_version('news'))
+
+    if any(item.pk is None for item in created):
+        # update_conflicts 를 쓰면 Django 4.2 는 pk 를 채우지 않으므로 생성된 행을 다시 조회합니다.
+        created = list(NewsItem.objects.filter(link__in=[item.link for item in created]))
+
+    logger.info(f"NewsItem upsert: {len(created)} created, {len(to_update)} updated, "
+                f"{len(by_link) - len(created) - len(to_update)} unchanged")
+    return created, len(to_update)
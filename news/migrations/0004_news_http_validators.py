@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_alter_news_name_alter_news_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='etag',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='last_modified',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2 on 2026-10-18 09:58
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# 중복 행을 지울 때 남길 행으로 옮기는 AI 분석 결과 필드
+ANALYSIS_FIELDS = ['translated_title', 'translated_content', 'impact', 'tickers', 'ai_analysis']
+
+
+def remove_duplicate_links(apps, schema_editor):
+    """
+    unique 제약을 걸기 전에 같은 link 의 중복 행을 가장 먼저 저장된 행 하나로 합칩니다.
+    남길 행에 AI 분석 결과가 없으면 분석된 중복 행의 결과를 옮긴 뒤 나머지 행을 삭제합니다.
+    삭제된 행은 되돌리지 않습니다. (역방향 마이그레이션은 제약만 제거합니다)
+    """
+    NewsItem = apps.get_model('news', 'NewsItem')
+    duplicate_links = list(
+        NewsItem.objects.values('link').annotate(count=Count('id')).filter(count__gt=1).values_list('link', flat=True)
+    )
+    merged = deleted = 0
+    for link in duplicate_links:
+        keep, *duplicates = NewsItem.objects.filter(link=link).order_by('id')
+        if keep.ai_analysis is None:
+            analyzed = next((item for item in duplicates if item.ai_analysis is not None), None)
+            if analyzed is not None:
+                for field in ANALYSIS_FIELDS:
+                    setattr(keep, field, getattr(analyzed, field))
+                keep.save(update_fields=ANALYSIS_FIELDS)
+                merged += 1
+        deleted += NewsItem.objects.filter(id__in=[item.id for item in duplicates]).delete()[1].get('news.NewsItem', 0)
+    if deleted:
+        print(f"\n  중복 link {len(duplicate_links)}개: NewsItem {deleted}개 삭제, 분석 결과 {merged}개 병합")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_news_http_validators'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_links, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='newsitem',
+            name='link',
+            field=models.TextField(unique=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_newsitem_link_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsitem',
+            index=models.Index(fields=['-published_date'], name='newsitem_published_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-18 10:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_newsitem_newsitem_published_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsitem',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='newsitem',
+            index=models.Index(fields=['-updated_at'], name='newsitem_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 10:50
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_newsitem_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='newsitem',
+            name='newsitem_updated_idx',
+        ),
+    ]
@@ -4,16 +4,26 @@ class News(models.Model):
     name = models.CharField(max_length=500)
     url = models.TextField(unique=True)
     is_active = models.BooleanField(default=True)
+    # 조건부 요청(304)용 HTTP 검증자와 마지막으로 처리한 본문의 해시
+    etag = models.CharField(max_length=255, blank=True, default='')
+    last_modified = models.CharField(max_length=100, blank=True, default='')
+    content_hash = models.CharField(max_length=64, blank=True, default='')
 
 class NewsItem(models.Model):
     feed = models.ForeignKey(News, on_delete=models.CASCADE, related_name='news_items')
     title = models.CharField(max_length=500)
     content = models.TextField()
     published_date = models.DateTimeField()
-    link = models.TextField()
+    link = models.TextField(unique=True)
     translated_title = models.CharField(max_length=500, blank=True)
     translated_content = models.TextField(blank=True)
     impact = models.CharField(max_length=50, blank=True)
     tickers = models.CharField(max_length=100, blank=True)
     image_url = models.TextField(blank=True, null=True)
     ai_analysis = models.JSONField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)  # bulk_update 시에는 직접 채워야 합니다.
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-published_date'], name='newsitem_published_idx'),
+        ]
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from paw_drf.conditional import bump_validator_version
+from .models import NewsItem
+
+
+# 뉴스 목록(NewsListView) ETag 버전. bulk_create / bulk_update 경로는 호출한 쪽에서 직접 올립니다.
+@receiver(post_save, sender=NewsItem)
+@receiver(post_delete, sender=NewsItem)
+def bump_news_list_version(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_validator_version('news'))
@@ -1,40 +1,63 @@
 from celery import shared_task
-from django.conf import settings
 from pytz import timezone
 from datetime import datetime
 import feedparser
-import openai
 import logging
-import json
+import hashlib
+from paw_drf.conditional import bump_validator_version
 from .models import NewsItem, News
-
-openai.api_key = settings.OPENAI_API_KEY
+from .feeds import fetch_feeds_sync
+from .ingestion import upsert_news_items
+from .analysis import analyze_news_items, apply_analysis, ANALYSIS_FIELDS
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_FEEDS = [
+    {'name': 'CoinDesk', 'url': 'https://www.coindesk.com/arc/outboundfeeds/rss/'},
+    {'name': 'Cointelegraph', 'url': 'https://cointelegraph.com/rss'}
+]
+
 @shared_task
 def fetch_crypto_news():
-    feeds = News.objects.filter(is_active=True)
-    if not feeds.exists():
-        default_feeds = [
-            {'name': 'CoinDesk', 'url': 'https://www.coindesk.com/arc/outboundfeeds/rss/'},
-            {'name': 'Cointelegraph', 'url': 'https://cointelegraph.com/rss'}
+    feeds = list(News.objects.filter(is_active=True))
+    if not feeds:
+        feeds = [
+            News.objects.get_or_create(name=feed['name'], defaults={'url': feed['url'], 'is_active': True})[0]
+            for feed in DEFAULT_FEEDS
         ]
-    else:
-        default_feeds = [{'name': feed.name, 'url': feed.url} for feed in feeds]
 
     kr_tz = timezone('Asia/Seoul')
-    news_items = []
+    parsed_items = []
+    processed_feeds = []
+
+    # 모든 피드를 동시에 내려받은 뒤, 받은 바이트를 순서대로 파싱합니다.
+    fetched_feeds = fetch_feeds_sync(feeds)
+
+    for feed, response in fetched_feeds:
+        if response is None:
+            continue
+
+        if response.status_code == 304:
+            logger.info(f"Feed {feed.name} not modified, skipping")
+            continue
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        feed.etag = response.headers.get('ETag', '')
+        feed.last_modified = response.headers.get('Last-Modified', '')
+        if content_hash == feed.content_hash:
+            # 검증자를 지원하지 않는 피드도 본문이 같으면 파싱과 DB 작업을 건너뜁니다.
+            logger.info(f"Feed {feed.name} content unchanged, skipping")
+            feed.save(update_fields=['etag', 'last_modified'])
+            continue
 
-    for feed in default_feeds:
         try:
-            parsed_feed = feedparser.parse(feed['url'])
+            parsed_feed = feedparser.parse(response.content)
         except Exception as e:
-            print(f"Error parsing feed {feed['name']}: {str(e)}")
+            print(f"Error parsing feed {feed.name}: {str(e)}")
             continue
 
         if not parsed_feed.entries:  # entries가 비어있다면 넘어가기
-            print(f"No entries found for feed {feed['name']}")
+            print(f"No entries found for feed {feed.name}")
             continue
 
         for entry in parsed_feed.entries:
@@ -44,7 +67,7 @@ def fetch_crypto_news():
 
             # Time parsing 부분에서 예외 처리 추가
             try:
-                if feed['name'] == 'CoinDesk':
+                if feed.name == 'CoinDesk':
                     utc_time = datetime(*entry.published_parsed[:6])
                 else:  # Cointelegraph
                     utc_time = datetime.strptime(entry.published, "%a, %d %b %Y %H:%M:%S %z")
@@ -54,46 +77,57 @@ def fetch_crypto_news():
                 print(f"Error processing time for entry {title}: {str(e)}")
                 continue  # 시간을 처리할 수 없으면 다음으로 넘어가기
 
-            image_url = extract_image_url(entry, feed['name'])
-
-            news_feed, _ = News.objects.get_or_create(name=feed['name'], defaults={'url': feed['url'], 'is_active': True})
+            image_url = extract_image_url(entry, feed.name)
 
-            news_item, created = NewsItem.objects.update_or_create(
+            parsed_items.append(NewsItem(
+                feed=feed,
                 link=link,
-                defaults={
-                    'feed': news_feed,
-                    'title': title,
-                    'content': summary,
-                    'published_date': published,
-                    'image_url': image_url
-                }
-            )
-
-            if created:  # 새로 생성된 경우에만
-                news_items.append(news_item)
-
-                # 필드 길이 로그 출력
-                logger.info(f"Title length: {len(news_item.title)}")
-                logger.info(f"Content length: {len(news_item.content)}")
-                logger.info(f"Published date: {news_item.published_date}")
-                logger.info(f"Link length: {len(news_item.link)}")
-                logger.info(f"Image URL length: {len(news_item.image_url) if news_item.image_url else 0}")
-
-                # OpenAI 분석 수행
-                try:
-                    analysis_result = analyze_with_openai(news_item)
-                    if analysis_result:
-                        news_item.ai_analysis = analysis_result
-                        news_item.translated_title = analysis_result.get('translated_title', '')
-                        news_item.translated_content = analysis_result.get('translated_content', '')
-                        news_item.impact = analysis_result.get('impact', '')
-                        news_item.tickers = ','.join(analysis_result.get('tickers', []))
-                        news_item.save()
-                except Exception as e:
-                    print(f"Error analyzing news item {title}: {str(e)}")
-
-    return f"{len(news_items)} new items fetched, saved, and analyzed."
+                title=title,
+                content=summary,
+                published_date=published,
+                image_url=image_url
+            ))
+
+        # 항목 저장이 끝난 뒤에 검증자와 해시를 저장해야 실패한 피드를 다음 실행에서 다시 처리합니다.
+        feed.content_hash = content_hash
+        processed_feeds.append(feed)
+
+    # 모든 피드의 항목을 link 기준으로 한 번에 upsert 합니다.
+    news_items, _ = upsert_news_items(parsed_items)
+    if processed_feeds:
+        News.objects.bulk_update(processed_feeds, ['etag', 'last_modified', 'content_hash'])
+
+    # AI 분석은 별도 task 에서 배치/동시 요청으로 처리하여 피드 수집을 막지 않습니다.
+    if news_items:
+        analyze_news_items_task.delay([news_item.id for news_item in news_items])
 
+    return f"{len(news_items)} new items fetched and saved, queued for analysis."
+
+
+@shared_task
+def analyze_news_items_task(item_ids):
+    """
+    새로 저장된 뉴스 아이템들을 OpenAI로 분석하는 task입니다.
+
+    Args:
+        item_ids (list): 분석할 NewsItem id 리스트
+
+    Returns:
+        str: 분석 결과 요약 메시지
+    """
+    # 재시도 시 이미 분석된 항목은 다시 요청하지 않습니다.
+    news_items = list(NewsItem.objects.filter(id__in=item_ids, ai_analysis__isnull=True))
+    if not news_items:
+        return "No news items to analyze."
+
+    analyses = analyze_news_items(news_items)
+
+    analyzed = [apply_analysis(item, analyses[item.id]) for item in news_items if item.id in analyses]
+    NewsItem.objects.bulk_update(analyzed, ANALYSIS_FIELDS)
+    if analyzed:
+        bump_validator_version('news')  # bulk_update 는 시그널이 없으므로 뉴스 목록 ETag 버전을 직접 올립니다.
+
+    return f"{len(analyzed)}/{len(news_items)} news items analyzed."
 
 
 def extract_image_url(entry, source):
@@ -108,39 +142,8 @@ def extract_image_url(entry, source):
     return "이미지 URL 없음"
 
 def analyze_with_openai(news_item):
-    prompt = f"""
-    제목: {news_item.title}
-    내용: {news_item.content}
-
-    위의 암호화폐 관련 뉴스를 분석하여 다음 정보를 JSON 형식으로 제공해주세요:
-    1. 번역된 제목과 내용
-    2. 뉴스의 전반적인 감정 (Bull, Bear, Neutral 중 하나)
-    3. 뉴스에서 언급된 암호화폐 티커 심볼 (없으면 빈 리스트)
-    4. 이 뉴스가 암호화폐 시장에 미칠 수 있는 영향 (낮음, 중간, 높음 중 하나)
-    5. AI 분석 결과 (짧은 코멘트)
-    예시:
-    {{
-        "translated_title": "번역된 제목",
-        "translated_content": "번역된 내용",
-        "market_sentiment": "Bull",
-        "tickers": ["BTC", "ETH"],
-        "impact": "높음",
-        "ai_analysis": "짧은코멘트"
-    }}
-    """
-
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4.0-mini",
-            messages=[
-                {"role": "system", "content": "너는 뉴스 분석 전문가야. 그리고 암호화폐에 대해 잘 알고 있어. 또한 번역도 가능해."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=500
-        )
-
-        analysis = json.loads(response.choices[0].message['content'])
-        return analysis
+        return analyze_news_items([news_item]).get(news_item.id)
     except Exception as e:
         print(f"Error in OpenAI analysis: {str(e)}")
         return None
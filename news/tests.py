@@ -1,3 +1,290 @@
-from django.test import TestCase
+import json
+import asyncio
+import hashlib
+import functools
+import time
+from unittest import mock
 
-# Create your tests here.
+import feedparser
+import httpx
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .analysis import analyze_news_items
+from .feeds import fetch_feeds_sync
+from .ingestion import upsert_news_items
+from .models import News, NewsItem
+from .tasks import fetch_crypto_news
+
+
+class UpsertNewsItemsTests(TestCase):
+    """
+    upsert_news_items 가 link 기준으로 생성/갱신하고, 항목 수와 관계없이 같은 수의 쿼리를 쓰는지 확인합니다.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.feed = News.objects.create(name='feed', url='https://example.com/rss')
+        cls.published = timezone.now()
+
+    def make_items(self, count, prefix='item', title='title'):
+        return [
+            NewsItem(feed=self.feed, link=f'https://example.com/{prefix}/{i}', title=f'{title} {i}',
+                     content='content', published_date=self.published)
+            for i in range(count)
+        ]
+
+    def upsert(self, items):
+        with CaptureQueriesContext(connection) as queries:
+            result = upsert_news_items(items)
+        return result, len(queries)
+
+    def test_create_update_and_unchanged(self):
+        upsert_news_items(self.make_items(3))
+        NewsItem.objects.filter(link__endswith='/0').update(ai_analysis={'impact': 'high'})
+
+        items = self.make_items(4)
+        items[1].title = 'changed'
+        (created, updated), _ = self.upsert(items)
+
+        self.assertEqual([item.link for item in created], ['https://example.com/item/3'])
+        self.assertTrue(all(item.pk for item in created))
+        self.assertEqual(updated, 1)
+        self.assertEqual(NewsItem.objects.get(link__endswith='/1').title, 'changed')
+        # 피드에서 다시 받아와도 AI 분석 결과는 유지됩니다.
+        self.assertEqual(NewsItem.objects.get(link__endswith='/0').ai_analysis, {'impact': 'high'})
+        self.assertEqual(NewsItem.objects.count(), 4)
+
+    def test_unchanged_items_do_not_write(self):
+        upsert_news_items(self.make_items(5))
+        (created, updated), queries = self.upsert(self.make_items(5))
+        self.assertEqual((created, updated), ([], 0))
+        self.assertEqual(queries, 1)
+
+    def test_query_count_is_constant(self):
+        upsert_news_items(self.make_items(5, prefix='old-small'))
+        upsert_news_items(self.make_items(40, prefix='old-large'))
+        small_items = self.make_items(5, prefix='new-small') + self.make_items(5, prefix='old-small', title='changed')
+        large_items = self.make_items(40, prefix='new-large') + self.make_items(40, prefix='old-large', title='changed')
+        (created, updated), small = self.upsert(small_items)
+        self.assertEqual((len(created), updated), (5, 5))
+        (created, updated), large = self.upsert(large_items)
+        self.assertEqual((len(created), updated), (40, 40))
+        self.assertEqual(small, large)
+
+    def test_concurrent_insert_is_updated(self):
+        # 다른 실행이 미리 불러온 뒤에 같은 link 를 저장한 경우: IntegrityError 대신 갱신합니다.
+        upsert_news_items(self.make_items(2))
+        NewsItem.objects.filter(link__endswith='/0').update(ai_analysis={'impact': 'low'})
+        with mock.patch('news.ingestion._existing_items', return_value={}):
+            created, _ = upsert_news_items(self.make_items(3, title='changed'))
+
+        self.assertEqual(len(created), 3)
+        self.assertEqual(NewsItem.objects.count(), 3)
+        item = NewsItem.objects.get(link__endswith='/0')
+        self.assertEqual(item.title, 'changed 0')
+        self.assertEqual(item.ai_analysis, {'impact': 'low'})
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'news-tests'}})
+class NewsListConditionalTests(TestCase):
+    """
+    뉴스 목록 ETag 가 bulk 로 저장한 항목(수집/분석)에도 바뀌고, 바뀐 것이 없으면 304 를 반환하는지 확인합니다.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            email='user@example.com', password='password', nickname='user', username='user'))
+        self.feed = News.objects.create(name='feed', url='https://example.com/rss')
+        self.items = [
+            NewsItem(feed=self.feed, link=f'https://example.com/item/{i}', title=f'title {i}',
+                     content='content', published_date=timezone.now())
+            for i in range(3)
+        ]
+
+    def conditional_get(self, etag):
+        return self.client.get(reverse('news-list'), HTTP_IF_NONE_MATCH=etag)
+
+    def test_etag_follows_bulk_writes(self):
+        etag = self.client.get(reverse('news-list'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_news_items(self.items)
+        response = self.conditional_get(etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_news_items(self.items)  # 바뀐 것이 없음
+        self.assertEqual(self.conditional_get(etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            item = NewsItem.objects.first()
+            item.impact = 'high'
+            item.save()
+        self.assertEqual(self.conditional_get(etag).status_code, 200)
+
+
+class FetchFeedsTests(SimpleTestCase):
+    """
+    피드들을 동시에 받고, 한 피드의 시간 초과/오류가 나머지 피드에 영향을 주지 않는지 확인합니다.
+    """
+    def fetch(self, feeds, handler, **kwargs):
+        transport = httpx.MockTransport(handler)
+        with mock.patch('news.feeds.httpx.AsyncClient', functools.partial(httpx.AsyncClient, transport=transport)):
+            return fetch_feeds_sync(feeds, **kwargs)
+
+    def feed(self, name, url=None, **fields):
+        return News(name=name, url=url or f'https://example.com/{name}', **fields)
+
+    def test_fetches_concurrently_in_order(self):
+        async def handler(request):
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, content=request.url.path.encode())
+
+        feeds = [self.feed(f'feed{i}') for i in range(5)]
+        started = time.monotonic()
+        results = self.fetch(feeds, handler)
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual([feed for feed, _ in results], feeds)
+        self.assertEqual([response.content for _, response in results], [f'/feed{i}'.encode() for i in range(5)])
+
+    def test_conditional_headers_and_not_modified(self):
+        def handler(request):
+            if request.headers.get('If-None-Match') == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=b'body')
+
+        [(_, cached), (_, fresh)] = self.fetch([self.feed('cached', etag='"v1"'), self.feed('fresh')], handler)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(fresh.status_code, 200)
+
+    def test_failures_are_isolated(self):
+        async def handler(request):
+            name = request.url.path.strip('/')
+            if name == 'slow':
+                await asyncio.sleep(5)
+            if name == 'error':
+                return httpx.Response(500)
+            if name == 'broken':
+                raise ValueError('unexpected')
+            return httpx.Response(200, content=b'ok')
+
+        feeds = [self.feed(name) for name in ('slow', 'error', 'broken', 'ok')]
+        feeds.append(self.feed('invalid', url='http://[::1'))
+        started = time.monotonic()
+        with self.assertLogs('news.feeds', level='ERROR'):
+            results = dict((feed.name, response) for feed, response in self.fetch(feeds, handler, timeout=0.3))
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(results['ok'].content, b'ok')
+        for name in ('slow', 'error', 'broken', 'invalid'):
+            self.assertIsNone(results[name], name)
+
+
+def rss_body(*links):
+    items = ''.join(
+        f'<item><title>title {link}</title><link>{link}</link><description>summary</description>'
+        f'<pubDate>Mon, 14 Oct 2024 10:00:00 +0000</pubDate></item>'
+        for link in links
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>feed</title>{items}</channel></rss>'.encode()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'news-tests'}})
+class FetchCryptoNewsTests(TestCase):
+    """
+    fetch_crypto_news 가 304 응답과 본문 해시가 같은 피드를 파싱 없이 건너뛰고, 바뀐 피드만 저장하는지 확인합니다.
+    """
+    def setUp(self):
+        patcher = mock.patch('news.tasks.analyze_news_items_task.delay')
+        self.analyze = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_task(self, responses):
+        feeds = list(News.objects.filter(is_active=True))
+        fetched = [(feed, responses[feed.name]) for feed in feeds]
+        with mock.patch('news.tasks.fetch_feeds_sync', return_value=fetched), \
+                mock.patch('news.tasks.feedparser.parse', wraps=feedparser.parse) as parse:
+            with self.captureOnCommitCallbacks(execute=True):
+                fetch_crypto_news()
+        return parse.call_count
+
+    def test_skips_unchanged_feeds(self):
+        unchanged = rss_body('https://example.com/a/1')
+        News.objects.create(name='not_modified', url='https://example.com/nm', etag='"v1"', content_hash='old')
+        News.objects.create(name='same_hash', url='https://example.com/sh', content_hash=hashlib.sha256(unchanged).hexdigest())
+        News.objects.create(name='changed', url='https://example.com/c')
+
+        parsed = self.run_task({
+            'not_modified': httpx.Response(304),
+            'same_hash': httpx.Response(200, content=unchanged, headers={'ETag': '"v2"'}),
+            'changed': httpx.Response(200, content=rss_body('https://example.com/c/1', 'https://example.com/c/2'),
+                                      headers={'ETag': '"c1"', 'Last-Modified': 'Mon, 14 Oct 2024 10:00:00 GMT'}),
+        })
+
+        self.assertEqual(parsed, 1)
+        self.assertEqual(sorted(NewsItem.objects.values_list('link', flat=True)), ['https://example.com/c/1', 'https://example.com/c/2'])
+        self.analyze.assert_called_once()
+        self.assertEqual(sorted(self.analyze.call_args.args[0]), sorted(NewsItem.objects.values_list('id', flat=True)))
+
+        feeds = {feed.name: feed for feed in News.objects.all()}
+        self.assertEqual((feeds['not_modified'].etag, feeds['not_modified'].content_hash), ('"v1"', 'old'))
+        self.assertEqual(feeds['same_hash'].etag, '"v2"')
+        changed = feeds['changed']
+        self.assertEqual((changed.etag, changed.last_modified), ('"c1"', 'Mon, 14 Oct 2024 10:00:00 GMT'))
+        self.assertEqual(changed.content_hash, hashlib.sha256(rss_body('https://example.com/c/1', 'https://example.com/c/2')).hexdigest())
+
+    def test_second_run_with_same_body_skips_parsing(self):
+        News.objects.create(name='feed', url='https://example.com/rss')
+        body = rss_body('https://example.com/1')
+        self.assertEqual(self.run_task({'feed': httpx.Response(200, content=body)}), 1)
+        self.assertEqual(self.run_task({'feed': httpx.Response(200, content=body)}), 0)
+        self.assertEqual(NewsItem.objects.count(), 1)
+        self.analyze.assert_called_once()
+
+
+class BatchAnalysisTests(SimpleTestCase):
+    """
+    배치 분석 결과를 응답 순서가 아니라 id 로 기사에 연결하고, 모르는 id/잘못된 항목은 버리는지 확인합니다.
+    """
+    def setUp(self):
+        self.items = [NewsItem(id=i, title=f'title {i}', content='content') for i in range(1, 6)]
+        self.requests = []
+        self.failing_ids = set()
+
+    async def acompletion(self, client, **request):
+        self.requests.append(request)
+        articles = json.loads(request['messages'][1]['content'].split('기사 목록:')[1])
+        if self.failing_ids & {article['id'] for article in articles}:
+            raise RuntimeError('api error')
+        # 순서를 뒤집고, id 3 은 빠뜨리고, 없는 id 와 스키마에 맞지 않는 항목을 섞어 응답합니다.
+        results = [
+            {'id': article['id'], 'translated_title': f"번역 {article['id']}", 'impact': '높음'}
+            for article in reversed(articles) if article['id'] != 3
+        ]
+        results += [{'id': 999, 'translated_title': 'unknown'}, {'translated_title': 'no id'}]
+        return json.dumps({'results': results})
+
+    def analyze(self, **kwargs):
+        with mock.patch('news.analysis.get_async_openai_client'), \
+                mock.patch('news.analysis.llm_cache.acompletion', side_effect=self.acompletion):
+            return analyze_news_items(self.items, **kwargs)
+
+    def test_results_are_mapped_by_id(self):
+        with self.assertLogs('news.analysis', level='WARNING') as logs:
+            analyses = self.analyze(batch_size=2, concurrency=2)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(sorted(analyses), [1, 2, 4, 5])
+        for item_id, analysis in analyses.items():
+            self.assertEqual(analysis['translated_title'], f'번역 {item_id}')
+            self.assertNotIn('id', analysis)
+        self.assertTrue(any('[3]' in line for line in logs.output))
+
+    def test_request_failure_skips_only_that_batch(self):
+        self.failing_ids = {1}
+        with self.assertLogs('news.analysis', level='ERROR'):
+            analyses = self.analyze(batch_size=2)
+        self.assertEqual(sorted(analyses), [4, 5])
@@ -3,17 +3,21 @@ from django.shortcuts import render
 from rest_framework import generics, filters
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from paw_drf.conditional import ConditionalResponseMixin
 from .models import NewsItem
 from .serializers import NewsItemSerializer
 from .tasks import analyze_with_openai
+from .analysis import apply_analysis
 
-class NewsListView(generics.ListAPIView):
+class NewsListView(ConditionalResponseMixin, generics.ListAPIView):
     queryset = NewsItem.objects.all().order_by('-published_date')
     serializer_class = NewsItemSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['feed__name']
     search_fields = ['title', 'content', 'translated_title', 'translated_content']
     ordering_fields = ['published_date']
+    # 뉴스 항목이 저장/수집/분석되면 버전을 올립니다. (news.signals, upsert_news_items, analyze_news_items_task)
+    validator_versions = ('news',)
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -33,9 +37,5 @@ class NewsItemUpdateView(generics.UpdateAPIView):
         instance = serializer.save()
         analysis_result = analyze_with_openai(instance)
         if analysis_result:
-            instance.ai_analysis = analysis_result
-            instance.translated_title = analysis_result.get('translated_title', '')
-            instance.translated_content = analysis_result.get('translated_content', '')
-            instance.impact = analysis_result.get('impact', '')
-            instance.tickers = ','.join(analysis_result.get('tickers', []))
+            apply_analysis(instance, analysis_result)
             instance.save()
\ No newline at end of file
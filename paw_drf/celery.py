@@ -1,8 +1,26 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'paw_drf.settings')
 
 app = Celery('paw_drf')
 app.config_from_object('django.conf:settings', namespace='CELERY')
-app.autodiscover_tasks()
\ No newline at end of file
+app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    from django.conf import settings
+    if getattr(settings, 'BROWSER_POOL_WARM_ON_START', False):
+        from reports.services.browser_pool import browser_pool
+        browser_pool.warm()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs):
+    from reports.services.browser_pool import browser_pool
+    browser_pool.shutdown()
+
+    from reports.services.openai_client import close_openai_clients
+    close_openai_clients()
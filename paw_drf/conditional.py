@@ -0,0 +1,83 @@
+import time
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+
+logger = logging.getLogger(__name__)
+
+
+def _version_key(name):
+    return f"conditional:version:{name}"
+
+
+def _initial_version():
+    # Redis 가 비워진 뒤에도 예전 값(예전 ETag)이 다시 나오지 않도록 0 대신 현재 시각(ns)에서 시작합니다.
+    return time.time_ns()
+
+
+def bump_validator_version(*names):
+    """
+    목록 응답이 바뀌는 변경이 커밋된 뒤 호출해 해당 버전(ETag)을 올립니다. 보통 signals 에서 on_commit 으로 호출합니다.
+    """
+    for name in names:
+        key = _version_key(name)
+        try:
+            cache.add(key, _initial_version(), timeout=None)
+            cache.incr(key)
+        except Exception as e:
+            logger.warning(f"ETag 버전 증가 실패 ({name}): {e}")
+
+
+def get_validator_versions(names):
+    """
+    Returns:
+        list: names 순서의 버전 값. 아직 없는 버전은 새로 만듭니다.
+    """
+    keys = [_version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+class ConditionalResponseMixin:
+    """
+    목록 조회(GET)에 ETag 를 붙이고, 클라이언트가 가진 것과 같으면 본문 없이 304 를 반환합니다.
+
+    ETag 는 요청 경로(쿼리스트링 포함)와 validator_versions 의 버전 값으로 만들므로 DB 를 조회하지 않습니다.
+    응답에 포함되는 모델(중첩된 모델 포함)이 바뀌면 signals 등에서 bump_validator_version() 으로 버전을 올려야 합니다.
+    bulk_create / bulk_update / QuerySet.update() 는 시그널이 없으므로 호출한 쪽에서 직접 올립니다.
+
+    캐시(Redis)에 접근할 수 없으면 ETag 없이 평소대로 응답합니다.
+    좋아요처럼 시각이 움직이지 않는 변경이 있으므로 Last-Modified 는 보내지 않습니다.
+    """
+    validator_versions = ()
+
+    def get_etag(self, request):
+        try:
+            versions = get_validator_versions(self.validator_versions)
+        except Exception as e:
+            logger.warning(f"ETag 버전 조회 실패, 조건부 응답 없이 진행합니다: {e}")
+            return None
+        parts = [request.get_full_path()] + [str(version) for version in versions]
+        return '"%s"' % hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            # 304 에도 검증자를 포함해야 합니다. (RFC 7232 4.1)
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+        return response
@@ -1,7 +1,15 @@
 from django.conf import settings
 from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+import re
 import json
 
+try:
+    import brotli
+except ImportError:  # brotli 는 선택 설치입니다. 없으면 gzip 만 사용합니다.
+    brotli = None
+
 class IPCheckMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -36,4 +44,54 @@ class IPCheckMiddleware:
             ip = x_forwarded_for.split(',')[0]
         else:
             ip = request.META.get('REMOTE_ADDR')
-        return ip
\ No newline at end of file
+        return ip
+
+
+re_accepts_gzip = re.compile(r"\bgzip\b")
+re_accepts_brotli = re.compile(r"\bbr\b")
+
+
+class CompressionMiddleware:
+    """
+    COMPRESSION_MIN_SIZE 이상인 JSON 응답을 brotli(설치된 경우) 또는 gzip 으로 압축합니다.
+
+    - 이미 Content-Encoding 이 있는 응답(리포트 스냅샷 등)과 스트리밍 응답은 건드리지 않습니다.
+    - BREACH 공격을 막기 위해 CSRF 토큰이 들어가는 HTML(관리자/browsable API 폼)은 기본 대상(COMPRESSION_CONTENT_TYPES)에서
+      제외하고, gzip 은 GZipMiddleware 처럼 임의 길이의 패딩을 넣는 compress_string 을 사용합니다.
+      (CSRF_USE_SESSIONS 를 쓰므로 응답만 보고는 토큰 사용 여부를 알 수 없습니다)
+    - 압축한 응답의 ETag 는 약한 ETag(W/)로 바꿔 조건부 요청(If-None-Match)이 계속 동작하게 합니다.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.content_types = tuple(getattr(settings, 'COMPRESSION_CONTENT_TYPES', ('application/json',)))
+        self.brotli_quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(self.content_types)
+            or len(response.content) < self.min_size
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and re_accepts_brotli.search(accept_encoding):
+            content, encoding = brotli.compress(response.content, quality=self.brotli_quality), 'br'
+        elif re_accepts_gzip.search(accept_encoding):
+            content, encoding = compress_string(response.content, max_random_bytes=100), 'gzip'
+        else:
+            return response
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
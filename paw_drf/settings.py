@@ -131,6 +131,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'paw_drf.middleware.CompressionMiddleware',  # 본문을 바꾸는 미들웨어이므로 위쪽에 둡니다.
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -196,6 +197,38 @@ CACHES = {
         }
     }
 }
+# LLM 응답 캐시 (model + messages + 파라미터 해시 기준, Redis + 디스크 2단계)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_TTL = 60 * 60 * 24  # 초
+LLM_CACHE_DIR = BASE_DIR / 'cache' / 'llm'
+# 응답 압축 (paw_drf.middleware.CompressionMiddleware). brotli 가 설치되어 있으면 br 을 우선 사용합니다.
+COMPRESSION_MIN_SIZE = 1024  # bytes, 이보다 작은 응답은 압축하지 않음
+# CSRF 토큰이 들어가는 HTML(text/html)은 BREACH 공격 대상이므로 넣지 않습니다.
+COMPRESSION_CONTENT_TYPES = ('application/json',)
+COMPRESSION_BROTLI_QUALITY = 5
+# 리포트 캐시 (reports.services.report_cache)
+REPORT_CACHE_TTL = 60 * 60  # 초
+REPORT_CACHE_XFETCH_BETA = 1.0  # 클수록 만료 전에 더 일찍 다시 계산
+REPORT_CACHE_LOCK_TIMEOUT = 5  # 초, 다시 계산하는 동안 다른 요청이 기다리는 최대 시간
+# OpenAI 공유 클라이언트 커넥션 풀 설정
+OPENAI_TIMEOUT = 60  # 초
+OPENAI_MAX_RETRIES = 2
+OPENAI_MAX_CONNECTIONS = 20
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 10
+OPENAI_KEEPALIVE_EXPIRY = 30  # 초
+OPENAI_HTTP2 = True  # h2 패키지가 설치된 경우에만 사용
+OPENAI_STREAM_RESPONSES = True  # 차트/메인 리포트 분석을 스트리밍으로 받아 섹션 단위로 처리
+OPENAI_SCHEMA_ATTEMPTS = 2  # 스키마 검증(복구 포함) 실패 시 최대 요청 횟수
+OPENAI_STREAM_REPAIR_MAX_CHARS = 2000  # 스트리밍 파싱 실패 후 복구용으로 더 받을 최대 글자 수, 넘으면 스트림을 닫음
+# 차트 분석 방식: 'single' (한 번에 전체 지표) 또는 'fanout' (지표 묶음별 동시 요청)
+CHART_ANALYSIS_MODE = 'single'
+CHART_FANOUT_MAX_TOKENS = 500
+# 비전 모델로 보내는 차트 이미지 전처리 (크롭 → 다운샘플 → 인코딩)
+CHART_IMAGE_CROP = True
+CHART_IMAGE_FORMAT = 'WEBP'  # WEBP, JPEG, PNG
+CHART_IMAGE_QUALITY = 80
+CHART_IMAGE_MAX_SIDE = 2048
+CHART_IMAGE_SHORT_SIDE = 768
 
 CELERY_BROKER_URL = 'redis://localhost:6379'  # Redis를 브로커로 사용
 CELERY_RESULT_BACKEND = 'redis://localhost:6379'
@@ -213,7 +246,30 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'news.tasks.fetch_crypto_news',
         'schedule': crontab(minute='*/10'), 
     },
+    'sample-prices-every-minute': {
+        'task': 'paw_drf.tasks.sample_prices_task',
+        'schedule': crontab(),  # 매분 실행, task 안에서 PRICE_SAMPLE_INTERVAL 초마다 조회
+        'options': {'expires': 55},
+    },
+    'backtest-reports-every-hour': {
+        'task': 'paw_drf.tasks.backtest_reports_task',
+        'schedule': crontab(minute=5),  # 매시 5분, 최근 리포트 중 horizon 이 지난 것들을 채점
+    },
+    'prune-llm-cache-every-day': {
+        'task': 'paw_drf.tasks.prune_llm_cache_task',
+        'schedule': crontab(hour=4, minute=0),  # LLM_CACHE_TTL 이 지난 디스크 캐시 파일 삭제
+    },
 }
+# 가격 샘플러 설정
+PRICE_SAMPLER_MARKETS = ['KRW-BTC']
+PRICE_SAMPLE_INTERVAL = 5  # 초
+PRICE_SAMPLE_WINDOW = 55  # task 한 번이 샘플링하는 시간(초), beat 주기보다 짧게
+PRICE_SAMPLER_FLUSH_SIZE = 100
+
+# 백테스트 설정 (reports.backtest)
+BACKTEST_HORIZONS = {'1h': 60 * 60, '4h': 4 * 60 * 60, '24h': 24 * 60 * 60}  # 라벨: 초
+BACKTEST_THRESHOLDS = [0.0, 0.5, 1.0]  # BUY/SELL 정답으로 인정할 최소 변동률(%)
+BACKTEST_HOLD_BAND = 0.5  # HOLD 정답으로 인정할 변동률 범위(±%), Accuracy 와 동일
 
 # Custom user model
 AUTH_USER_MODEL = 'accounts.User'
@@ -363,3 +419,35 @@ MEDIA_URL = '/media/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CHROME_BINARY_PATH = '/usr/bin/google-chrome-stable'
+CHROMEDRIVER_PATH = '/usr/local/bin/chromedriver'
+
+# 브라우저 풀 설정 (ChartCapture, NewsService가 공유)
+BROWSER_POOL_SIZE = 1  # 워커 프로세스당 유지할 Chrome 인스턴스 수
+BROWSER_POOL_MAX_USES = 20  # 이 횟수만큼 사용한 드라이버는 재생성
+BROWSER_POOL_MAX_RSS_MB = 1024  # 드라이버 프로세스 트리 메모리 상한
+# 워커 프로세스 시작 시 미리 Chrome 실행. prefork 자식마다 Chrome 이 뜨므로 기본값은 False 이고, 드라이버는 첫 대여 때 생성됩니다.
+# 브라우저 작업만 처리하는 전용 워커에서만 켜세요.
+BROWSER_POOL_WARM_ON_START = False
+
+# 페이지 준비 상태 감지 타임아웃(초)
+PAGE_READINESS_TIMEOUTS = {
+    'document_ready': 30,
+    'network_idle': 15,
+    'canvas_rendered': 20,
+    'element': 30,
+}
+PAGE_NETWORK_IDLE_MS = 500
+
+# 차트 이미지 생성 방식: 'native' (업비트 캔들 API로 직접 렌더링) 또는 'browser' (업비트 차트 페이지 캡처)
+CHART_CAPTURE_BACKEND = 'native'
+
+# 수치 지표(reports.indicators)를 계산할 캔들 단위 목록
+CHART_INDICATOR_TIMEFRAMES = ['minutes/60', 'minutes/240', 'days']
+
+# RSS 피드 수집 설정
+NEWS_FETCH_CONCURRENCY = 10  # 동시에 요청할 최대 피드 수
+NEWS_FETCH_TIMEOUT = 15  # 피드별 최대 소요 시간(초)
+
+# 뉴스 AI 분석 설정
+NEWS_ANALYSIS_BATCH_SIZE = 8  # 한 번의 프롬프트로 분석할 기사 수
+NEWS_ANALYSIS_CONCURRENCY = 4  # 동시에 보낼 배치 요청 수
@@ -6,9 +6,17 @@ from reports.services import (
     ReportService,
     RetrospectiveReportService,
 )
-from reports.models import NewsReport, Accuracy, MainReport, Price
+from reports.models import NewsReport, Accuracy, AccuracySummary, MainReport, Price
+from reports.services.price_sampler import get_price_sampler
+from reports.backtest import run_backtest
+from reports.snapshots import render_report_snapshots
+from reports.services.llm_cache import llm_cache
+from django.conf import settings
+from django.utils import timezone
+from django.core.cache import cache
 import logging
 import json
+from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
@@ -97,10 +105,72 @@ def crawl_and_analyze_news_task() -> dict:
         return _create_task_result(False, f"뉴스 크롤링 및 분석 중 오류 발생: {str(e)}")
 
 
+@shared_task
+def sample_prices_task() -> dict:
+    """
+    PRICE_SAMPLE_WINDOW 초 동안 업비트 현재가를 PRICE_SAMPLE_INTERVAL 초마다 조회하고 한 번에 저장하는 task입니다.
+
+    Returns:
+        dict: 성공 여부, 메시지, saved(저장된 샘플 수)를 포함하는 dictionary
+    """
+    lock_id = "sample_prices_lock"
+    if not cache.add(lock_id, "true", settings.PRICE_SAMPLE_WINDOW + 30):
+        return _create_task_result(False, "가격 샘플링이 이미 실행 중입니다.")
+    try:
+        saved = get_price_sampler().run(duration=settings.PRICE_SAMPLE_WINDOW)
+        return _create_task_result(True, "가격 샘플링이 완료되었습니다.", saved=saved)
+    except Exception as e:
+        logger.error(f"Error in sample_prices_task: {str(e)}", exc_info=True)
+        return _create_task_result(False, f"가격 샘플링 중 오류 발생: {str(e)}")
+    finally:
+        cache.delete(lock_id)
+
+
+@shared_task
+def backtest_reports_task(full: bool = False) -> dict:
+    """
+    MainReport 추천을 BACKTEST_HORIZONS x BACKTEST_THRESHOLDS 로 채점해 BacktestResult 에 저장하는 task입니다.
+
+    Args:
+        full (bool): True 면 전체 리포트를 다시 채점하고, 아니면 가장 긴 horizon 안에 만들어진 리포트만 채점합니다.
+
+    Returns:
+        dict: 성공 여부, 메시지, reports, results, timings 를 포함하는 dictionary
+    """
+    try:
+        since = None
+        if not full:
+            since = timezone.now() - timedelta(seconds=max(settings.BACKTEST_HORIZONS.values())) - timedelta(hours=1)
+        result = run_backtest(since=since)
+        return _create_task_result(
+            True, "백테스트가 완료되었습니다.",
+            reports=result['reports'], results=result['results'], timings=result['timings'],
+        )
+    except Exception as e:
+        logger.error(f"Error in backtest_reports_task: {str(e)}", exc_info=True)
+        return _create_task_result(False, f"백테스트 중 오류 발생: {str(e)}")
+
+
+@shared_task
+def prune_llm_cache_task() -> dict:
+    """
+    LLM_CACHE_TTL 이 지난 LLM 응답 디스크 캐시 파일을 지우는 task입니다.
+
+    Returns:
+        dict: 성공 여부, 메시지, removed(삭제한 파일 수)를 포함하는 dictionary
+    """
+    try:
+        removed = llm_cache.prune()
+        return _create_task_result(True, "LLM 디스크 캐시를 정리했습니다.", removed=removed)
+    except Exception as e:
+        logger.error(f"Error in prune_llm_cache_task: {str(e)}", exc_info=True)
+        return _create_task_result(False, f"LLM 디스크 캐시 정리 중 오류 발생: {str(e)}")
+
+
 @shared_task
 def calculate_accuracy_task(previous_results=None) -> dict:
     """
-    정확도를 계산하는 task입니다.
+    정확도를 계산하는 task입니다. 저장 시 누적 통계와 AccuracySummary 도 함께 갱신됩니다.
 
     Returns:
         dict: accuracy, average_accuracy, recommendation, recommendation_value,
@@ -117,6 +187,7 @@ def calculate_accuracy_task(previous_results=None) -> dict:
             "price_change": f"{new_accuracy.price_change:.2f}%",
             "is_correct": new_accuracy.is_correct,
             "calculated_at": new_accuracy.calculated_at.isoformat(),
+            "seven_day_average_accuracy": AccuracySummary.current()[('7d', AccuracySummary.ALL)].average_accuracy,
             "db_stats": {
                 "main_reports_count": MainReport.objects.count(),
                 "prices_count": Price.objects.count(),
@@ -159,7 +230,7 @@ def create_and_analyze_retrospective_report_task(previous_results=None) -> dict:
 @shared_task
 def create_main_report_task(previous_results=None) -> dict:
     """
-    메인 보고서를 생성하는 task입니다.
+    메인 보고서를 생성하고 상세 조회용 스냅샷을 렌더링하는 task입니다.
 
     Returns:
         dict: 성공 여부, 메시지, report_id를 포함하는 dictionary
@@ -170,6 +241,11 @@ def create_main_report_task(previous_results=None) -> dict:
         logger.info("Calling create_main_report method")
         main_report = report_service.create_main_report()
         if main_report:
+            try:
+                # 상세 API 가 바로 사용할 스냅샷을 미리 만들어 둡니다. 실패해도 첫 조회 때 다시 만들어집니다.
+                render_report_snapshots(main_report)
+            except Exception as e:
+                logger.error(f"Error rendering report snapshots: {str(e)}", exc_info=True)
             result = _create_task_result(
                 True, "메인 리포트가 성공적으로 생성되었습니다.", report_id=main_report.id
             )
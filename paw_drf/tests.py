@@ -0,0 +1,86 @@
+import gzip
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .conditional import bump_validator_version, get_validator_versions
+from .middleware import CompressionMiddleware
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTests(SimpleTestCase):
+    """
+    CompressionMiddleware 가 크기/형식/기존 인코딩에 따라 압축 여부를 정하고, ETag 를 약한 ETag 로 바꾸는지 확인합니다.
+    """
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept_encoding='gzip'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, size, **headers):
+        response = HttpResponse(b'[' + b'1,' * (size // 2) + b'1]', content_type='application/json')
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    def test_compresses_large_json(self):
+        original = self.json_response(4096, ETag='"abc"')
+        body = original.content
+        response = self.process(original)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        # 압축한 본문은 원본과 바이트가 다르므로 약한 ETag 로 바꿉니다.
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_min_size(self):
+        response = self.process(self.json_response(512))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        with self.settings(COMPRESSION_MIN_SIZE=100):
+            self.assertEqual(self.process(self.json_response(512))['Content-Encoding'], 'gzip')
+
+    def test_skips_encoded_response(self):
+        body = gzip.compress(b'{}' * 2048)
+        original = HttpResponse(body, content_type='application/json')
+        original['Content-Encoding'] = 'gzip'
+        original['ETag'] = '"snapshot"'
+        response = self.process(original)
+        self.assertEqual(response.content, body)
+        self.assertEqual(response['ETag'], '"snapshot"')
+
+    def test_skips_other_content_types_and_clients(self):
+        image = HttpResponse(b'\x89PNG' * 1024, content_type='image/png')
+        self.assertFalse(self.process(image).has_header('Content-Encoding'))
+        # BREACH: CSRF 토큰이 들어갈 수 있는 HTML(관리자/browsable API)은 압축하지 않습니다.
+        html = HttpResponse(b'<p>page</p>' * 1024, content_type='text/html; charset=utf-8')
+        self.assertFalse(self.process(html).has_header('Content-Encoding'))
+        response = self.process(self.json_response(4096, ETag='"abc"'), accept_encoding='identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['ETag'], '"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'conditional-tests'}})
+class ValidatorVersionTests(SimpleTestCase):
+    """
+    목록 ETag 에 쓰는 버전 값이 올라가고, 캐시가 비워진 뒤에도 예전 값이 다시 나오지 않는지 확인합니다.
+    """
+    def setUp(self):
+        cache.clear()
+
+    def test_bump(self):
+        first, other = get_validator_versions(['items', 'other'])
+        self.assertEqual(get_validator_versions(['items', 'other']), [first, other])
+        bump_validator_version('items')
+        self.assertEqual(get_validator_versions(['items', 'other']), [first + 1, other])
+
+    def test_versions_not_reused_after_clear(self):
+        bump_validator_version('items')
+        [before] = get_validator_versions(['items'])
+        cache.clear()
+        [after] = get_validator_versions(['items'])
+        self.assertNotEqual(after, before)
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.db import models
 from django_json_widget.widgets import JSONEditorWidget
-from .models import ChartReport, NewsReport, MainReport, ReportWeights, Price, Accuracy
+from .models import ChartReport, NewsReport, MainReport, ReportWeights, Price, PriceRollup, Accuracy, AccuracySummary, BacktestResult, ReportSnapshot
 
 @admin.register(ChartReport)
 class ChartReportAdmin(admin.ModelAdmin):
@@ -43,6 +43,29 @@ class PriceAdmin(admin.ModelAdmin):
     list_filter = ('market', 'timestamp')
     search_fields = ('market',)
 
+@admin.register(PriceRollup)
+class PriceRollupAdmin(admin.ModelAdmin):
+    list_display = ('id', 'market', 'interval', 'bucket', 'open', 'high', 'low', 'close', 'count')
+    list_display_links = ('id', 'market')
+    list_filter = ('market', 'interval')
+
+@admin.register(BacktestResult)
+class BacktestResultAdmin(admin.ModelAdmin):
+    list_display = ('id', 'main_report', 'market', 'horizon', 'threshold', 'direction', 'return_pct', 'is_correct', 'evaluated_at')
+    list_display_links = ('id', 'main_report')
+    list_filter = ('market', 'horizon', 'threshold', 'is_correct')
+
+@admin.register(AccuracySummary)
+class AccuracySummaryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'window', 'recommendation', 'average_accuracy', 'count', 'correct', 'start_date', 'end_date', 'refreshed_at')
+    list_filter = ('window', 'recommendation')
+
+@admin.register(ReportSnapshot)
+class ReportSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'object_id', 'version', 'etag', 'size', 'rendered_at')
+    list_filter = ('kind',)
+    exclude = ('content',)
+
 @admin.register(Accuracy)
 class AccuracyAdmin(admin.ModelAdmin):
     list_display = ('id', 'accuracy', 'average_accuracy_percent', 'recommendation', 'recommendation_value', 'price_change_percent', 'is_correct', 'calculated_at')
@@ -0,0 +1,228 @@
+"""
+MainReport 추천을 여러 보유 기간(horizon)과 임계값(threshold)으로 한 번에 채점하는 백테스트 엔진입니다.
+
+가격 시계열과 리포트 시각을 NumPy 배열로 만든 뒤 searchsorted 로 진입/청산 가격을 찾기 때문에
+리포트 수 x horizon x threshold 조합 전체를 반복문 없이 계산합니다.
+"""
+import time
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .models import DEFAULT_MARKET, MainReport, Price, PriceRollup, BacktestResult
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = {'BUY': 1, 'SELL': -1, 'HOLD': 0}
+
+
+def default_horizons():
+    return getattr(settings, 'BACKTEST_HORIZONS', {'1h': 60 * 60, '4h': 4 * 60 * 60, '24h': 24 * 60 * 60})
+
+
+def default_thresholds():
+    return getattr(settings, 'BACKTEST_THRESHOLDS', [0.0, 0.5, 1.0])
+
+
+def _window(queryset, order_field, time_field, start, end):
+    # start 이전의 마지막 행과 end 이후의 첫 행까지 포함해야 전체 시계열로 계산한 것과 같은 진입/청산 가격과 채점 여부가 나옵니다.
+    if start is not None:
+        first = queryset.filter(**{f'{time_field}__lte': start}).order_by(f'-{order_field}').values_list(order_field, flat=True).first()
+        if first is not None:
+            queryset = queryset.filter(**{f'{order_field}__gte': first})
+    if end is not None:
+        last = queryset.filter(**{f'{time_field}__gte': end}).order_by(order_field).values_list(order_field, flat=True).first()
+        if last is not None:
+            queryset = queryset.filter(**{f'{order_field}__lte': last})
+    return queryset
+
+
+def load_price_series(market=DEFAULT_MARKET, interval=None, start=None, end=None):
+    """
+    start ~ end 구간(채점할 리포트의 첫 시각 ~ 마지막 시각 + 최대 horizon)의 가격만 읽습니다.
+
+    Returns:
+        tuple: (epoch 초 배열, 가격 배열). interval 을 주면 PriceRollup 의 종가 시계열을 사용합니다.
+    """
+    if interval:
+        queryset = _window(PriceRollup.objects.filter(market=market, interval=interval), 'bucket', 'close_time', start, end)
+        rows = queryset.order_by('bucket').values_list('close_time', 'close')
+    else:
+        queryset = _window(Price.objects.for_market(market), 'timestamp', 'timestamp', start, end)
+        rows = queryset.order_by('timestamp').values_list('timestamp', 'trade_price')
+    timestamps, prices = [], []
+    for timestamp, price in rows.iterator(chunk_size=10000):
+        timestamps.append(timestamp.timestamp())
+        prices.append(price)
+    return np.array(timestamps, dtype=np.float64), np.array(prices, dtype=np.float64)
+
+
+def load_reports(since=None):
+    """
+    Returns:
+        tuple: (MainReport id 배열, epoch 초 배열, 방향 배열(BUY=1, SELL=-1, HOLD=0))
+    """
+    queryset = MainReport.objects.order_by('created_at')
+    if since:
+        queryset = queryset.filter(created_at__gte=since)
+    ids, times, directions = [], [], []
+    for report_id, created_at, recommendation in queryset.values_list('id', 'created_at', 'recommendation'):
+        direction = DIRECTIONS.get((recommendation or '').split(',')[0].strip().upper())
+        if direction is None:
+            continue
+        ids.append(report_id)
+        times.append(created_at.timestamp())
+        directions.append(direction)
+    return np.array(ids, dtype=np.int64), np.array(times, dtype=np.float64), np.array(directions, dtype=np.int8)
+
+
+def evaluate(report_times, directions, price_times, prices, horizons, thresholds, hold_band=0.5):
+    """
+    모든 리포트를 모든 horizon / threshold 조합으로 채점합니다.
+
+    - 진입 가격: 리포트 시각 이전의 가장 최근 가격
+    - 청산 가격: 리포트 시각 + horizon 이전의 가장 최근 가격
+    - BUY 는 수익률 > threshold, SELL 은 수익률 < -threshold, HOLD 는 |수익률| <= hold_band 일 때 정답
+
+    Args:
+        horizons (list): horizon 초 리스트 (H)
+        thresholds (list): 퍼센트 임계값 리스트 (K)
+
+    Returns:
+        dict: entry_price (R), exit_price (H, R), return_pct (H, R), scored (H, R), is_correct (H, K, R)
+    """
+    horizons = np.asarray(horizons, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    count = len(report_times)
+    if not len(price_times) or not count:
+        empty = np.zeros((len(horizons), count))
+        return {
+            'entry_price': np.full(count, np.nan),
+            'exit_price': np.full_like(empty, np.nan),
+            'return_pct': np.full_like(empty, np.nan),
+            'scored': empty.astype(bool),
+            'is_correct': np.zeros((len(horizons), len(thresholds), count), dtype=bool),
+        }
+
+    entry_index = np.searchsorted(price_times, report_times, side='right') - 1
+    has_entry = entry_index >= 0
+    entry_price = np.where(has_entry, prices[np.clip(entry_index, 0, None)], np.nan)
+
+    exit_times = report_times[None, :] + horizons[:, None]
+    exit_index = np.searchsorted(price_times, exit_times, side='right') - 1
+    exit_price = prices[np.clip(exit_index, 0, None)]
+    # horizon 이 아직 지나지 않았거나(가격 시계열 끝 이후) 진입 가격이 없는 리포트는 채점하지 않습니다.
+    scored = has_entry[None, :] & (exit_times <= price_times[-1]) & (exit_index > entry_index[None, :])
+    exit_price = np.where(scored, exit_price, np.nan)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return_pct = (exit_price - entry_price[None, :]) / entry_price[None, :] * 100
+
+    ret = return_pct[:, None, :]
+    limit = thresholds[None, :, None]
+    direction = directions[None, None, :]
+    with np.errstate(invalid='ignore'):
+        is_correct = np.where(
+            direction == 1, ret > limit,
+            np.where(direction == -1, ret < -limit, np.abs(ret) <= hold_band),
+        )
+    is_correct &= scored[:, None, :]
+
+    return {
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'return_pct': return_pct,
+        'scored': scored,
+        'is_correct': is_correct,
+    }
+
+
+def summarize(result, directions, horizon_labels, thresholds):
+    """
+    Returns:
+        dict: {horizon: {threshold: {'ALL' | 'BUY' | ...: {'count', 'correct', 'hit_rate'}}}}
+    """
+    summary = {}
+    groups = {'ALL': np.ones(len(directions), dtype=bool)}
+    groups.update({name: directions == value for name, value in DIRECTIONS.items()})
+    for h, label in enumerate(horizon_labels):
+        summary[label] = {}
+        for k, threshold in enumerate(thresholds):
+            summary[label][threshold] = {}
+            for name, mask in groups.items():
+                scored = result['scored'][h] & mask
+                count = int(scored.sum())
+                correct = int((result['is_correct'][h, k] & mask).sum())
+                summary[label][threshold][name] = {
+                    'count': count,
+                    'correct': correct,
+                    'hit_rate': round(correct / count, 4) if count else None,
+                }
+    return summary
+
+
+def run_backtest(market=DEFAULT_MARKET, horizons=None, thresholds=None, since=None, interval=None, hold_band=None):
+    """
+    리포트 전체(또는 since 이후)를 채점해 BacktestResult 에 upsert 하고 요약을 반환합니다.
+    """
+    horizons = horizons or default_horizons()
+    thresholds = list(thresholds or default_thresholds())
+    hold_band = getattr(settings, 'BACKTEST_HOLD_BAND', 0.5) if hold_band is None else hold_band
+    started = time.perf_counter()
+
+    report_ids, report_times, directions = load_reports(since)
+    if len(report_ids):
+        start = datetime.fromtimestamp(report_times[0], tz=dt_timezone.utc)
+        end = datetime.fromtimestamp(report_times[-1] + max(horizons.values()), tz=dt_timezone.utc)
+        price_times, prices = load_price_series(market, interval, start, end)
+    else:
+        price_times, prices = np.array([], dtype=np.float64), np.array([], dtype=np.float64)
+    loaded = time.perf_counter()
+
+    labels = list(horizons)
+    result = evaluate(report_times, directions, price_times, prices, [horizons[label] for label in labels], thresholds, hold_band)
+    evaluated = time.perf_counter()
+
+    evaluated_at = datetime.now(tz=dt_timezone.utc)
+    rows = []
+    for h, label in enumerate(labels):
+        for r in np.flatnonzero(result['scored'][h]):
+            for k, threshold in enumerate(thresholds):
+                rows.append(BacktestResult(
+                    main_report_id=int(report_ids[r]),
+                    market=market,
+                    horizon=label,
+                    threshold=threshold,
+                    direction=int(directions[r]),
+                    entry_price=float(result['entry_price'][r]),
+                    exit_price=float(result['exit_price'][h, r]),
+                    return_pct=float(result['return_pct'][h, r]),
+                    is_correct=bool(result['is_correct'][h, k, r]),
+                    evaluated_at=evaluated_at,
+                ))
+    with transaction.atomic():
+        BacktestResult.objects.bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['main_report', 'market', 'horizon', 'threshold'],
+            update_fields=['direction', 'entry_price', 'exit_price', 'return_pct', 'is_correct', 'evaluated_at'],
+        )
+    written = time.perf_counter()
+
+    timings = {
+        'load': round(loaded - started, 3),
+        'evaluate': round(evaluated - loaded, 3),
+        'write': round(written - evaluated, 3),
+    }
+    logger.info(f"백테스트 완료: 리포트 {len(report_ids)}개, 가격 {len(prices)}개, 결과 {len(rows)}행, {timings}")
+    return {
+        'reports': len(report_ids),
+        'prices': len(prices),
+        'results': len(rows),
+        'timings': timings,
+        'summary': summarize(result, directions, labels, thresholds),
+    }
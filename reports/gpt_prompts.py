@@ -30,6 +30,32 @@ def get_chart_analysis_prompt():
     }
     """
 
+def get_chart_group_prompt(sections):
+    """
+    차트 분석 fan-out 모드에서 일부 지표(sections)만 분석하도록 요청하는 프롬프트입니다.
+    """
+    indicators = [section for section in sections if section != "Overall Recommendation"]
+    numbered = "\n".join(f"    {i}. {section}" for i, section in enumerate(indicators, 1))
+    skeleton = ",\n".join(f'    "{section}": {{"analysis": "", "recommendation": ""}}' for section in indicators)
+    overall = ""
+    if "Overall Recommendation" in sections:
+        overall = "\n    Also give an Overall Recommendation (Buy, Sell, or Hold) considering the whole chart."
+        skeleton += ',\n    "Overall Recommendation": ""'
+    return f"""
+    You are an expert Bitcoin analyst with deep knowledge of technical analysis and chart patterns. Always respond in valid JSON format.
+    If there are any numbers that should be referenced in the chart, please make sure to include them in the report.
+
+    Analyze the current Bitcoin chart using ONLY the following technical indicators and provide your insights:
+{numbered}
+
+    For each indicator, provide a brief analysis and a clear recommendation: Buy, Sell, or Hold.{overall}
+    Your response MUST be ONLY in the following JSON format, with no additional text before or after:
+
+    {{
+{skeleton}
+    }}
+    """
+
 def get_news_analysis_prompt():
     return """
     Analyze the following news items and provide a recommendation (Buy, Sell, or Hold) along with an impact percentage for each. The impact percentage should reflect how strongly the news might affect the cryptocurrency market, with 100% being the strongest possible impact.
@@ -0,0 +1,308 @@
+"""
+캔들 배열에 대한 기술적 지표를 NumPy 벡터 연산으로 계산합니다.
+
+LLM이 차트 이미지를 보고 작성하는 ChartReport 의 각 분석 항목과 같은 이름으로
+결정적인(deterministic) 수치 값을 만들어, 분석 텍스트 옆에 함께 저장합니다.
+"""
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+FIBONACCI_RATIOS = (0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0)
+
+# EMA 블록 계산에서 d^(-i) 가 이 값(e^20)을 넘지 않도록 블록 길이를 정합니다.
+_EMA_MAX_LOG_SCALE = 20.0
+
+
+def candles_to_arrays(candles):
+    """
+    업비트 캔들 응답(dict 리스트)을 오래된 순서의 NumPy 배열 묶음으로 변환합니다.
+    """
+    candles = sorted(candles, key=lambda c: c['timestamp'])
+    return {
+        'timestamp': np.array([c['timestamp'] for c in candles], dtype=np.int64),
+        'open': np.array([c['opening_price'] for c in candles], dtype=np.float64),
+        'high': np.array([c['high_price'] for c in candles], dtype=np.float64),
+        'low': np.array([c['low_price'] for c in candles], dtype=np.float64),
+        'close': np.array([c['trade_price'] for c in candles], dtype=np.float64),
+        'volume': np.array([c.get('candle_acc_trade_volume', 0) for c in candles], dtype=np.float64),
+    }
+
+
+def sma(values, period):
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if len(values) < period:
+        return out
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def rolling_std(values, period):
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if len(values) < period:
+        return out
+    out[period - 1:] = sliding_window_view(values, period).std(axis=1)
+    return out
+
+
+def _ema_recurrence(values, alpha, initial):
+    """
+    y[j] = (1 - alpha) * y[j-1] + alpha * x[j] (y[-1] = initial) 을 블록 단위 닫힌 식으로 계산합니다.
+
+    블록 안에서는 y[j] = d^(j+1) * prev + alpha * d^j * cumsum(x[i] * d^(-i)) 이므로
+    파이썬 반복은 블록 수(수천 개 캔들에서도 몇 번)만큼만 돕니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    if alpha >= 1.0:
+        out[:] = values
+        return out
+    decay = 1.0 - alpha
+    block = max(1, int(_EMA_MAX_LOG_SCALE / -math.log(decay)))
+    prev = initial
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        exponents = np.arange(len(chunk))
+        powers = decay ** exponents
+        result = decay * powers * prev + alpha * powers * np.cumsum(chunk * decay ** -exponents)
+        out[start:start + len(chunk)] = result
+        prev = result[-1]
+    return out
+
+
+def ema(values, period=None, alpha=None):
+    """
+    지수 이동 평균. 앞쪽 NaN 구간은 건너뛰고 첫 유효 값으로 시작합니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    alpha = alpha if alpha is not None else 2.0 / (period + 1)
+    out = np.full(values.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid):
+        return out
+    first = valid[0]
+    out[first] = values[first]
+    out[first + 1:] = _ema_recurrence(values[first + 1:], alpha, values[first])
+    return out
+
+
+def rsi(close, period=14):
+    """
+    Wilder 방식 RSI. 첫 평균은 단순 평균, 이후는 alpha=1/period 인 지수 평활입니다.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(close.shape, np.nan)
+    if len(close) <= period:
+        return out
+    delta = np.diff(close)
+    gains = np.clip(delta, 0, None)
+    losses = np.clip(-delta, 0, None)
+
+    def wilder(series):
+        seed = series[:period].mean()
+        return np.concatenate(([seed], _ema_recurrence(series[period:], 1.0 / period, seed)))
+
+    avg_gain = wilder(gains)
+    avg_loss = wilder(losses)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out[period:] = np.where(avg_loss == 0, 100.0, values)
+    return out
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_bands(close, period=20, width=2.0):
+    middle = sma(close, period)
+    std = rolling_std(close, period)
+    return middle + width * std, middle, middle - width * std
+
+
+def pivot_points(high, low, window=5):
+    """
+    좌우 window 개 캔들보다 높은 고점 / 낮은 저점의 인덱스를 반환합니다.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    size = 2 * window + 1
+    if len(high) < size:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+    center = slice(window, len(high) - window)
+    pivot_highs = np.flatnonzero(sliding_window_view(high, size).max(axis=1) == high[center]) + window
+    pivot_lows = np.flatnonzero(sliding_window_view(low, size).min(axis=1) == low[center]) + window
+    return pivot_highs, pivot_lows
+
+
+def _cluster_levels(levels, tolerance):
+    """
+    서로 tolerance(비율) 이내인 가격 수준을 하나로 묶고, 묶인 개수(터치 수)와 함께 반환합니다.
+    """
+    if not len(levels):
+        return []
+    levels = np.sort(levels)
+    breaks = np.flatnonzero(np.diff(levels) / levels[:-1] > tolerance) + 1
+    groups = np.split(levels, breaks)
+    return [(float(group.mean()), len(group)) for group in groups]
+
+
+def support_resistance(high, low, close, window=5, tolerance=0.005, max_levels=3):
+    pivot_highs, pivot_lows = pivot_points(high, low, window)
+    last = close[-1]
+    candidates = np.concatenate((np.asarray(high)[pivot_highs], np.asarray(low)[pivot_lows]))
+    clusters = _cluster_levels(candidates, tolerance)
+    # 터치 수가 많은 순, 같으면 현재가에 가까운 순
+    clusters.sort(key=lambda c: (-c[1], abs(c[0] - last)))
+    support = sorted((lvl for lvl, _ in clusters if lvl < last), reverse=True)[:max_levels]
+    resistance = sorted(lvl for lvl, _ in clusters if lvl >= last)[:max_levels]
+    return support, resistance
+
+
+def fibonacci_retracement(high, low, lookback=120):
+    high = np.asarray(high)[-lookback:]
+    low = np.asarray(low)[-lookback:]
+    high_idx = int(np.argmax(high))
+    low_idx = int(np.argmin(low))
+    swing_high, swing_low = float(high[high_idx]), float(low[low_idx])
+    uptrend = low_idx < high_idx
+    span = swing_high - swing_low
+    # 상승 추세면 고점에서 되돌림, 하락 추세면 저점에서 반등 기준으로 수준을 계산합니다.
+    levels = {
+        f"{ratio:.3f}": swing_high - span * ratio if uptrend else swing_low + span * ratio
+        for ratio in FIBONACCI_RATIOS
+    }
+    return swing_high, swing_low, ('up' if uptrend else 'down'), levels
+
+
+def candlestick_patterns(open_, high, low, close):
+    """
+    대표적인 캔들 패턴을 전체 배열에 대해 한 번에 판별한 boolean 배열 dict 를 반환합니다.
+    """
+    open_, high, low, close = (np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+    body = np.abs(close - open_)
+    full_range = np.maximum(high - low, 1e-12)
+    upper_shadow = high - np.maximum(open_, close)
+    lower_shadow = np.minimum(open_, close) - low
+    bullish = close > open_
+    bearish = close < open_
+
+    prev_open = np.roll(open_, 1)
+    prev_close = np.roll(close, 1)
+    prev_bullish = np.roll(bullish, 1)
+    prev_bearish = np.roll(bearish, 1)
+    bullish_engulfing = bullish & prev_bearish & (close >= prev_open) & (open_ <= prev_close)
+    bearish_engulfing = bearish & prev_bullish & (open_ >= prev_close) & (close <= prev_open)
+    bullish_engulfing[0] = bearish_engulfing[0] = False
+
+    return {
+        'doji': body <= full_range * 0.1,
+        'hammer': (lower_shadow >= body * 2) & (upper_shadow <= body * 0.5) & (body > 0),
+        'shooting_star': (upper_shadow >= body * 2) & (lower_shadow <= body * 0.5) & (body > 0),
+        'bullish_engulfing': bullish_engulfing,
+        'bearish_engulfing': bearish_engulfing,
+    }
+
+
+def _last(values):
+    value = float(values[-1])
+    return None if math.isnan(value) else value
+
+
+def _round(value, digits=4):
+    return None if value is None else round(value, digits)
+
+
+def compute_indicators(candles, recent=10):
+    """
+    캔들 배열(candles_to_arrays 결과 또는 업비트 캔들 dict 리스트)에 대해 모든 지표를 계산합니다.
+
+    Returns:
+        dict: ChartReport 분석 필드 이름을 키로 하는 JSON 직렬화 가능한 수치 결과
+    """
+    arrays = candles if isinstance(candles, dict) else candles_to_arrays(candles)
+    open_, high, low, close = arrays['open'], arrays['high'], arrays['low'], arrays['close']
+    last_close = float(close[-1])
+
+    sma_values = {period: sma(close, period) for period in (5, 20, 60, 120)}
+    ema_values = {period: ema(close, period) for period in (12, 26)}
+    upper, middle, lower = bollinger_bands(close)
+    rsi_values = rsi(close)
+    macd_line, signal_line, histogram = macd(close)
+    support, resistance = support_resistance(high, low, close)
+    swing_high, swing_low, fib_trend, fib_levels = fibonacci_retracement(high, low)
+    patterns = candlestick_patterns(open_, high, low, close)
+
+    sma20, sma60 = _last(sma_values[20]), _last(sma_values[60])
+    if sma20 is None or sma60 is None:
+        trend = None
+    elif sma20 > sma60 * 1.002:
+        trend = 'up'
+    elif sma20 < sma60 * 0.998:
+        trend = 'down'
+    else:
+        trend = 'sideways'
+
+    bb_upper, bb_middle, bb_lower = _last(upper), _last(middle), _last(lower)
+    bb_width = bb_upper - bb_lower if bb_upper is not None else None
+    last_rsi = _last(rsi_values)
+    hist_now, hist_prev = _last(histogram), _last(histogram[:-1]) if len(histogram) > 1 else None
+    if hist_prev is None or hist_now is None:
+        crossover = None
+    elif hist_prev <= 0 < hist_now:
+        crossover = 'bullish'
+    elif hist_prev >= 0 > hist_now:
+        crossover = 'bearish'
+    else:
+        crossover = 'none'
+
+    return {
+        'technical_analysis': {
+            'close': last_close,
+            'change_pct': _round((last_close / float(close[-2]) - 1) * 100) if len(close) > 1 else None,
+            'trend': trend,
+            'candles': int(len(close)),
+        },
+        'candlestick_analysis': {
+            'last': [name for name, flags in patterns.items() if flags[-1]],
+            'recent_counts': {name: int(flags[-recent:].sum()) for name, flags in patterns.items()},
+        },
+        'moving_average_analysis': {
+            **{f'sma_{period}': _round(_last(values), 2) for period, values in sma_values.items()},
+            **{f'ema_{period}': _round(_last(values), 2) for period, values in ema_values.items()},
+        },
+        'bollinger_bands_analysis': {
+            'upper': _round(bb_upper, 2),
+            'middle': _round(bb_middle, 2),
+            'lower': _round(bb_lower, 2),
+            'bandwidth': _round(bb_width / bb_middle) if bb_width is not None else None,
+            'percent_b': _round((last_close - bb_lower) / bb_width) if bb_width else None,
+        },
+        'rsi_analysis': {
+            'rsi': _round(last_rsi, 2),
+            'state': None if last_rsi is None else 'overbought' if last_rsi >= 70 else 'oversold' if last_rsi <= 30 else 'neutral',
+        },
+        'fibonacci_retracement_analysis': {
+            'swing_high': swing_high,
+            'swing_low': swing_low,
+            'trend': fib_trend,
+            'levels': {ratio: _round(level, 2) for ratio, level in fib_levels.items()},
+        },
+        'macd_analysis': {
+            'macd': _round(_last(macd_line), 2),
+            'signal': _round(_last(signal_line), 2),
+            'histogram': _round(hist_now, 2),
+            'crossover': crossover,
+        },
+        'support_resistance_analysis': {
+            'support': [_round(level, 2) for level in support],
+            'resistance': [_round(level, 2) for level in resistance],
+        },
+    }
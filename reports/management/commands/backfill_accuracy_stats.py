@@ -0,0 +1,46 @@
+# 장고 관련 임포트
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum, Case, When, IntegerField
+from django.db.models.functions import TruncDate
+
+# 로컬 애플리케이션 임포트
+from reports.models import Accuracy, AccuracyDailyStat, AccuracySummary, AccuracyTotal
+
+
+class Command(BaseCommand):
+    help = "기존 Accuracy 기록으로 누적 통계(AccuracyDailyStat, AccuracyTotal, AccuracySummary)를 다시 만듭니다."
+
+    def handle(self, *args, **options):
+        correct = Sum(Case(When(is_correct=True, then=1), default=0, output_field=IntegerField()))
+        daily = (
+            Accuracy.objects
+            .annotate(date=TruncDate('calculated_at'))
+            .values('date', 'recommendation')
+            .annotate(count=Count('id'), total=Sum('accuracy'), correct=correct)
+            .order_by()
+        )
+        overall = Accuracy.objects.aggregate(count=Count('id'), total=Sum('accuracy'), correct=correct)
+
+        with transaction.atomic():
+            AccuracyDailyStat.objects.all().delete()
+            AccuracyDailyStat.objects.bulk_create([
+                AccuracyDailyStat(
+                    date=row['date'],
+                    recommendation=row['recommendation'],
+                    count=row['count'],
+                    total=row['total'] or 0,
+                    correct=row['correct'] or 0,
+                )
+                for row in daily
+            ], batch_size=500)
+            AccuracyTotal.objects.update_or_create(name='all', defaults={
+                'count': overall['count'],
+                'total': overall['total'] or 0,
+                'correct': overall['correct'] or 0,
+            })
+            AccuracySummary.refresh()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{AccuracyDailyStat.objects.count()}개 일자별 통계, 전체 {overall['count']}건으로 누적 통계를 다시 만들었습니다."
+        ))
@@ -0,0 +1,107 @@
+# 파이썬 표준 라이브러리
+import os
+import time
+import base64
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+# 장고 관련 임포트
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 로컬 애플리케이션 임포트
+from reports.models import ChartReport
+from reports.services.image_preprocessing import prepare_chart_image, to_data_url
+from reports.services.openai_client import get_openai_client
+from reports.services.openai_service import OpenAIService
+
+
+class Command(BaseCommand):
+    help = "차트 분석 요청의 이미지 전송 크기와 (--live) 응답 지연 시간을 전처리 전/후, (--modes) 분석 방식별로 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('image', nargs='?', help="비교할 차트 이미지 경로 (기본값: 가장 최근 ChartReport 이미지)")
+        parser.add_argument('--live', action='store_true', help="실제 API 를 호출해 지연 시간과 토큰 사용량을 측정합니다 (LLM 캐시 미사용)")
+        parser.add_argument('--repeat', type=int, default=3, help="--live 측정 반복 횟수")
+        parser.add_argument('--format', default=None, help="전처리 인코딩 포맷 (WEBP, JPEG, PNG)")
+        parser.add_argument('--quality', type=int, default=None, help="전처리 인코딩 품질")
+        parser.add_argument('--modes', action='store_true', help="--live 와 함께 single / fanout 분석 방식의 지연 시간과 토큰 비용을 비교합니다")
+        parser.add_argument('--input-price', type=float, default=0.15, help="입력 토큰 1M 개당 가격(USD)")
+        parser.add_argument('--output-price', type=float, default=0.60, help="출력 토큰 1M 개당 가격(USD)")
+
+    def _resolve_image(self, path):
+        if path:
+            if not os.path.exists(path):
+                raise CommandError(f"이미지를 찾을 수 없습니다: {path}")
+            return path
+        report = ChartReport.objects.exclude(image_url__isnull=True).exclude(image_url='').order_by('-timestamp').first()
+        if not report:
+            raise CommandError("비교할 이미지가 없습니다. 이미지 경로를 지정해주세요.")
+        return os.path.join(settings.MEDIA_ROOT, report.image_url.replace(settings.MEDIA_URL, ""))
+
+    def handle(self, *args, **options):
+        path = self._resolve_image(options['image'])
+
+        with open(path, 'rb') as f:
+            original = f.read()
+        original_url = f"data:image/png;base64,{base64.b64encode(original).decode('utf-8')}"
+
+        start = time.perf_counter()
+        data, mime_type = prepare_chart_image(path, image_format=options['format'], quality=options['quality'])
+        prep_seconds = time.perf_counter() - start
+        prepared_url = to_data_url(data, mime_type)
+
+        self.stdout.write(f"이미지: {path}")
+        self.stdout.write(f"{'':<10}{'파일 bytes':>14}{'요청 bytes(base64)':>22}")
+        self.stdout.write(f"{'before':<10}{len(original):>14,}{len(original_url):>22,}")
+        self.stdout.write(f"{'after':<10}{len(data):>14,}{len(prepared_url):>22,}")
+        self.stdout.write(f"전송량 {len(prepared_url) / len(original_url):.1%} ({mime_type}), 전처리 {prep_seconds * 1000:.1f}ms")
+
+        if not options['live']:
+            return
+
+        client = get_openai_client()
+        self._compare_payloads(client, original_url, prepared_url, options['repeat'])
+        if options['modes']:
+            self._compare_modes(client, prepared_url, options)
+
+    def _compare_payloads(self, client, original_url, prepared_url, repeat):
+        for label, image_url in (('before', original_url), ('after', prepared_url)):
+            latencies = []
+            prompt_tokens = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = client.chat.completions.create(**OpenAIService.chart_request(image_url))
+                latencies.append(time.perf_counter() - start)
+                if response.usage:
+                    prompt_tokens.append(response.usage.prompt_tokens)
+            tokens = f", prompt tokens {statistics.mean(prompt_tokens):.0f}" if prompt_tokens else ""
+            self.stdout.write(
+                f"{label:<10}latency median {statistics.median(latencies):.2f}s "
+                f"(min {min(latencies):.2f}s, max {max(latencies):.2f}s){tokens}"
+            )
+
+    def _compare_modes(self, client, image_url, options):
+        modes = {
+            'single': [OpenAIService.chart_request(image_url)],
+            'fanout': list(OpenAIService.chart_group_requests(image_url).values()),
+        }
+        for mode, requests in modes.items():
+            latencies = []
+            usages = []
+            with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    responses = list(executor.map(lambda request: client.chat.completions.create(**request), requests))
+                    latencies.append(time.perf_counter() - start)
+                    usages.append((
+                        sum(response.usage.prompt_tokens for response in responses if response.usage),
+                        sum(response.usage.completion_tokens for response in responses if response.usage),
+                    ))
+            prompt_tokens = statistics.mean(usage[0] for usage in usages)
+            completion_tokens = statistics.mean(usage[1] for usage in usages)
+            cost = (prompt_tokens * options['input_price'] + completion_tokens * options['output_price']) / 1_000_000
+            self.stdout.write(
+                f"{mode:<10}{len(requests)} requests, wall-clock median {statistics.median(latencies):.2f}s, "
+                f"tokens in/out {prompt_tokens:.0f}/{completion_tokens:.0f}, ${cost:.5f} per analysis"
+            )
@@ -0,0 +1,35 @@
+# 장고 관련 임포트
+from django.core.management.base import BaseCommand
+
+# 로컬 애플리케이션 임포트
+from reports.models import Price, PriceRollup
+
+
+class Command(BaseCommand):
+    help = "저장된 Price 로 1분/1시간/1일 OHLC 롤업(PriceRollup)을 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--market', default=None, help="특정 마켓만 다시 만듭니다")
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        prices = Price.objects.order_by('timestamp')
+        rollups = PriceRollup.objects.all()
+        if options['market']:
+            prices = prices.filter(market=options['market'])
+            rollups = rollups.filter(market=options['market'])
+        rollups.delete()
+
+        chunk = []
+        total = 0
+        for price in prices.only('market', 'timestamp', 'trade_price').iterator(chunk_size=options['chunk_size']):
+            chunk.append(price)
+            if len(chunk) >= options['chunk_size']:
+                PriceRollup.record_many(chunk)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            PriceRollup.record_many(chunk)
+            total += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Price {total}건으로 롤업 {PriceRollup.objects.count()}개를 만들었습니다."))
@@ -0,0 +1,27 @@
+# 장고 관련 임포트
+from django.core.management.base import BaseCommand
+
+# 로컬 애플리케이션 임포트
+from reports.models import MainReport, ChartReport, NewsReport, ReportSnapshot
+from reports.snapshots import refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = "리포트 상세 응답 스냅샷(ReportSnapshot)을 다시 렌더링합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing', action='store_true', help="스냅샷이 없는 리포트만 렌더링합니다")
+
+    def handle(self, *args, **options):
+        total = 0
+        for kind, model in (('main', MainReport), ('chart', ChartReport), ('news', NewsReport)):
+            ids = model.objects.values_list('id', flat=True)
+            if options['missing']:
+                ids = ids.exclude(id__in=ReportSnapshot.objects.filter(kind=kind).values('object_id'))
+            count = 0
+            for object_id in ids.iterator():
+                refresh_snapshot(kind, object_id)
+                count += 1
+            self.stdout.write(f"{kind}: {count}개")
+            total += count
+        self.stdout.write(self.style.SUCCESS(f"스냅샷 {total}개를 렌더링했습니다."))
@@ -0,0 +1,77 @@
+# 파이썬 표준 라이브러리
+import json
+from datetime import timedelta
+
+# 장고 관련 임포트
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# 로컬 애플리케이션 임포트
+from reports.backtest import run_backtest, default_horizons
+from reports.models import DEFAULT_MARKET, BacktestResult, PriceRollup
+
+
+class Command(BaseCommand):
+    help = "MainReport 추천 전체를 horizon / threshold 조합으로 다시 채점해 BacktestResult 에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--market', default=DEFAULT_MARKET)
+        parser.add_argument('--horizons', default=None, help="쉼표로 구분한 horizon 라벨 (예: 1h,4h,24h). 기본값: BACKTEST_HORIZONS")
+        parser.add_argument('--thresholds', default=None, help="쉼표로 구분한 퍼센트 임계값 (예: 0,0.5,1). 기본값: BACKTEST_THRESHOLDS")
+        parser.add_argument('--hold-band', type=float, default=None, help="HOLD 정답 변동률 범위(±%%)")
+        parser.add_argument('--days', type=int, default=None, help="최근 N 일의 리포트만 채점합니다")
+        parser.add_argument('--interval', default=None, choices=list(PriceRollup.INTERVALS), help="Price 대신 PriceRollup 종가 시계열을 사용합니다")
+        parser.add_argument('--clear', action='store_true', help="채점 전에 해당 마켓의 기존 결과를 지웁니다 (규칙 변경 시). --days 와 함께 쓰면 그 기간만 지웁니다")
+        parser.add_argument('--json', action='store_true', help="요약을 JSON 으로 출력합니다")
+
+    def _parse_horizons(self, value):
+        if not value:
+            return None
+        configured = default_horizons()
+        horizons = {}
+        for label in value.split(','):
+            label = label.strip()
+            if label in configured:
+                horizons[label] = configured[label]
+            elif label[:-1].isdigit() and label[-1] in 'mhd':
+                horizons[label] = int(label[:-1]) * {'m': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}[label[-1]]
+            else:
+                raise CommandError(f"알 수 없는 horizon 입니다: {label}")
+        return horizons
+
+    @staticmethod
+    def _format_cell(stats):
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats['hit_rate'] is not None else '-'
+        return f"{hit_rate} ({stats['count']})"
+
+    def handle(self, *args, **options):
+        horizons = self._parse_horizons(options['horizons'])
+        thresholds = [float(value) for value in options['thresholds'].split(',')] if options['thresholds'] else None
+        since = timezone.now() - timedelta(days=options['days']) if options['days'] else None
+
+        if options['clear']:
+            # --days 를 주면 다시 채점할 기간의 결과만 지웁니다.
+            queryset = BacktestResult.objects.filter(market=options['market'])
+            if since:
+                queryset = queryset.filter(main_report__created_at__gte=since)
+            deleted, _ = queryset.delete()
+            self.stdout.write(f"기존 결과 {deleted}건 삭제")
+
+        result = run_backtest(
+            market=options['market'], horizons=horizons, thresholds=thresholds,
+            since=since, interval=options['interval'], hold_band=options['hold_band'],
+        )
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2, default=str))
+            return
+
+        self.stdout.write(
+            f"리포트 {result['reports']}개, 가격 {result['prices']}개 → 결과 {result['results']}행 "
+            f"(load {result['timings']['load']}s, evaluate {result['timings']['evaluate']}s, write {result['timings']['write']}s)"
+        )
+        self.stdout.write(f"{'horizon':<10}{'threshold':>10}{'ALL':>16}{'BUY':>16}{'SELL':>16}{'HOLD':>16}")
+        for horizon, by_threshold in result['summary'].items():
+            for threshold, groups in by_threshold.items():
+                cells = ''.join(f"{self._format_cell(stats):>16}" for stats in groups.values())
+                self.stdout.write(f"{horizon:<10}{threshold:>10}{cells}")
+        self.stdout.write(self.style.SUCCESS("백테스트가 완료되었습니다."))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0007_mainreport_chart_report_id_mainreport_news_report_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chartreport',
+            name='indicator_values',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
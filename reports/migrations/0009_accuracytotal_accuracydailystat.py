@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0008_chartreport_indicator_values'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccuracyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(default='all', max_length=20, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AccuracyDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('recommendation', models.CharField(max_length=4)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('date', 'recommendation')},
+            },
+        ),
+    ]
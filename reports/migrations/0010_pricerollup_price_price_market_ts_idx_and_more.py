@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 10:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0009_accuracytotal_accuracydailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('market', models.CharField(max_length=20)),
+                ('interval', models.CharField(choices=[('1m', '1m'), ('1h', '1h'), ('1d', '1d')], max_length=3)),
+                ('bucket', models.DateTimeField()),
+                ('open', models.DecimalField(decimal_places=8, max_digits=20)),
+                ('high', models.DecimalField(decimal_places=8, max_digits=20)),
+                ('low', models.DecimalField(decimal_places=8, max_digits=20)),
+                ('close', models.DecimalField(decimal_places=8, max_digits=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('open_time', models.DateTimeField()),
+                ('close_time', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='price',
+            index=models.Index(fields=['market', '-timestamp'], name='price_market_ts_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='pricerollup',
+            unique_together={('market', 'interval', 'bucket')},
+        ),
+    ]
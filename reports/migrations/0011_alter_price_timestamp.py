@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_pricerollup_price_price_market_ts_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='price',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-18 10:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0011_alter_price_timestamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BacktestResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('market', models.CharField(default='KRW-BTC', max_length=20)),
+                ('horizon', models.CharField(max_length=10)),
+                ('threshold', models.FloatField()),
+                ('direction', models.SmallIntegerField()),
+                ('entry_price', models.FloatField()),
+                ('exit_price', models.FloatField()),
+                ('return_pct', models.FloatField()),
+                ('is_correct', models.BooleanField(default=False)),
+                ('evaluated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('main_report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='backtest_results', to='reports.mainreport')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='backtestresult',
+            index=models.Index(fields=['market', 'horizon', 'threshold'], name='backtest_market_rule_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='backtestresult',
+            unique_together={('main_report', 'market', 'horizon', 'threshold')},
+        ),
+    ]
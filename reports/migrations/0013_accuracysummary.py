@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 10:16
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0012_backtestresult_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccuracySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(choices=[('1d', '1d'), ('7d', '7d'), ('30d', '30d')], max_length=3)),
+                ('recommendation', models.CharField(max_length=4)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('average_accuracy', models.FloatField(null=True)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'unique_together': {('window', 'recommendation')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0013_accuracysummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accuracy',
+            index=models.Index(fields=['-calculated_at'], name='accuracy_calculated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chartreport',
+            index=models.Index(fields=['-timestamp'], name='chartreport_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainreport',
+            index=models.Index(fields=['-created_at', '-id'], name='mainreport_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsreport',
+            index=models.Index(fields=['-created_at'], name='newsreport_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportweights',
+            index=models.Index(fields=['-created_at'], name='weights_created_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0014_accuracy_accuracy_calculated_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('main', 'MainReport'), ('chart', 'ChartReport'), ('news', 'NewsReport')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('etag', models.CharField(max_length=64)),
+                ('content', models.BinaryField()),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
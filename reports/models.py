@@ -1,7 +1,37 @@
-from django.db import models
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
 
+# MainReport 한 개에 딸린 리포트 묶음 (chart_report_id / news_report_id / weights_id 로 연결)
+ReportBundle = namedtuple('ReportBundle', ['chart_report', 'news_report', 'weights'])
+
+
+class MainReportQuerySet(models.QuerySet):
+    def with_counts(self):
+        """
+        like_count, comment_count 를 서브쿼리로 붙입니다. (JOIN 없이 리포트 조회 쿼리 한 번에 포함)
+        """
+        from accounts.models import Comment  # 순환 임포트 방지를 위해 여기서 임포트
+
+        likes = (
+            self.model.likers.through.objects.filter(mainreport_id=OuterRef('pk'))
+            .order_by().values('mainreport_id').annotate(count=Count('pk')).values('count')
+        )
+        comments = (
+            Comment.objects.filter(report_id=OuterRef('pk'))
+            .order_by().values('report_id').annotate(count=Count('pk')).values('count')
+        )
+        return self.annotate(
+            like_count=Coalesce(Subquery(likes), 0),
+            comment_count=Coalesce(Subquery(comments), 0),
+        )
+
+
 # 메인 리포트 모델
 class MainReport(models.Model):
     title = models.TextField(max_length=200)
@@ -18,6 +48,34 @@ class MainReport(models.Model):
     weights_id = models.IntegerField(null=True, blank=True)
     likers = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='liked_reports', blank=True)
 
+    objects = MainReportQuerySet.as_manager()
+
+    class Meta:
+        # 최신 리포트 / 목록 조회 (order_by('-created_at'), 동일 시각은 id 로 정렬)
+        indexes = [models.Index(fields=['-created_at', '-id'], name='mainreport_created_id_idx')]
+
+    @staticmethod
+    def load_bundles(reports):
+        """
+        리포트 목록의 차트/뉴스/가중치 리포트를 종류별로 한 번씩만 조회합니다. (리포트 수와 관계없이 최대 3개 쿼리)
+
+        Returns:
+            dict: {MainReport id: ReportBundle}
+        """
+        reports = list(reports)
+        related = {}
+        for name, model in (('chart_report', ChartReport), ('news_report', NewsReport), ('weights', ReportWeights)):
+            ids = {getattr(report, f'{name}_id') for report in reports} - {None}
+            related[name] = model.objects.in_bulk(ids) if ids else {}
+        return {
+            report.id: ReportBundle(
+                chart_report=related['chart_report'].get(report.chart_report_id),
+                news_report=related['news_report'].get(report.news_report_id),
+                weights=related['weights'].get(report.weights_id),
+            )
+            for report in reports
+        }
+
     def __str__(self):
         return self.title
 
@@ -35,6 +93,10 @@ class ChartReport(models.Model):
     macd_analysis = models.JSONField()
     support_resistance_analysis = models.JSONField()
     overall_recommendation = models.CharField(max_length=50, null=True, blank=True)
+    indicator_values = models.JSONField(null=True, blank=True)  # reports.indicators 로 계산한 타임프레임별 수치 지표
+
+    class Meta:
+        indexes = [models.Index(fields=['-timestamp'], name='chartreport_ts_idx')]
 
     def __str__(self):
         return f"Chart Report for {self.main_report.title if self.main_report else 'Unassigned'}"
@@ -46,6 +108,9 @@ class NewsReport(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     news_analysis = models.JSONField()
 
+    class Meta:
+        indexes = [models.Index(fields=['-created_at'], name='newsreport_created_idx')]
+
     def __str__(self):
         return f"News Report for {self.main_report.title if self.main_report else 'Unassigned'}"
 
@@ -69,6 +134,9 @@ class ReportWeights(models.Model):
     reasoning = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['-created_at'], name='weights_created_idx')]
+
     def to_dict(self):
         return {
             'overall_weight': self.overall_weight,
@@ -89,16 +157,130 @@ class ReportWeights(models.Model):
     def __str__(self):
         return f"Weights for {self.main_report.title if self.main_report else 'Unassigned'}"
 
+DEFAULT_MARKET = "KRW-BTC"
+
+
+class PriceQuerySet(models.QuerySet):
+    """
+    (market, timestamp) 인덱스를 타는 시계열 조회 API 입니다.
+    """
+    def for_market(self, market=DEFAULT_MARKET):
+        return self.filter(market=market)
+
+    def latest_price(self, market=DEFAULT_MARKET):
+        return self.for_market(market).order_by('-timestamp').first()
+
+    def at_or_before(self, timestamp, market=DEFAULT_MARKET):
+        # timestamp 시점에 유효했던 가격 (그 시점 이전의 가장 최근 가격)
+        return self.for_market(market).filter(timestamp__lte=timestamp).order_by('-timestamp').first()
+
+    def before(self, timestamp, market=DEFAULT_MARKET):
+        return self.for_market(market).filter(timestamp__lt=timestamp).order_by('-timestamp').first()
+
+    def between(self, start, end, market=DEFAULT_MARKET):
+        return self.for_market(market).filter(timestamp__gte=start, timestamp__lt=end).order_by('timestamp')
+
+
 class Price(models.Model):
     main_report = models.ForeignKey(MainReport, on_delete=models.CASCADE, related_name='prices', null=True)
     market = models.CharField(max_length=20)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)  # 샘플러는 체결 시각을 직접 지정합니다.
     trade_price = models.DecimalField(max_digits=20, decimal_places=8)
-    
+
+    objects = PriceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=['market', '-timestamp'], name='price_market_ts_idx')]
+
     def __str__(self):
         return f"{self.market}: {self.trade_price} at {self.timestamp}"
 
 
+class PriceRollup(models.Model):
+    """
+    Price 를 1분/1시간/1일 단위 OHLC 로 다운샘플링한 테이블입니다. 버킷 경계는 UTC 기준입니다.
+    Price 가 저장될 때(시그널) 또는 record_many 로 함께 갱신됩니다.
+    """
+    INTERVALS = {'1m': 60, '1h': 60 * 60, '1d': 60 * 60 * 24}
+    UPDATE_FIELDS = ['open', 'high', 'low', 'close', 'count', 'open_time', 'close_time']
+
+    market = models.CharField(max_length=20)
+    interval = models.CharField(max_length=3, choices=[(interval, interval) for interval in INTERVALS])
+    bucket = models.DateTimeField()  # 구간 시작 시각
+    open = models.DecimalField(max_digits=20, decimal_places=8)
+    high = models.DecimalField(max_digits=20, decimal_places=8)
+    low = models.DecimalField(max_digits=20, decimal_places=8)
+    close = models.DecimalField(max_digits=20, decimal_places=8)
+    count = models.PositiveIntegerField(default=0)
+    open_time = models.DateTimeField()
+    close_time = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('market', 'interval', 'bucket')
+
+    @classmethod
+    def bucket_start(cls, timestamp, interval):
+        seconds = cls.INTERVALS[interval]
+        epoch = int(timestamp.timestamp())
+        return datetime.fromtimestamp(epoch - epoch % seconds, tz=dt_timezone.utc)
+
+    def merge(self, other):
+        self.high = max(self.high, other.high)
+        self.low = min(self.low, other.low)
+        if other.open_time < self.open_time:
+            self.open, self.open_time = other.open, other.open_time
+        if other.close_time >= self.close_time:
+            self.close, self.close_time = other.close, other.close_time
+        self.count += other.count
+
+    @classmethod
+    def record_many(cls, prices):
+        """
+        Price 리스트를 모든 구간의 롤업에 반영합니다. 기존 버킷은 한 번에 읽어 병합한 뒤 한 번의 upsert 로 저장합니다.
+        """
+        rollups = {}
+        for price in prices:
+            for interval in cls.INTERVALS:
+                bucket = cls.bucket_start(price.timestamp, interval)
+                rollup = cls(
+                    market=price.market, interval=interval, bucket=bucket,
+                    open=price.trade_price, high=price.trade_price, low=price.trade_price, close=price.trade_price,
+                    count=1, open_time=price.timestamp, close_time=price.timestamp,
+                )
+                key = (price.market, interval, bucket)
+                if key in rollups:
+                    rollups[key].merge(rollup)
+                else:
+                    rollups[key] = rollup
+        if not rollups:
+            return []
+
+        with transaction.atomic():
+            existing = cls.objects.select_for_update().filter(
+                market__in={key[0] for key in rollups},
+                interval__in={key[1] for key in rollups},
+                bucket__in={key[2] for key in rollups},
+            )
+            for row in existing:
+                key = (row.market, row.interval, row.bucket)
+                if key in rollups:
+                    row.merge(rollups[key])
+                    rollups[key] = row
+            return cls.objects.bulk_create(
+                list(rollups.values()),
+                update_conflicts=True,
+                unique_fields=['market', 'interval', 'bucket'],
+                update_fields=cls.UPDATE_FIELDS,
+            )
+
+    @classmethod
+    def series(cls, start, end, interval='1h', market=DEFAULT_MARKET):
+        return cls.objects.filter(market=market, interval=interval, bucket__gte=start, bucket__lt=end).order_by('bucket')
+
+    def __str__(self):
+        return f"{self.market} {self.interval} {self.bucket}: O{self.open} H{self.high} L{self.low} C{self.close}"
+
+
 class Accuracy(models.Model):
     RECOMMENDATION_CHOICES = [
         ('BUY', 1),
@@ -114,13 +296,21 @@ class Accuracy(models.Model):
     price_change = models.FloatField(default=0)
     is_correct = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [models.Index(fields=['-calculated_at'], name='accuracy_calculated_idx')]
+
     @staticmethod
     def calculate_and_save_accuracy():
         from .models import MainReport, Price  # 순환 임포트 방지를 위해 여기서 임포트
 
         latest_report = MainReport.objects.order_by('-created_at').first()
-        latest_price = Price.objects.order_by('-timestamp').first()
-        previous_price = Price.objects.order_by('-timestamp')[1:2].first()
+        latest_price = Price.objects.latest_price()
+        # 리포트가 나온 시점의 가격을 기준으로 평가합니다. (샘플러가 저장한 가격 시계열에서 조회)
+        previous_price = None
+        if latest_report and latest_price:
+            previous_price = Price.objects.at_or_before(latest_report.created_at)
+            if previous_price is None or previous_price.pk == latest_price.pk:
+                previous_price = Price.objects.before(latest_price.timestamp)
 
         if not latest_report or not latest_price or not previous_price:
             accuracy = 1.0
@@ -155,15 +345,217 @@ class Accuracy(models.Model):
             price_change=price_change,
             is_correct=is_correct
         )
-        new_accuracy.save()
+        new_accuracy.save()  # post_save 시그널에서 누적 통계(AccuracyDailyStat, AccuracyTotal)가 갱신됩니다.
 
-        # 평균 정확도 계산 및 저장 (퍼센트로 변환)
-        all_accuracies = Accuracy.objects.all()
-        average_accuracy = (sum(acc.accuracy for acc in all_accuracies) / all_accuracies.count()) * 100
-        new_accuracy.average_accuracy = average_accuracy
-        new_accuracy.save()
+        # 평균 정확도 계산 및 저장 (퍼센트로 변환). 전체 행을 읽지 않고 누적 통계를 사용합니다.
+        new_accuracy.average_accuracy = (AccuracyTotal.average() or 0) * 100
+        new_accuracy.save(update_fields=['average_accuracy'])
 
         return new_accuracy
 
     def __str__(self):
-        return f"Accuracy: {self.accuracy:.2f}, Avg: {self.average_accuracy:.2f}%, Recommendation: {self.recommendation} ({self.recommendation_value}), Price Change: {self.price_change:.2f}%, Correct: {self.is_correct}, Calculated at: {self.calculated_at}"
\ No newline at end of file
+        return f"Accuracy: {self.accuracy:.2f}, Avg: {self.average_accuracy:.2f}%, Recommendation: {self.recommendation} ({self.recommendation_value}), Price Change: {self.price_change:.2f}%, Correct: {self.is_correct}, Calculated at: {self.calculated_at}"
+
+
+# 정확도 누적 통계 (일자/추천별). Accuracy 가 저장될 때마다 F() 로 원자적으로 갱신됩니다.
+class AccuracyDailyStat(models.Model):
+    date = models.DateField()
+    recommendation = models.CharField(max_length=4)
+    count = models.PositiveIntegerField(default=0)
+    total = models.FloatField(default=0)  # accuracy 합계
+    correct = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('date', 'recommendation')  # date 로 시작하는 인덱스이므로 기간 조회에도 사용됩니다.
+
+    @classmethod
+    def record(cls, accuracy, sign=1):
+        """
+        sign=1 이면 accuracy 한 건을 더하고, -1 이면 뺍니다. (삭제되었거나 수정되기 전 값)
+        """
+        date = timezone.localdate(accuracy.calculated_at)
+        if sign > 0:
+            cls.objects.get_or_create(date=date, recommendation=accuracy.recommendation)
+        cls.objects.filter(date=date, recommendation=accuracy.recommendation).update(
+            count=F('count') + sign,
+            total=F('total') + sign * accuracy.accuracy,
+            correct=F('correct') + sign * int(accuracy.is_correct),
+        )
+
+    @classmethod
+    def window(cls, days, recommendation=None):
+        """
+        최근 days 일(오늘 포함)의 count, total, correct 합계를 반환합니다. 최대 days x 추천 종류 수 만큼의 행만 읽습니다.
+        """
+        queryset = cls.objects.filter(date__gt=timezone.localdate() - timedelta(days=days))
+        if recommendation:
+            queryset = queryset.filter(recommendation=recommendation)
+        result = queryset.aggregate(count=Sum('count'), total=Sum('total'), correct=Sum('correct'))
+        return {key: value or 0 for key, value in result.items()}
+
+    @classmethod
+    def window_average(cls, days, recommendation=None):
+        result = cls.window(days, recommendation)
+        return result['total'] / result['count'] if result['count'] else None
+
+    def __str__(self):
+        return f"{self.date} {self.recommendation}: {self.total}/{self.count}"
+
+
+class AccuracyTotal(models.Model):
+    name = models.CharField(max_length=20, unique=True, default='all')
+    count = models.PositiveIntegerField(default=0)
+    total = models.FloatField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def record(cls, accuracy, name='all', sign=1):
+        if sign > 0:
+            cls.objects.get_or_create(name=name)
+        cls.objects.filter(name=name).update(
+            count=F('count') + sign,
+            total=F('total') + sign * accuracy.accuracy,
+            correct=F('correct') + sign * int(accuracy.is_correct),
+            updated_at=timezone.now(),
+        )
+
+    @classmethod
+    def average(cls, name='all'):
+        stat = cls.objects.filter(name=name).first()
+        return stat.total / stat.count if stat and stat.count else None
+
+    def __str__(self):
+        return f"{self.name}: {self.total}/{self.count}"
+
+
+# 기간(1d/7d/30d) x 추천별 정확도 요약. calculate_accuracy_task 가 새 Accuracy 를 저장할 때마다 다시 계산해 저장하고,
+# API 는 이 테이블을 그대로 읽습니다.
+class AccuracySummary(models.Model):
+    WINDOWS = {'1d': 1, '7d': 7, '30d': 30}
+    ALL = 'ALL'
+
+    window = models.CharField(max_length=3, choices=[(window, window) for window in WINDOWS])
+    recommendation = models.CharField(max_length=4)  # 'ALL' 또는 BUY/SELL/HOLD
+    count = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    average_accuracy = models.FloatField(null=True)  # 퍼센트, 기록이 없으면 None
+    start_date = models.DateField()
+    end_date = models.DateField()
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('window', 'recommendation')
+
+    @classmethod
+    def refresh(cls):
+        """
+        가장 긴 기간의 AccuracyDailyStat 을 한 번 읽어 모든 기간/추천 조합을 계산하고 한 번의 upsert 로 저장합니다.
+        """
+        today = timezone.localdate()
+        longest = max(cls.WINDOWS.values())
+        stats = list(AccuracyDailyStat.objects.filter(date__gt=today - timedelta(days=longest)))
+        recommendations = [cls.ALL] + [recommendation for recommendation, _ in Accuracy.RECOMMENDATION_CHOICES]
+        refreshed_at = timezone.now()
+
+        summaries = []
+        for window, days in cls.WINDOWS.items():
+            start_date = today - timedelta(days=days - 1)
+            for recommendation in recommendations:
+                rows = [
+                    stat for stat in stats
+                    if stat.date >= start_date and recommendation in (cls.ALL, stat.recommendation)
+                ]
+                count = sum(stat.count for stat in rows)
+                total = sum(stat.total for stat in rows)
+                summaries.append(cls(
+                    window=window,
+                    recommendation=recommendation,
+                    count=count,
+                    correct=sum(stat.correct for stat in rows),
+                    average_accuracy=total / count * 100 if count else None,
+                    start_date=start_date,
+                    end_date=today,
+                    refreshed_at=refreshed_at,
+                ))
+        return cls.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=['window', 'recommendation'],
+            update_fields=['count', 'correct', 'average_accuracy', 'start_date', 'end_date', 'refreshed_at'],
+        )
+
+    @classmethod
+    def current(cls):
+        """
+        전체 요약을 {(window, recommendation): AccuracySummary} 로 반환합니다.
+        아직 없거나 날짜가 바뀌어 기간이 밀린 경우에만 다시 계산합니다.
+        """
+        summaries = {(summary.window, summary.recommendation): summary for summary in cls.objects.all()}
+        if not summaries or any(summary.end_date != timezone.localdate() for summary in summaries.values()):
+            summaries = {(summary.window, summary.recommendation): summary for summary in cls.refresh()}
+        return summaries
+
+    def __str__(self):
+        return f"{self.window} {self.recommendation}: {self.average_accuracy} ({self.count})"
+
+
+# 누적 통계에 반영되는 Accuracy 필드. 이 필드가 바뀌는 수정은 수정 전 값을 빼고 새 값을 더합니다.
+ACCURACY_STAT_FIELDS = ('accuracy', 'is_correct', 'recommendation', 'calculated_at')
+
+
+def record_accuracy_stats(added=None, removed=None):
+    """
+    누적 통계(AccuracyDailyStat, AccuracyTotal, AccuracySummary)에 added 를 더하고 removed 를 뺍니다.
+    생성은 added, 삭제는 removed, 수정은 수정 전 값을 removed 로 함께 넘깁니다.
+
+    QuerySet.update() 처럼 시그널 없이 바뀐 기록은 반영되지 않으므로 backfill_accuracy_stats 로 다시 만드세요.
+    """
+    with transaction.atomic():
+        if removed is not None:
+            AccuracyDailyStat.record(removed, sign=-1)
+            AccuracyTotal.record(removed, sign=-1)
+        if added is not None:
+            AccuracyDailyStat.record(added)
+            AccuracyTotal.record(added)
+        AccuracySummary.refresh()
+
+
+# 백테스트 결과 (reports.backtest). 리포트 x 마켓 x horizon x threshold 당 한 행이며 재채점 시 upsert 됩니다.
+class BacktestResult(models.Model):
+    main_report = models.ForeignKey(MainReport, on_delete=models.CASCADE, related_name='backtest_results')
+    market = models.CharField(max_length=20, default=DEFAULT_MARKET)
+    horizon = models.CharField(max_length=10)  # '1h', '4h', '24h' 등 (settings.BACKTEST_HORIZONS 의 키)
+    threshold = models.FloatField()  # 퍼센트
+    direction = models.SmallIntegerField()  # BUY=1, SELL=-1, HOLD=0
+    entry_price = models.FloatField()
+    exit_price = models.FloatField()
+    return_pct = models.FloatField()
+    is_correct = models.BooleanField(default=False)
+    evaluated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('main_report', 'market', 'horizon', 'threshold')
+        indexes = [models.Index(fields=['market', 'horizon', 'threshold'], name='backtest_market_rule_idx')]
+
+    def __str__(self):
+        return f"{self.main_report_id} {self.market} {self.horizon} >{self.threshold}%: {self.return_pct:.2f}% ({self.is_correct})"
+
+
+# 리포트 상세 응답 스냅샷 (reports.snapshots). 직렬화한 JSON 을 gzip 으로 압축해 저장하고 상세 API 는 이 바이트를 그대로 반환합니다.
+class ReportSnapshot(models.Model):
+    KIND_CHOICES = [('main', 'MainReport'), ('chart', 'ChartReport'), ('news', 'NewsReport')]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    version = models.PositiveIntegerField(default=1)  # 내용(etag)이 바뀔 때마다 1 증가
+    etag = models.CharField(max_length=64)  # 압축 전 JSON 의 sha256
+    content = models.BinaryField()  # gzip 으로 압축한 JSON
+    size = models.PositiveIntegerField(default=0)  # 압축 전 크기(bytes)
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} v{self.version} ({self.etag[:8]})"
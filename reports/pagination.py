@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class MainReportCursorPagination(CursorPagination):
+    """
+    (created_at, id) 기준 keyset 페이지네이션입니다. mainreport_created_id_idx 인덱스를 따라 읽으므로
+    몇 번째 페이지든 페이지 크기만큼만 조회합니다.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 10
@@ -0,0 +1,208 @@
+"""
+LLM 응답 스키마와 파싱/복구 유틸리티입니다.
+
+모든 OpenAIService 응답은 JSON 모드로 받은 뒤 여기의 pydantic 모델로 검증합니다.
+거의 맞는 JSON(코드 펜스, 끝의 쉼표, 잘린 괄호 등)은 repair_json 으로 먼저 고쳐서
+추가 API 호출 없이 사용합니다.
+"""
+import re
+import json
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class ResponseSchema(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, coerce_numbers_to_str=True, extra='ignore')
+
+
+# 차트 분석
+class IndicatorAnalysis(ResponseSchema):
+    analysis: str = ''
+    recommendation: str = ''
+
+
+class ChartTrendAnalysis(ResponseSchema):
+    technical_analysis: IndicatorAnalysis = Field(alias='Technical Analysis')
+    candlestick_patterns: IndicatorAnalysis = Field(alias='Candlestick Patterns')
+    moving_averages: IndicatorAnalysis = Field(alias='Moving Averages')
+
+
+class ChartOscillatorAnalysis(ResponseSchema):
+    bollinger_bands: IndicatorAnalysis = Field(alias='Bollinger Bands')
+    rsi: IndicatorAnalysis = Field(alias='RSI')
+    macd: IndicatorAnalysis = Field(alias='MACD')
+
+
+class ChartLevelsAnalysis(ResponseSchema):
+    fibonacci_retracement: IndicatorAnalysis = Field(alias='Fibonacci Retracement')
+    support_resistance: IndicatorAnalysis = Field(alias='Support and Resistance Levels')
+    overall_recommendation: str = Field(alias='Overall Recommendation', max_length=50)
+
+    @field_validator('overall_recommendation', mode='before')
+    @classmethod
+    def _flatten_recommendation(cls, value):
+        # {"analysis": ..., "recommendation": "Buy"} 형태로 오는 경우 recommendation 만 사용합니다.
+        if isinstance(value, dict):
+            return value.get('recommendation', '')
+        return value
+
+
+class ChartAnalysis(ChartTrendAnalysis, ChartOscillatorAnalysis, ChartLevelsAnalysis):
+    pass
+
+
+# fan-out 모드에서 요청 하나가 담당하는 지표 묶음
+CHART_ANALYSIS_GROUPS = {
+    'trend': ChartTrendAnalysis,
+    'oscillators': ChartOscillatorAnalysis,
+    'levels': ChartLevelsAnalysis,
+}
+
+
+def schema_sections(schema):
+    return [field.alias for field in schema.model_fields.values()]
+
+
+# 뉴스 분석 (NewsReport)
+class NewsAnalysis(ResponseSchema):
+    model_config = ConfigDict(populate_by_name=True, coerce_numbers_to_str=True, extra='allow')
+
+    market_sentiment: str = ''
+    key_events: list = []
+    potential_impact: str = ''
+    notable_trends: list = []
+
+
+# 개별 뉴스 기사 분석 (news.NewsItem)
+class NewsItemAnalysis(ResponseSchema):
+    id: int
+    translated_title: str = ''
+    translated_content: str = ''
+    market_sentiment: str = ''
+    tickers: list[str] = []
+    impact: str = ''
+    ai_analysis: str = ''
+
+
+class NewsBatchAnalysis(ResponseSchema):
+    results: list[NewsItemAnalysis]
+
+
+# 메인 리포트
+class MainReportAnalysis(ResponseSchema):
+    title: str = 'Default Report Title'
+    overall_analysis: str = ''
+    market_analysis: str = ''
+    chart_analysis: str = ''
+    recommendation: str
+    confidence_level: str = ''
+    reasoning: str = ''
+
+
+# 회고 분석 가중치 조정
+class WeightAdjustments(ResponseSchema):
+    overall_weight: float = 0.0
+    fear_greed_index_weight: float = 0.0
+    news_weight: float = 0.0
+    chart_overall_weight: float = 0.0
+    chart_technical_weight: float = 0.0
+    chart_candlestick_weight: float = 0.0
+    chart_moving_average_weight: float = 0.0
+    chart_bollinger_bands_weight: float = 0.0
+    chart_rsi_weight: float = 0.0
+    chart_fibonacci_weight: float = 0.0
+    chart_macd_weight: float = 0.0
+    chart_support_resistance_weight: float = 0.0
+
+    @field_validator('*', mode='before')
+    @classmethod
+    def _strip_percent(cls, value):
+        # "+5%", "-2.5 %" 같은 문자열도 숫자로 받아들입니다.
+        if isinstance(value, str):
+            return value.replace('%', '').strip()
+        return value
+
+
+class RetrospectiveAnalysis(ResponseSchema):
+    analysis: str = ''
+    weight_adjustments: WeightAdjustments
+    reasoning: str = ''
+    overall_retrospective: str = ''
+
+
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+_PYTHON_LITERALS = re.compile(r'(?<=[:\[,\s])(True|False|None)(?=\s*[,}\]])')
+
+
+def _close_truncated(text):
+    # 문자열/괄호 상태를 따라가며 닫히지 않은 것들을 닫아줍니다. (max_tokens 에서 잘린 응답)
+    stack = []
+    in_string = escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]' and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = _TRAILING_COMMA.sub(r'\1', text.rstrip().rstrip(','))
+    if text.rstrip().endswith(':'):
+        text += ' null'
+    return text + ''.join(reversed(stack))
+
+
+def repair_json(text):
+    """
+    거의 맞는 JSON 텍스트를 고칩니다. 코드 펜스/앞뒤 텍스트 제거, 끝의 쉼표 제거,
+    Python 리터럴(True/False/None) 변환, 잘린 문자열과 괄호 닫기를 순서대로 적용합니다.
+    """
+    start = text.find('{')
+    if start == -1:
+        raise SchemaError("응답에 JSON 객체가 없습니다.")
+    end = text.rfind('}')
+    candidate = text[start:end + 1] if end > start else text[start:]
+    candidate = _TRAILING_COMMA.sub(r'\1', candidate)
+    candidate = _PYTHON_LITERALS.sub(lambda m: {'True': 'true', 'False': 'false', 'None': 'null'}[m.group(1)], candidate)
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+    # 닫는 괄호가 중간에 있는 잘린 응답은 마지막 } 이후를 버리지 않고 끝까지 사용합니다.
+    try:
+        return json.loads(_close_truncated(text[start:].strip().rstrip('`').rstrip()))
+    except json.JSONDecodeError as e:
+        raise SchemaError(f"JSON 복구 실패: {e}") from e
+
+
+def parse_json(text):
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return repair_json(text or '')
+
+
+def validate_response(schema, data):
+    """
+    Returns:
+        schema 인스턴스
+
+    Raises:
+        SchemaError: 스키마와 맞지 않는 경우
+    """
+    try:
+        return schema.model_validate(data)
+    except ValidationError as e:
+        raise SchemaError(f"{schema.__name__} 검증 실패: {e.error_count()}개 오류, {e.errors()[0]['loc']}") from e
@@ -16,48 +16,64 @@ class ReportWeightsSerializer(serializers.ModelSerializer):
         model = ReportWeights
         fields = '__all__'
 
+class MainReportBundleListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # 목록 전체의 차트/뉴스/가중치 리포트를 한 번에 불러와 각 항목이 개별 조회하지 않도록 합니다.
+        reports = list(data.all() if hasattr(data, 'all') else data)
+        self.child.context.setdefault('report_bundles', {}).update(MainReport.load_bundles(reports))
+        return super().to_representation(reports)
+
 class MainReportSerializer(serializers.ModelSerializer):
+    chart_report = serializers.SerializerMethodField()
+    news_report = serializers.SerializerMethodField()
+    weights = serializers.SerializerMethodField()
+    like_count = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
 
     class Meta:
         model = MainReport
         fields = '__all__'
+        list_serializer_class = MainReportBundleListSerializer
+
+    def get_bundle(self, obj):
+        bundles = self.context.setdefault('report_bundles', {})
+        if obj.id not in bundles:
+            bundles.update(MainReport.load_bundles([obj]))
+        return bundles[obj.id]
 
     def get_chart_report(self, obj):
-        if obj.chart_report_id:
-            try:
-                chart_report = ChartReport.objects.get(id=obj.chart_report_id)
-                return ChartReportSerializer(chart_report).data
-            except ChartReport.DoesNotExist:
-                return None
-        return None
+        chart_report = self.get_bundle(obj).chart_report
+        return ChartReportSerializer(chart_report).data if chart_report else None
 
     def get_news_report(self, obj):
-        if obj.news_report_id:
-            try:
-                news_report = NewsReport.objects.get(id=obj.news_report_id)
-                return NewsReportSerializer(news_report).data
-            except NewsReport.DoesNotExist:
-                return None
-        return None
+        news_report = self.get_bundle(obj).news_report
+        return NewsReportSerializer(news_report).data if news_report else None
 
     def get_weights(self, obj):
-        if obj.weights_id:
-            try:
-                weights = ReportWeights.objects.get(id=obj.weights_id)
-                return ReportWeightsSerializer(weights).data
-            except ReportWeights.DoesNotExist:
-                return None
-        return None
+        weights = self.get_bundle(obj).weights
+        return ReportWeightsSerializer(weights).data if weights else None
+
+    def get_like_count(self, obj):
+        # MainReport.objects.with_counts() 로 조회한 경우 추가 쿼리가 없습니다.
+        return obj.like_count if hasattr(obj, 'like_count') else obj.likers.count()
+
+    def get_comment_count(self, obj):
+        return obj.comment_count if hasattr(obj, 'comment_count') else obj.comments.count()
     
     def get_average_accuracy(self, obj):
         return self.context.get('average_accuracy', None)
     
 class MainReportListSerializer(serializers.ModelSerializer):
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = MainReport
-        fields = ['id', 'title', 'recommendation', 'created_at']
+        fields = ['id', 'title', 'recommendation', 'created_at', 'like_count', 'comment_count']
 
 class SevenDayAverageAccuracySerializer(serializers.Serializer):
     seven_day_average_accuracy = serializers.CharField(allow_null=True)
     start_date = serializers.DateField()
-    end_date = serializers.DateField()
\ No newline at end of file
+    end_date = serializers.DateField()
+    refreshed_at = serializers.DateTimeField()
+    windows = serializers.DictField(child=serializers.DictField(child=serializers.CharField(allow_null=True)))
\ No newline at end of file
@@ -1,4 +1,6 @@
 from .chart_service import ChartService, ChartCapture
+from .chart_renderer import ChartRenderer, RecordedCandleSource
 from .news_service import NewsService
 from .openai_service import OpenAIService
+from .price_sampler import PriceSampler
 from .report_service import ReportService, RetrospectiveReportService
\ No newline at end of file
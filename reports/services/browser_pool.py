@@ -0,0 +1,221 @@
+# 파이썬 표준 라이브러리
+import os
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+
+# 서드파티 라이브러리
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+
+# 장고 관련 임포트
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+def _get_process_tree_rss_mb(root_pid):
+    """
+    root_pid와 그 하위 프로세스들의 RSS 합계를 MB 단위로 반환합니다. (Linux /proc 기반)
+    """
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total_kb = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f'/proc/{pid}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            pass
+        stack.extend(children.get(pid, []))
+    return total_kb / 1024
+
+
+class PooledDriver:
+    """
+    풀에서 관리되는 ChromeDriver와 사용 통계를 함께 보관합니다.
+    """
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+    @property
+    def pid(self):
+        process = getattr(self.driver.service, 'process', None)
+        return process.pid if process else None
+
+    def rss_mb(self):
+        if self.pid is None or not os.path.isdir('/proc'):
+            return 0
+        return _get_process_tree_rss_mb(self.pid)
+
+
+class BrowserPool:
+    """
+    headless Chrome 인스턴스를 미리 띄워두고 ChartCapture와 NewsService가 빌려 쓰는 풀입니다.
+
+    - 대여 전 health check를 수행하고, 응답이 없는 드라이버는 폐기합니다.
+    - BROWSER_POOL_MAX_USES 회 사용했거나 BROWSER_POOL_MAX_RSS_MB 를 넘긴 드라이버는 반납 시 재생성합니다.
+    - 작업 중 예외가 발생한 드라이버는 상태를 신뢰할 수 없으므로 풀에 돌려놓지 않습니다.
+    """
+    def __init__(self, size=None, max_uses=None, max_rss_mb=None, driver_path=None):
+        self.size = size or getattr(settings, 'BROWSER_POOL_SIZE', 1)
+        self.max_uses = max_uses or getattr(settings, 'BROWSER_POOL_MAX_USES', 20)
+        self.max_rss_mb = max_rss_mb or getattr(settings, 'BROWSER_POOL_MAX_RSS_MB', 1024)
+        self.driver_path = driver_path or getattr(settings, 'CHROMEDRIVER_PATH', '/usr/local/bin/chromedriver')
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def create_driver(self):
+        logger.info("ChromeDriver 설정 중...")
+        try:
+            chrome_options = Options()
+            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--window-size=1920,1080")
+            chrome_options.add_argument(f"user-agent={DEFAULT_USER_AGENT}")
+
+            service = Service(self.driver_path)
+
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            with self._lock:
+                self._created += 1
+            return PooledDriver(driver)
+        except Exception as e:
+            logger.error(f"ChromeDriver 생성 중 오류 발생: {e}", exc_info=True)
+            raise
+
+    def warm(self):
+        """
+        풀 크기만큼 드라이버를 미리 생성합니다. BROWSER_POOL_WARM_ON_START 가 켜진 워커에서 프로세스 시작 시 호출되며,
+        꺼져 있으면 lease() 가 첫 대여 때 드라이버를 생성합니다.
+        """
+        while self._idle.qsize() < self.size:
+            try:
+                self._idle.put(self.create_driver())
+            except Exception as e:
+                logger.error(f"브라우저 풀 warm-up 실패: {e}")
+                break
+        logger.info(f"브라우저 풀 warm-up 완료 (idle: {self._idle.qsize()})")
+
+    @staticmethod
+    def _is_healthy(pooled):
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def _needs_recycle(self, pooled):
+        if pooled.uses >= self.max_uses:
+            logger.info(f"드라이버 사용 횟수 초과 ({pooled.uses}회), 재생성합니다.")
+            return True
+        rss = pooled.rss_mb()
+        if rss > self.max_rss_mb:
+            logger.info(f"드라이버 메모리 사용량 초과 ({rss:.0f}MB), 재생성합니다.")
+            return True
+        return False
+
+    @staticmethod
+    def _reset(pooled):
+        pooled.driver.delete_all_cookies()
+        pooled.driver.get("about:blank")
+
+    @staticmethod
+    def _discard(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"ChromeDriver 종료 중 오류 발생: {e}")
+
+    def _acquire(self):
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return self.create_driver()
+            if self._is_healthy(pooled):
+                return pooled
+            logger.warning("응답하지 않는 드라이버를 폐기합니다.")
+            self._discard(pooled)
+
+    def _release(self, pooled, broken):
+        pooled.uses += 1
+        if broken or self._needs_recycle(pooled):
+            self._discard(pooled)
+            return
+        try:
+            self._reset(pooled)
+        except WebDriverException:
+            self._discard(pooled)
+            return
+        self._idle.put(pooled)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        드라이버를 빌려주는 context manager입니다.
+
+        Args:
+            timeout (float): 빈 슬롯을 기다릴 최대 시간(초). None이면 무한 대기
+
+        Yields:
+            WebDriver: 사용 가능한 ChromeDriver
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("브라우저 풀에서 드라이버를 얻지 못했습니다.")
+        pooled = None
+        broken = False
+        try:
+            pooled = self._acquire()
+            yield pooled.driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            if pooled is not None:
+                self._release(pooled, broken)
+            self._slots.release()
+
+    def shutdown(self):
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(pooled)
+        logger.info("브라우저 풀 종료")
+
+    def stats(self):
+        return {
+            'size': self.size,
+            'idle': self._idle.qsize(),
+            'created': self._created,
+        }
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,40 @@
+# 장고 관련 임포트
+from django.core.cache import cache
+
+
+class CacheStats:
+    """
+    캐시 적중/실패 횟수를 Django 캐시(Redis)에 원자적으로 누적하는 카운터입니다.
+    여러 워커 프로세스의 값이 한 곳에 모입니다.
+    """
+    def __init__(self, namespace):
+        self.namespace = namespace
+
+    def _key(self, name):
+        return f"{self.namespace}:stats:{name}"
+
+    def incr(self, name):
+        key = self._key(name)
+        try:
+            # add 는 키가 없을 때만 0으로 만들고, incr 는 Redis INCR 로 원자적으로 증가합니다.
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+        except Exception:
+            pass
+
+    def hit(self, name='hit'):
+        self.incr(name)
+
+    def miss(self):
+        self.incr('miss')
+
+    def snapshot(self, names=('hit', 'miss')):
+        values = cache.get_many([self._key(name) for name in names])
+        counts = {name: values.get(self._key(name), 0) for name in names}
+        total = sum(counts.values())
+        misses = counts.get('miss', 0)
+        counts['hit_rate'] = round((total - misses) / total, 4) if total else None
+        return counts
+
+    def reset(self, names=('hit', 'miss')):
+        cache.delete_many([self._key(name) for name in names])
@@ -0,0 +1,192 @@
+# 파이썬 표준 라이브러리
+import os
+import io
+import json
+import math
+import time
+import logging
+import traceback
+from datetime import datetime
+
+# 서드파티 라이브러리
+from PIL import Image, ImageDraw, ImageFont
+
+# 장고 관련 임포트
+from django.conf import settings
+
+# 로컬 애플리케이션 임포트
+from .. import indicators
+from ..models import Price
+from ..utils import get_candles
+
+logger = logging.getLogger(__name__)
+
+# 업비트 다크 테마와 비슷한 색상
+BACKGROUND = (23, 27, 38)
+GRID = (44, 49, 63)
+TEXT = (170, 176, 190)
+UP = (200, 74, 49)
+DOWN = (18, 97, 196)
+BB_BAND = (247, 181, 41)
+BB_MIDDLE = (146, 120, 220)
+RSI_LINE = (224, 102, 255)
+MACD_LINE = (41, 182, 246)
+SIGNAL_LINE = (255, 152, 0)
+
+
+class RecordedCandleSource:
+    """
+    저장해둔 업비트 캔들 응답(JSON)을 돌려주는 캔들 소스입니다. 테스트에서 실시간 API 대신 사용합니다.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, market="KRW-BTC", unit="minutes/60", count=200):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            candles = json.load(f)
+        candles = sorted(candles, key=lambda c: c['timestamp'])
+        return candles[-count:]
+
+
+def _to_series(values):
+    # 그리기 코드는 NaN 대신 None 으로 빈 구간을 표시합니다.
+    return [None if math.isnan(v) else v for v in values.tolist()]
+
+
+class ChartRenderer:
+    """
+    업비트 캔들 REST 데이터로 캔들스틱 + 볼린저 밴드 + RSI + MACD 차트를 직접 그립니다.
+    브라우저 없이 ChartCapture.capture_chart 와 같은 형식(image_url)의 PNG를 만듭니다.
+    """
+    def __init__(self, candle_source=None, market="KRW-BTC", unit="minutes/60", count=200, size=(1600, 1000)):
+        self.candle_source = candle_source or get_candles
+        self.market = market
+        self.unit = unit
+        self.count = count
+        self.width, self.height = size
+        self.font = ImageFont.load_default()
+        self.last_candles = []
+
+    def capture_chart(self):
+        try:
+            started = time.monotonic()
+            candles = self.candle_source(market=self.market, unit=self.unit, count=self.count)
+            if not candles:
+                logger.error("캔들 데이터가 비어 있습니다.")
+                return None
+            self.last_candles = candles
+            png = self.render_png(candles)
+            image_url = self._save_png(png)
+            self._save_current_price(candles)
+            logger.info(f"차트 렌더링 완료: {time.monotonic() - started:.3f}s")
+            return image_url
+        except Exception as e:
+            logger.error(f"차트 렌더링 중 오류 발생: {e}\n{traceback.format_exc()}")
+            return None
+
+    def render_png(self, candles):
+        arrays = indicators.candles_to_arrays(candles)
+        opens, highs, lows, closes = (arrays[key].tolist() for key in ('open', 'high', 'low', 'close'))
+
+        bb_upper, bb_middle, bb_lower = (_to_series(v) for v in indicators.bollinger_bands(arrays['close']))
+        rsi = _to_series(indicators.rsi(arrays['close'], 14))
+        macd, signal_line, histogram = (_to_series(v) for v in indicators.macd(arrays['close']))
+
+        img = Image.new('RGB', (self.width, self.height), BACKGROUND)
+        draw = ImageDraw.Draw(img)
+
+        margin_left, margin_right, margin_top, margin_bottom = 10, 110, 30, 30
+        plot_width = self.width - margin_left - margin_right
+        plot_height = self.height - margin_top - margin_bottom
+        price_box = (margin_left, margin_top, margin_left + plot_width, margin_top + int(plot_height * 0.6))
+        rsi_box = (margin_left, price_box[3] + 10, margin_left + plot_width, price_box[3] + 10 + int(plot_height * 0.18))
+        macd_box = (margin_left, rsi_box[3] + 10, margin_left + plot_width, margin_top + plot_height)
+
+        n = len(candles)
+        step = plot_width / n
+        x_of = lambda i: margin_left + step * (i + 0.5)
+
+        draw.text((margin_left, 8), f"{self.market} {self.unit}  BB(20,2)  RSI(14)  MACD(12,26,9)", fill=TEXT, font=self.font)
+
+        # 가격 패널
+        price_values = highs + lows + [v for v in bb_upper + bb_lower if v is not None]
+        price_min, price_max = min(price_values), max(price_values)
+        y_price = self._scaler(price_box, price_min, price_max)
+        self._draw_grid(draw, price_box, price_min, price_max, y_price, fmt="{:,.0f}")
+        body_width = max(1, int(step * 0.7))
+        for i in range(n):
+            color = UP if closes[i] >= opens[i] else DOWN
+            x = x_of(i)
+            draw.line([(x, y_price(highs[i])), (x, y_price(lows[i]))], fill=color)
+            top, bottom = sorted((y_price(opens[i]), y_price(closes[i])))
+            draw.rectangle([x - body_width / 2, top, x + body_width / 2, max(bottom, top + 1)], fill=color)
+        for series, color in ((bb_upper, BB_BAND), (bb_lower, BB_BAND), (bb_middle, BB_MIDDLE)):
+            self._draw_series(draw, series, x_of, y_price, color)
+
+        # RSI 패널
+        y_rsi = self._scaler(rsi_box, 0, 100)
+        self._draw_grid(draw, rsi_box, 0, 100, y_rsi, fmt="{:.0f}", levels=(30, 50, 70))
+        self._draw_series(draw, rsi, x_of, y_rsi, RSI_LINE)
+
+        # MACD 패널
+        macd_values = [v for v in macd + signal_line + histogram if v is not None]
+        macd_min, macd_max = min(macd_values), max(macd_values)
+        y_macd = self._scaler(macd_box, macd_min, macd_max)
+        self._draw_grid(draw, macd_box, macd_min, macd_max, y_macd, fmt="{:,.0f}")
+        zero = y_macd(0)
+        for i, value in enumerate(histogram):
+            if value is None:
+                continue
+            color = UP if value >= 0 else DOWN
+            top, bottom = sorted((zero, y_macd(value)))
+            draw.rectangle([x_of(i) - body_width / 2, top, x_of(i) + body_width / 2, bottom], fill=color)
+        self._draw_series(draw, macd, x_of, y_macd, MACD_LINE)
+        self._draw_series(draw, signal_line, x_of, y_macd, SIGNAL_LINE)
+
+        # 시간 축
+        for i in range(0, n, max(1, n // 8)):
+            label = candles[i]['candle_date_time_kst'][5:16].replace('T', ' ')
+            draw.text((max(margin_left, x_of(i) - 20), self.height - margin_bottom + 8), label, fill=TEXT, font=self.font)
+
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', optimize=False)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _scaler(box, low, high):
+        span = (high - low) or 1
+        top, bottom = box[1], box[3]
+        return lambda value: bottom - (value - low) / span * (bottom - top)
+
+    def _draw_grid(self, draw, box, low, high, y_of, fmt, levels=None):
+        draw.rectangle(box, outline=GRID)
+        if levels is None:
+            levels = [low + (high - low) * k / 4 for k in range(5)]
+        for level in levels:
+            y = y_of(level)
+            draw.line([(box[0], y), (box[2], y)], fill=GRID)
+            draw.text((box[2] + 6, y - 6), fmt.format(level), fill=TEXT, font=self.font)
+
+    @staticmethod
+    def _draw_series(draw, series, x_of, y_of, color):
+        points = [(x_of(i), y_of(v)) for i, v in enumerate(series) if v is not None]
+        if len(points) > 1:
+            draw.line(points, fill=color, width=2)
+
+    @staticmethod
+    def _save_png(png):
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"chart_render_{current_time}.png"
+        save_dir = os.path.join(settings.MEDIA_ROOT, 'capture_chart')
+        os.makedirs(save_dir, exist_ok=True)
+        file_path = os.path.join(save_dir, filename)
+        with open(file_path, 'wb') as f:
+            f.write(png)
+        logger.info(f"차트 이미지가 저장되었습니다: {file_path}")
+        return f"{settings.MEDIA_URL}capture_chart/{filename}"
+
+    def _save_current_price(self, candles):
+        # 마지막(진행 중) 캔들의 trade_price 가 현재가이므로 별도 ticker 호출이 필요 없습니다.
+        current_price = candles[-1]['trade_price']
+        Price.objects.create(market=self.market, trade_price=current_price)
+        logger.info(f"현재가 저장 완료: {current_price}")
@@ -1,69 +1,47 @@
 # 파이썬 표준 라이브러리
 import os
-import time
 import logging
 import io
 import traceback
+import threading
 from datetime import datetime
 
 # 서드파티 라이브러리
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, NoSuchElementException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from PIL import Image
 
 # 장고 관련 임포트
 from django.conf import settings
+from django.core.cache import cache
 
 # 로컬 애플리케이션 임포트
 from ..services.openai_service import OpenAIService
+from ..services.browser_pool import browser_pool
+from ..services.page_readiness import PageReadiness
+from ..services.chart_renderer import ChartRenderer
 from ..models import ChartReport, Price
-from ..utils import get_current_price
+from ..utils import get_current_price, get_candles
+from .. import indicators
 
 logger = logging.getLogger(__name__)
 
 class ChartCapture:
     def __init__(self):
         self.driver = None
+        self.readiness = None
+        self.last_timings = {}
 
-    def create_driver(self):
-        logger.info("ChromeDriver 설정 중...")
+    def wait_and_click(self, driver, by, value, element_name, wait_time=None):
+        # wait_time 을 주지 않으면 PAGE_READINESS_TIMEOUTS['element'] 를 사용합니다.
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-
-            service = Service('/usr/local/bin/chromedriver')
-
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            return self.driver
-        except Exception as e:
-            logger.error(f"ChromeDriver 생성 중 오류 발생: {e}")
-            raise
-
-    @staticmethod
-    def wait_and_click(driver, by, value, element_name, wait_time=30):
-        try:
-            element = WebDriverWait(driver, wait_time).until(
-                EC.presence_of_element_located((by, value))
-            )
-            driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            time.sleep(2)  # 스크롤 후 잠시 대기
-            element = WebDriverWait(driver, wait_time).until(
-                EC.element_to_be_clickable((by, value))
-            )
-            element.click()
+            readiness = self.readiness or PageReadiness(driver)
+            readiness.click(by, value, element_name, timeout=wait_time)
             logger.info(f"{element_name} 클릭 완료")
-            time.sleep(2)  # 클릭 후 잠시 대기
         except TimeoutException:
             logger.error(f"{element_name} 요소를 찾는 데 시간이 초과되었습니다.")
             driver.save_screenshot(f"error_{element_name}.png")
@@ -174,20 +152,33 @@ class ChartCapture:
 
     def capture_chart(self):
         try:
-            self.driver = self.create_driver()
-            self.driver.get("https://upbit.com/full_chart?code=CRIX.UPBIT.KRW-BTC")
-            logger.info("페이지 로드 완료")
-            time.sleep(10)
-            
-            self._perform_chart_actions()
-            image_url = self._capture_and_save_screenshot()
+            # 풀에서 미리 띄워둔 드라이버를 빌려 사용하고, 끝나면 반납합니다.
+            with browser_pool.lease() as driver:
+                self.driver = driver
+                self.readiness = PageReadiness(driver)
+                self.driver.get("https://upbit.com/full_chart?code=CRIX.UPBIT.KRW-BTC")
+                # 고정 대기 대신 문서 로드, 네트워크 유휴, 차트 캔버스 렌더링 신호를 기다립니다.
+                self.readiness.document_ready()
+                self.readiness.network_idle()
+                self.readiness.canvas_rendered()
+                logger.info("페이지 로드 완료")
+
+                self._perform_chart_actions()
+                # 지표 추가 후 데이터 요청과 다시 그리기가 끝날 때까지 대기
+                self.readiness.network_idle('indicators_network_idle')
+                self.readiness.canvas_rendered(name='indicators_rendered')
+                image_url = self._capture_and_save_screenshot()
             self._save_current_price()
             return image_url
         except Exception as e:
             logger.error(f"차트 캡처 중 오류 발생: {e}\n{traceback.format_exc()}")
             return None
         finally:
-            self._quit_driver()
+            if self.readiness:
+                self.last_timings = self.readiness.summary()
+                logger.info(f"차트 캡처 단계별 소요 시간: {self.last_timings} (총 {self.readiness.total_seconds():.2f}s)")
+            self.driver = None
+            self.readiness = None
 
     def _capture_and_save_screenshot(self):
         try:
@@ -213,15 +204,52 @@ class ChartCapture:
             Price.objects.create(market="KRW-BTC", trade_price=current_price)
         logger.info(f"현재가 저장 완료: {current_price}")
 
-    def _quit_driver(self):
-        if self.driver:
-            self.driver.quit()
-
 
 class ChartService:
     def __init__(self):
-        self.chart_capture = ChartCapture()
+        # 'native': 캔들 데이터로 직접 렌더링, 'browser': 업비트 차트 페이지 스크린샷
+        if getattr(settings, 'CHART_CAPTURE_BACKEND', 'native') == 'browser':
+            self.chart_capture = ChartCapture()
+        else:
+            self.chart_capture = ChartRenderer()
         self.openai_service = OpenAIService()
+        self.partial_result = {}
+        # fan-out 모드에서는 on_section 이 여러 스레드에서 동시에 호출됩니다.
+        self._partial_lock = threading.Lock()
+
+    # 스트리밍 중 완성된 섹션을 모아두는 캐시 키 (분석이 끝나기 전에 진행 상황을 조회할 수 있음)
+    PARTIAL_CACHE_KEY = 'chart_analysis:partial'
+
+    def _store_partial_section(self, name, value):
+        with self._partial_lock:
+            self.partial_result[name] = value
+            # 다른 스레드가 dict 를 바꾸는 동안 pickle 하지 않도록 복사본을 저장합니다.
+            cache.set(self.PARTIAL_CACHE_KEY, dict(self.partial_result), timeout=600)
+        logger.info(f"차트 분석 섹션 수신: {name}")
+
+    def _discard_partial_sections(self, names):
+        # 검증에 실패해 다시 요청하는 시도가 보낸 섹션을 지웁니다. (fan-out 에서는 다른 묶음의 섹션은 남깁니다)
+        with self._partial_lock:
+            for name in names:
+                self.partial_result.pop(name, None)
+            cache.set(self.PARTIAL_CACHE_KEY, dict(self.partial_result), timeout=600)
+        logger.info(f"차트 분석 섹션 재요청으로 폐기: {', '.join(names)}")
+
+    def compute_indicator_values(self):
+        """
+        CHART_INDICATOR_TIMEFRAMES 의 각 캔들 단위에 대해 수치 지표를 계산합니다.
+        렌더러가 이미 받아온 캔들은 다시 요청하지 않습니다.
+        """
+        values = {}
+        rendered = getattr(self.chart_capture, 'last_candles', None)
+        rendered_unit = getattr(self.chart_capture, 'unit', None)
+        for unit in getattr(settings, 'CHART_INDICATOR_TIMEFRAMES', ['minutes/60']):
+            try:
+                candles = rendered if rendered and unit == rendered_unit else get_candles(unit=unit, count=200)
+                values[unit] = indicators.compute_indicators(candles)
+            except Exception as e:
+                logger.error(f"{unit} 지표 계산 중 오류 발생: {e}")
+        return values or None
 
     def capture_and_analyze_chart(self):
         try:
@@ -230,7 +258,10 @@ class ChartService:
                 return {'error': '차트 캡처에 실패했습니다.'}
 
             file_path = os.path.join(settings.MEDIA_ROOT, image_url.replace(settings.MEDIA_URL, ""))
-            analysis_result = self.openai_service.analyze_chart(file_path)
+            self.partial_result = {}
+            analysis_result = self.openai_service.analyze_chart(
+                file_path, on_section=self._store_partial_section, on_discard=self._discard_partial_sections,
+            )
 
             if 'error' in analysis_result:
                 return {'error': analysis_result['error']}
@@ -245,7 +276,8 @@ class ChartService:
                 fibonacci_retracement_analysis=analysis_result['Fibonacci Retracement'],
                 macd_analysis=analysis_result['MACD'],
                 support_resistance_analysis=analysis_result['Support and Resistance Levels'],
-                overall_recommendation=analysis_result['Overall Recommendation']
+                overall_recommendation=analysis_result['Overall Recommendation'],
+                indicator_values=self.compute_indicator_values(),
             )
             chart_report.save()
 
@@ -0,0 +1,93 @@
+# 파이썬 표준 라이브러리
+import io
+import base64
+import logging
+
+# 서드파티 라이브러리
+from PIL import Image, ImageChops
+
+# 장고 관련 임포트
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {'WEBP': 'image/webp', 'JPEG': 'image/jpeg', 'PNG': 'image/png'}
+
+
+def crop_to_content(img, tolerance=12, padding=8):
+    """
+    모서리 픽셀을 배경색으로 보고, 배경과 다른 영역(차트 캔버스)만 남기도록 잘라냅니다.
+    """
+    rgb = img.convert('RGB')
+    background = Image.new('RGB', rgb.size, rgb.getpixel((0, 0)))
+    diff = ImageChops.difference(rgb, background).convert('L')
+    mask = diff.point(lambda value: 255 if value > tolerance else 0)
+    bbox = mask.getbbox()
+    if not bbox:
+        return rgb
+    left, top, right, bottom = bbox
+    return rgb.crop((
+        max(left - padding, 0),
+        max(top - padding, 0),
+        min(right + padding, rgb.width),
+        min(bottom + padding, rgb.height),
+    ))
+
+
+def fit_to_tiles(img, max_side=2048, short_side=768):
+    """
+    비전 모델(high detail)이 실제로 보는 해상도로 줄입니다.
+    모델은 이미지를 max_side 안에 맞춘 뒤 짧은 변을 short_side 로 다시 줄이므로,
+    그보다 큰 픽셀은 전송해도 결과에 반영되지 않습니다. 확대는 하지 않습니다.
+    """
+    width, height = img.size
+    scale = min(1.0, max_side / max(width, height))
+    scale = min(scale, short_side / min(width, height))
+    if scale >= 1.0:
+        return img
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return img.resize(size, Image.LANCZOS)
+
+
+def encode_image(img, image_format='WEBP', quality=80):
+    buffer = io.BytesIO()
+    image_format = image_format.upper()
+    if image_format == 'PNG':
+        img.save(buffer, format='PNG', optimize=True)
+    elif image_format == 'WEBP':
+        img.save(buffer, format='WEBP', quality=quality, method=6)
+    else:
+        img.save(buffer, format=image_format, quality=quality, optimize=True)
+    return buffer.getvalue(), MIME_TYPES[image_format]
+
+
+def prepare_chart_image(file_path, crop=None, image_format=None, quality=None, max_side=None, short_side=None):
+    """
+    차트 이미지를 비전 모델에 보내기 좋은 형태로 변환합니다. (크롭 → 다운샘플 → 압축 포맷 인코딩)
+
+    Args:
+        file_path (str): 원본 이미지 경로
+
+    Returns:
+        tuple: (인코딩된 bytes, MIME 타입)
+    """
+    crop = getattr(settings, 'CHART_IMAGE_CROP', True) if crop is None else crop
+    image_format = image_format or getattr(settings, 'CHART_IMAGE_FORMAT', 'WEBP')
+    quality = quality or getattr(settings, 'CHART_IMAGE_QUALITY', 80)
+    max_side = max_side or getattr(settings, 'CHART_IMAGE_MAX_SIDE', 2048)
+    short_side = short_side or getattr(settings, 'CHART_IMAGE_SHORT_SIDE', 768)
+
+    with Image.open(file_path) as img:
+        img = img.convert('RGB')
+        original_size = img.size
+        if crop:
+            img = crop_to_content(img)
+        img = fit_to_tiles(img, max_side=max_side, short_side=short_side)
+        data, mime_type = encode_image(img, image_format=image_format, quality=quality)
+
+    logger.info(f"차트 이미지 전처리: {original_size} -> {img.size}, {image_format} {len(data)} bytes")
+    return data, mime_type
+
+
+def to_data_url(data, mime_type):
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode('utf-8')}"
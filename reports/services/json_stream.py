@@ -0,0 +1,111 @@
+# 파이썬 표준 라이브러리
+import json
+
+
+class StreamParseError(ValueError):
+    pass
+
+
+class IncrementalJSONParser:
+    """
+    스트리밍으로 들어오는 JSON 객체 텍스트를 조금씩 받아, 최상위 키의 값이 닫히는 즉시 꺼내주는 파서입니다.
+
+    - 객체 앞의 ```json 같은 코드 펜스는 건너뜁니다.
+    - 객체가 시작되지 않거나 섹션이 JSON 으로 해석되지 않으면 바로 StreamParseError 를 발생시킵니다.
+    - 최상위 객체가 닫히면 done 이 True 가 되고 이후 입력은 무시합니다.
+    """
+    # 객체 시작 전 허용하는 텍스트 길이 (코드 펜스, 공백 등)
+    MAX_PREAMBLE = 64
+    CODE_FENCE = '```json'
+
+    def __init__(self):
+        self.result = {}
+        self.done = False
+        self._started = False
+        self._preamble = []
+        self._member = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # 최상위 멤버에서 다음에 올 토큰 (key → colon → value). 잘못된 시작 문자를 바로 잡아냅니다.
+        self._expect = 'key'
+
+    TOKEN_START = {'key': '"', 'colon': ':', 'value': '"{[-0123456789tfn'}
+    NEXT_TOKEN = {'key': 'colon', 'colon': 'value', 'value': None}
+
+    def feed(self, text):
+        """
+        Returns:
+            list: 이번 입력으로 완성된 (key, value) 튜플 리스트
+        """
+        sections = []
+        for char in text:
+            if self.done:
+                break
+            if not self._started:
+                self._feed_preamble(char)
+                continue
+            if self._in_string:
+                self._member.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if self._depth == 1 and self._expect and not char.isspace() and char not in ',}':
+                self._check_token_start(char)
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_member(sections)
+                    self.done = True
+                    continue
+            elif char == ',' and self._depth == 1:
+                self._finish_member(sections)
+                continue
+            self._member.append(char)
+        return sections
+
+    def _feed_preamble(self, char):
+        # 객체 앞에는 공백과 ``` 또는 ```json 코드 펜스만 허용합니다. (대화형 문장은 바로 실패)
+        if char == '{':
+            preamble = ''.join(self._preamble).strip()
+            if preamble.lower() not in ('', '```', self.CODE_FENCE):
+                raise StreamParseError(f"JSON 객체가 아닌 응답입니다: {preamble[:50]!r}")
+            self._started = True
+            self._depth = 1
+            return
+        self._preamble.append(char)
+        preamble = ''.join(self._preamble).strip()
+        if len(preamble) > self.MAX_PREAMBLE or not self.CODE_FENCE.startswith(preamble.lower()):
+            raise StreamParseError(f"JSON 객체가 아닌 응답입니다: {preamble[:50]!r}")
+
+    def _check_token_start(self, char):
+        if char not in self.TOKEN_START[self._expect]:
+            raise StreamParseError(f"잘못된 JSON {self._expect} 시작 문자입니다: {char!r}")
+        self._expect = self.NEXT_TOKEN[self._expect]
+
+    def _finish_member(self, sections):
+        member = ''.join(self._member).strip()
+        self._member = []
+        self._expect = 'key'
+        if not member:
+            return
+        try:
+            parsed = json.loads('{' + member + '}')
+        except json.JSONDecodeError as e:
+            raise StreamParseError(f"섹션을 해석할 수 없습니다: {member[:50]!r} ({e})") from e
+        for key, value in parsed.items():
+            self.result[key] = value
+            sections.append((key, value))
+
+    def close(self):
+        if not self.done:
+            raise StreamParseError("JSON 객체가 닫히기 전에 응답이 끝났습니다.")
+        return self.result
@@ -0,0 +1,188 @@
+# 파이썬 표준 라이브러리
+import os
+import json
+import time
+import hashlib
+import logging
+
+# 서드파티 라이브러리
+from asgiref.sync import sync_to_async
+
+# 장고 관련 임포트
+from django.conf import settings
+from django.core.cache import cache
+
+# 로컬 애플리케이션 임포트
+from .cache_stats import CacheStats
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    model + messages + 파라미터의 해시를 키로 OpenAI 응답 본문을 저장하는 캐시입니다.
+
+    1단계는 Django 캐시(Redis), 2단계는 디스크(LLM_CACHE_DIR)이며 둘 다 LLM_CACHE_TTL 동안 유효합니다.
+    디스크에서 찾은 응답은 Redis 로 다시 올려둡니다.
+
+    캐시는 실패해도 요청을 막지 않습니다. Redis 오류는 경고만 남기고 디스크 단계나 실제 API 호출로 넘어갑니다.
+    만료된 디스크 파일은 prune() (prune_llm_cache_task) 으로 정리합니다.
+    """
+    STAT_NAMES = ('hit', 'disk_hit', 'miss')
+
+    def __init__(self, ttl=None, cache_dir=None):
+        self.ttl = ttl or getattr(settings, 'LLM_CACHE_TTL', 60 * 60 * 24)
+        self.cache_dir = cache_dir or getattr(settings, 'LLM_CACHE_DIR', None)
+        self.enabled = getattr(settings, 'LLM_CACHE_ENABLED', True)
+        self.stats = CacheStats('llmcache')
+
+    @staticmethod
+    def make_key(**request):
+        # 이미지(base64)를 포함한 요청 전체를 정렬된 JSON 으로 만들어 해시합니다.
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _cache_key(key):
+        return f"llmcache:{key}"
+
+    def _cache_get(self, key):
+        try:
+            return cache.get(self._cache_key(key))
+        except Exception as e:
+            logger.warning(f"LLM 캐시(Redis) 조회 실패, 디스크/API 로 진행합니다: {e}")
+            return None
+
+    def _cache_set(self, key, content):
+        try:
+            cache.set(self._cache_key(key), content, timeout=self.ttl)
+        except Exception as e:
+            logger.warning(f"LLM 캐시(Redis) 저장 실패: {e}")
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)['content']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key, content):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp{os.getpid()}"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'content': content}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"LLM 캐시 디스크 저장 실패: {e}")
+
+    def get(self, key):
+        content = self._cache_get(key)
+        if content is not None:
+            self.stats.hit()
+            return content
+        content = self._read_disk(key)
+        if content is not None:
+            self.stats.hit('disk_hit')
+            self._cache_set(key, content)
+            return content
+        self.stats.miss()
+        return None
+
+    def set(self, key, content):
+        self._cache_set(key, content)
+        self._write_disk(key, content)
+
+    def invalidate(self, **request):
+        """
+        응답을 쓸 수 없었던 경우(JSON 파싱 실패 등) 재시도가 같은 응답을 받지 않도록 지웁니다.
+        """
+        key = self.make_key(**request)
+        try:
+            cache.delete(self._cache_key(key))
+        except Exception as e:
+            logger.warning(f"LLM 캐시(Redis) 삭제 실패: {e}")
+        if self.cache_dir:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def completion(self, client, **request):
+        """
+        client.chat.completions.create(**request) 의 응답 본문을 캐시를 거쳐 반환합니다.
+        """
+        if not self.enabled:
+            response = client.chat.completions.create(**request)
+            return response.choices[0].message.content
+        key = self.make_key(**request)
+        content = self.get(key)
+        if content is None:
+            response = client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+            self.set(key, content)
+        return content
+
+    async def ainvalidate(self, **request):
+        await sync_to_async(self.invalidate, thread_sensitive=False)(**request)
+
+    async def acompletion(self, client, **request):
+        """
+        AsyncOpenAI 클라이언트용 completion 입니다. Redis/디스크 I/O 는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        if not self.enabled:
+            response = await client.chat.completions.create(**request)
+            return response.choices[0].message.content
+        key = self.make_key(**request)
+        content = await sync_to_async(self.get, thread_sensitive=False)(key)
+        if content is None:
+            response = await client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+            await sync_to_async(self.set, thread_sensitive=False)(key, content)
+        return content
+
+    def prune(self):
+        """
+        LLM_CACHE_TTL 이 지난 디스크 캐시 파일(과 남은 임시 파일)을 지우고 빈 디렉터리를 정리합니다.
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return 0
+        removed = 0
+        expires_before = time.time() - self.ttl
+        for root, dirs, files in os.walk(self.cache_dir, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < expires_before:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+            if root != str(self.cache_dir):
+                try:
+                    os.rmdir(root)  # 비어 있을 때만 지워집니다.
+                except OSError:
+                    pass
+        logger.info(f"LLM 디스크 캐시 정리: {removed}개 파일 삭제")
+        return removed
+
+    def get_stats(self):
+        return self.stats.snapshot(self.STAT_NAMES)
+
+
+llm_cache = LLMResponseCache()
@@ -1,55 +1,39 @@
 import logging
 import time
 import traceback
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from .browser_pool import browser_pool
+
 logger = logging.getLogger(__name__)
 
 class NewsService:
     def __init__(self):
         self.driver = None
 
-    def create_driver(self):
-        logger.info("ChromeDriver 설정 중...")
-        try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-
-            service = Service('/usr/local/bin/chromedriver')
-
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            return self.driver
-        except Exception as e:
-            logger.error(f"ChromeDriver 생성 중 오류 발생: {e}", exc_info=True)
-            raise
-
     def crawl_news(self):
         try:
-            self.driver = self.create_driver()
-            bitcoin_url = "https://www.google.com/search?q=bitcoin+news+today&tbm=nws&tbs=qdr:d"
-            altcoin_url = "https://www.google.com/search?q=altcoin+news&tbm=nws&tbs=qdr:d"
-            
-            news_items = []
-            news_items.extend(self._crawl_single_page(bitcoin_url, "Bitcoin"))
-            news_items.extend(self._crawl_single_page(altcoin_url, "Altcoin"))
-            
-            return news_items
+            with browser_pool.lease() as driver:
+                self.driver = driver
+                return self._crawl_all()
         except Exception as e:
             logger.error(f"뉴스 크롤링 중 오류 발생: {e}\n{traceback.format_exc()}")
             return []
         finally:
-            self._quit_driver()
+            self.driver = None
+
+    def _crawl_all(self):
+        bitcoin_url = "https://www.google.com/search?q=bitcoin+news+today&tbm=nws&tbs=qdr:d"
+        altcoin_url = "https://www.google.com/search?q=altcoin+news&tbm=nws&tbs=qdr:d"
+
+        news_items = []
+        news_items.extend(self._crawl_single_page(bitcoin_url, "Bitcoin"))
+        news_items.extend(self._crawl_single_page(altcoin_url, "Altcoin"))
+
+        return news_items
 
     def _crawl_single_page(self, url, category):
         try:
@@ -95,10 +79,4 @@ class NewsService:
             return news_items
         except Exception as e:
             logger.error(f"{category} 뉴스 크롤링 중 예상치 못한 오류 발생: {str(e)}\n{traceback.format_exc()}")
-            return []
-
-    def _quit_driver(self):
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
-            logger.info("ChromeDriver 종료")
\ No newline at end of file
+            return []
\ No newline at end of file
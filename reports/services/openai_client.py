@@ -0,0 +1,123 @@
+# 파이썬 표준 라이브러리
+import asyncio
+import logging
+import threading
+import importlib.util
+
+# 서드파티 라이브러리
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+# 장고 관련 임포트
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_sync_client = None
+_async_client = None
+_loop = None
+_loop_thread = None
+
+
+def _http2_enabled():
+    # http2=True 는 h2 패키지가 있어야 동작하므로, 없으면 HTTP/1.1 keep-alive 로 둡니다.
+    return getattr(settings, 'OPENAI_HTTP2', True) and importlib.util.find_spec('h2') is not None
+
+
+def _http_options():
+    return {
+        'timeout': getattr(settings, 'OPENAI_TIMEOUT', 60),
+        'limits': httpx.Limits(
+            max_connections=getattr(settings, 'OPENAI_MAX_CONNECTIONS', 20),
+            max_keepalive_connections=getattr(settings, 'OPENAI_MAX_KEEPALIVE_CONNECTIONS', 10),
+            keepalive_expiry=getattr(settings, 'OPENAI_KEEPALIVE_EXPIRY', 30),
+        ),
+        'http2': _http2_enabled(),
+    }
+
+
+def get_openai_client():
+    """
+    프로세스 전체에서 공유하는 동기 OpenAI 클라이언트를 반환합니다.
+    커넥션 풀이 유지되므로 요청마다 TLS 핸드셰이크를 다시 하지 않습니다.
+    """
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = OpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    max_retries=getattr(settings, 'OPENAI_MAX_RETRIES', 2),
+                    http_client=httpx.Client(**_http_options()),
+                )
+    return _sync_client
+
+
+def _get_loop():
+    # AsyncOpenAI 의 커넥션은 이벤트 루프에 묶이므로, 프로세스 수명 동안 유지되는 루프를 하나 둡니다.
+    global _loop, _loop_thread
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='openai-loop', daemon=True)
+                thread.start()
+                _loop, _loop_thread = loop, thread
+    return _loop
+
+
+def run_async(coro):
+    """
+    코루틴을 공유 이벤트 루프에서 실행하고 결과를 기다립니다.
+    get_async_openai_client() 를 쓰는 코드는 이 함수로 실행해야 합니다.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def get_async_openai_client():
+    """
+    공유 이벤트 루프에 묶인 AsyncOpenAI 클라이언트를 반환합니다.
+    """
+    global _async_client
+    loop = _get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is not loop:
+        raise RuntimeError("get_async_openai_client() 는 run_async() 로 실행한 코루틴 안에서만 사용할 수 있습니다.")
+    if _async_client is None:
+        _async_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=getattr(settings, 'OPENAI_MAX_RETRIES', 2),
+            http_client=httpx.AsyncClient(**_http_options()),
+        )
+    return _async_client
+
+
+def close_openai_clients():
+    """
+    공유 클라이언트와 이벤트 루프를 정리합니다. Celery 워커 프로세스 종료 시 호출됩니다.
+    """
+    global _sync_client, _async_client, _loop, _loop_thread
+    with _lock:
+        if _sync_client is not None:
+            try:
+                _sync_client.close()
+            except Exception as e:
+                logger.warning(f"OpenAI 클라이언트 종료 중 오류: {e}")
+            _sync_client = None
+
+        if _loop is not None:
+            if _async_client is not None:
+                try:
+                    asyncio.run_coroutine_threadsafe(_async_client.close(), _loop).result(timeout=5)
+                except Exception as e:
+                    logger.warning(f"AsyncOpenAI 클라이언트 종료 중 오류: {e}")
+            _loop.call_soon_threadsafe(_loop.stop)
+            _loop_thread.join(timeout=5)
+            _loop.close()
+        _async_client = None
+        _loop = None
+        _loop_thread = None
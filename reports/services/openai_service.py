@@ -1,14 +1,13 @@
 # 파이썬 표준 라이브러리
 import logging
-import base64
 import json
-import httpx
+import time
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 # 서드파티 라이브러리
 from selenium.webdriver.support import expected_conditions as EC
 # from openai import AsyncOpenAI
-from openai import OpenAI
 
 # 장고 관련 임포트
 from django.conf import settings
@@ -17,61 +16,221 @@ from django.conf import settings
 # 로컬 애플리케이션 임포트
 from ..gpt_prompts import (
     get_chart_analysis_prompt,
+    get_chart_group_prompt,
     get_news_analysis_prompt,
 )
+from .llm_cache import llm_cache
+from .openai_client import get_openai_client
+from .image_preprocessing import prepare_chart_image, to_data_url
+from .json_stream import IncrementalJSONParser, StreamParseError
+from ..schemas import (
+    SchemaError,
+    ChartAnalysis,
+    CHART_ANALYSIS_GROUPS,
+    schema_sections,
+    NewsAnalysis,
+    MainReportAnalysis,
+    RetrospectiveAnalysis,
+    parse_json,
+    validate_response,
+)
 
 logger = logging.getLogger(__name__)
 
 class OpenAIService:
     def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            http_client=httpx.Client(timeout=60)
-        )
+        self.client = get_openai_client()
 
-    def analyze_chart(self, file_path):
-        with open(file_path, "rb") as image_file:
-            base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+    def _complete(self, **request):
+        # 같은 model + messages + 파라미터 요청은 캐시된 응답 본문을 그대로 돌려받습니다.
+        return llm_cache.completion(self.client, **request)
 
+    def _stream_sections(self, request, on_section=None):
+        """
+        응답을 스트리밍으로 받으면서 최상위 JSON 키가 닫힐 때마다 on_section(key, value) 를 호출합니다.
+        형식이 어긋나면 증분 파싱을 멈추고, OPENAI_STREAM_REPAIR_MAX_CHARS 까지만 더 받아 repair_json 으로 복구합니다.
+        그보다 길면 max_tokens 까지 기다리지 않고 스트림을 닫습니다. (잘린 응답은 캐시하지 않습니다)
+        완성된 응답은 캐시에 저장되며, 캐시 적중 시에도 섹션 단위로 on_section 이 호출됩니다.
+        """
+        parser = IncrementalJSONParser()
+        key = llm_cache.make_key(**request) if llm_cache.enabled else None
+        content = llm_cache.get(key) if key else None
+
+        if content is not None:
+            try:
+                for name, value in parser.feed(content):
+                    if on_section:
+                        on_section(name, value)
+            except StreamParseError:
+                pass
+            return self._finish_sections(parser, content)
+
+        started = time.perf_counter()
+        first_section = None
+        parse_error = None
+        repair_budget = getattr(settings, 'OPENAI_STREAM_REPAIR_MAX_CHARS', 2000)
+        truncated = False
+        parts = []
+        stream = self.client.chat.completions.create(**request, stream=True)
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Bitcoin analyst with deep knowledge of technical analysis and chart patterns. Always respond in valid JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": get_chart_analysis_prompt()
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{base64_image}"
-                                }
+            for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                parts.append(chunk.choices[0].delta.content)
+                if parse_error is not None:
+                    repair_budget -= len(parts[-1])
+                    if repair_budget < 0:
+                        truncated = True
+                        logger.warning(f"복구용으로 받은 응답이 너무 길어 스트림을 닫습니다: {parse_error}")
+                        break
+                    continue
+                try:
+                    for name, value in parser.feed(parts[-1]):
+                        if first_section is None:
+                            first_section = time.perf_counter() - started
+                        if on_section:
+                            on_section(name, value)
+                except StreamParseError as e:
+                    parse_error = e
+                    logger.info(f"스트리밍 파싱 중단, 나머지 응답을 받아 복구합니다: {e}")
+                    continue
+                if parser.done:
+                    break
+        finally:
+            stream.close()
+
+        content = ''.join(parts)
+        if first_section is not None:
+            logger.info(f"스트리밍 응답: 첫 섹션 {first_section:.2f}s, 전체 {time.perf_counter() - started:.2f}s")
+        if key and not truncated:
+            llm_cache.set(key, content)
+        return self._finish_sections(parser, content)
+
+    @staticmethod
+    def _finish_sections(parser, content):
+        """
+        증분 파서가 객체를 끝까지 읽었으면 그 결과를, 아니면 전체 텍스트를 parse_json(repair_json) 으로 복구한 결과를 반환합니다.
+        복구로 새로 얻은 섹션은 검증 후 _request_structured 가 on_section 으로 전달합니다.
+
+        Raises:
+            SchemaError: 복구할 수 없는 경우
+        """
+        try:
+            return parser.close()
+        except StreamParseError:
+            return parse_json(content)
+
+    def _request_structured(self, request, schema, stream=False, on_section=None, on_discard=None):
+        """
+        JSON 모드로 요청하고 schema 로 검증합니다.
+        거의 맞는 응답은 repair_json 으로 고쳐서 쓰고, 그래도 맞지 않을 때만 한 번 더 요청합니다.
+
+        스트리밍 중 on_section 으로 보낸 섹션이 있는 시도가 검증에 실패하면, 다시 요청하기 전에
+        on_discard(섹션 이름 리스트) 로 알려 부분 결과에서 지울 수 있게 합니다.
+        """
+        request = {**request, 'response_format': {'type': 'json_object'}}
+        attempts = getattr(settings, 'OPENAI_SCHEMA_ATTEMPTS', 2)
+        for attempt in range(1, attempts + 1):
+            emitted = []
+
+            def emit(name, value):
+                emitted.append(name)
+                on_section(name, value)
+
+            try:
+                if stream:
+                    data = self._stream_sections(request, emit if on_section else None)
+                else:
+                    data = parse_json(self._complete(**request))
+                validated = validate_response(schema, data)
+            except SchemaError as e:
+                # 캐시된 잘못된 응답을 지워야 재요청이 실제 API 로 갑니다.
+                llm_cache.invalidate(**request)
+                if emitted and on_discard:
+                    on_discard(emitted)
+                logger.warning(f"{schema.__name__} 응답 검증 실패 ({attempt}/{attempts}): {e}")
+                if attempt == attempts:
+                    raise SchemaError(str(e)) from e
+                continue
+
+            if stream and on_section:
+                # 스트리밍으로 받지 못하고 복구로 얻은 섹션은 검증을 통과한 뒤에 전달합니다.
+                for name, value in data.items():
+                    if name not in emitted:
+                        on_section(name, value)
+            return validated
+
+    @staticmethod
+    def chart_request(image_url, sections=None, max_tokens=1000):
+        return dict(
+            model="gpt-4o-mini",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert Bitcoin analyst with deep knowledge of technical analysis and chart patterns. Always respond in valid JSON format."
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": get_chart_group_prompt(sections) if sections else get_chart_analysis_prompt()
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": image_url
                             }
-                        ]
-                    }
-                ],
-                max_tokens=1000
-            )
-            
-            content = response.choices[0].message.content
-            logger.info(f"Raw API response: {content}")
-            
-            json_start = content.find('{')
-            json_end = content.rfind('}')
-            if json_start != -1 and json_end != -1:
-                content = content[json_start:json_end+1]
-            
-            return json.loads(content)
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON Decode Error: {str(e)}")
-            logger.error(f"Problematic content: {content}")
+                        }
+                    ]
+                }
+            ],
+            max_tokens=max_tokens
+        )
+
+    @classmethod
+    def chart_group_requests(cls, image_url):
+        """
+        fan-out 모드에서 지표 묶음(CHART_ANALYSIS_GROUPS)별로 보낼 요청들을 만듭니다. 이미지는 모두 같습니다.
+        """
+        max_tokens = getattr(settings, 'CHART_FANOUT_MAX_TOKENS', 500)
+        return {
+            group: cls.chart_request(image_url, sections=schema_sections(schema), max_tokens=max_tokens)
+            for group, schema in CHART_ANALYSIS_GROUPS.items()
+        }
+
+    def _analyze_chart_fanout(self, image_url, stream=False, on_section=None, on_discard=None):
+        requests = self.chart_group_requests(image_url)
+        with ThreadPoolExecutor(max_workers=len(requests), thread_name_prefix='chart-fanout') as executor:
+            futures = {
+                group: executor.submit(self._request_structured, request, CHART_ANALYSIS_GROUPS[group], stream, on_section, on_discard)
+                for group, request in requests.items()
+            }
+            merged = {}
+            for group, future in futures.items():
+                merged.update(future.result().model_dump(by_alias=True))
+        return validate_response(ChartAnalysis, merged)
+
+    def analyze_chart(self, file_path, stream=None, on_section=None, mode=None, on_discard=None):
+        """
+        mode 가 'fanout' 이면 지표 묶음별로 좁은 요청을 동시에 보내 결과를 합치고,
+        'single' 이면 한 번의 요청으로 모든 지표를 분석합니다. (기본값: CHART_ANALYSIS_MODE)
+        """
+        # 크롭/다운샘플/압축한 이미지를 보내 업로드 크기를 줄입니다.
+        image_data, mime_type = prepare_chart_image(file_path)
+        if stream is None:
+            stream = getattr(settings, 'OPENAI_STREAM_RESPONSES', True)
+        mode = mode or getattr(settings, 'CHART_ANALYSIS_MODE', 'single')
+
+        try:
+            image_url = to_data_url(image_data, mime_type)
+            if mode == 'fanout':
+                analysis = self._analyze_chart_fanout(image_url, stream, on_section, on_discard)
+            else:
+                analysis = self._request_structured(self.chart_request(image_url), ChartAnalysis, stream, on_section, on_discard)
+            return analysis.model_dump(by_alias=True)
+        except SchemaError as e:
+            logger.error(f"Invalid chart analysis response: {str(e)}")
             return {"error": f"Invalid JSON response: {str(e)}"}
         except Exception as e:
             logger.error(f"Error in analyze_chart: {str(e)}")
@@ -80,7 +239,7 @@ class OpenAIService:
     def analyze_news(self, news_items):
         try:
             news_content = json.dumps(news_items, ensure_ascii=False)
-            response = self.client.chat.completions.create(
+            request = dict(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -94,60 +253,41 @@ class OpenAIService:
                 ],
                 max_tokens=1000
             )
-            
-            analysis = response.choices[0].message.content
-            # 백틱과 ```json 제거
-            cleaned_analysis = analysis.strip().strip('```json').strip('```')
-
-            logger.info(f"News analysis raw content: {cleaned_analysis[:100]}...")
-            
-            # JSON 디코딩
-            return json.loads(cleaned_analysis)
-
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON Decode Error in analyze_news: {str(e)}")
-            logger.error(f"Problematic content: {cleaned_analysis}")
+            analysis = self._request_structured(request, NewsAnalysis)
+            return analysis.model_dump()
+        except SchemaError as e:
+            logger.error(f"Invalid news analysis response: {str(e)}")
             return {"error": f"Invalid JSON in API response: {str(e)}"}
         except Exception as e:
             logger.error(f"Error in analyze_news: {str(e)}")
             return {"error": f"Error analyzing news: {str(e)}"}
         
-    def get_main_report_analysis(self, prompt, analysis_input):
+    def get_main_report_analysis(self, prompt, analysis_input, stream=None, on_section=None, on_discard=None):
+        if stream is None:
+            stream = getattr(settings, 'OPENAI_STREAM_RESPONSES', True)
         try:
-            response = self.client.chat.completions.create(
+            request = dict(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "You are an AI assistant tasked with analyzing financial market data and providing investment recommendations."},
+                    {"role": "system", "content": "You are an AI assistant tasked with analyzing financial market data and providing investment recommendations. Always respond in valid JSON format."},
                     {"role": "user", "content": f"{prompt}\n\nHere's the data to analyze:\n{analysis_input}"}
                 ],
                 max_tokens=1000,
                 n=1,
                 temperature=0.5,
             )
-            
-            content = response.choices[0].message.content
-            logger.info(f"Raw API response: {content}")
-            # JSON 형식으로 변환
-            try:
-                parsed_content = json.loads(content)
-                return parsed_content
-            except json.JSONDecodeError:
-                # JSON 파싱에 실패한 경우, 문자열을 직접 파싱
-                logger.warning("Failed to parse JSON, attempting manual parsing")
-                parsed_content = {}
-                for line in content.split('\n'):
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        parsed_content[key.strip()] = value.strip()
-                return parsed_content
-
+            analysis = self._request_structured(request, MainReportAnalysis, stream, on_section, on_discard)
+            return analysis.model_dump()
+        except SchemaError as e:
+            logger.error(f"Invalid main report response: {str(e)}")
+            return {"error": f"Invalid JSON response: {str(e)}"}
         except Exception as e:
             logger.error(f"Error in get_main_report_analysis: {str(e)}")
             return {"error": f"Error analyzing main report data: {str(e)}"}
         
     def analyze_retrospective_report(self, report_content):
         try:
-            response = self.client.chat.completions.create(
+            request = dict(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -161,30 +301,16 @@ class OpenAIService:
                 ],
                 max_tokens=1000
             )
-
-            analysis = response.choices[0].message.content
-            logger.info(f"Raw API response content: {analysis}")
-            
-            # 백틱과 ```json 제거
-            cleaned_analysis = analysis.strip().strip('```json').strip('```')
-            
-            # JSON 파싱
-            parsed_content = json.loads(cleaned_analysis)
-            
-            if 'weight_adjustments' not in parsed_content:
-                raise ValueError("Missing 'weight_adjustments' in API response")
+            parsed_content = self._request_structured(request, RetrospectiveAnalysis).model_dump()
             
             # 응답을 파일로 저장, 테스트용
             with open('retrospective_report.txt', 'w', encoding='utf-8') as f:
-                f.write(f"Raw API response:\n{analysis}\n\n")
-                f.write(f"Cleaned and parsed response:\n{json.dumps(parsed_content, indent=2)}")
-        
+                f.write(f"Parsed response:\n{json.dumps(parsed_content, indent=2, ensure_ascii=False)}")
             
             return parsed_content
 
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON Decode Error: {str(e)}")
-            logger.error(f"Problematic content: {cleaned_analysis}")
+        except SchemaError as e:
+            logger.error(f"Invalid retrospective response: {str(e)}")
             return {"error": f"Invalid JSON response: {str(e)}"}
         except Exception as e:
             logger.error(f"Error in analyze_retrospective_report: {str(e)}")
@@ -0,0 +1,127 @@
+# 파이썬 표준 라이브러리
+import time
+import logging
+from contextlib import contextmanager
+
+# 서드파티 라이브러리
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# 장고 관련 임포트
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 단계별 기본 타임아웃(초). settings.PAGE_READINESS_TIMEOUTS 로 덮어쓸 수 있습니다.
+DEFAULT_TIMEOUTS = {
+    'document_ready': 30,
+    'network_idle': 15,
+    'canvas_rendered': 20,
+    'element': 30,
+}
+
+# 네트워크 유휴 판정: 리소스 요청 수가 이 시간(ms) 동안 변하지 않으면 유휴로 봅니다.
+DEFAULT_NETWORK_IDLE_MS = 500
+
+# resource timing 버퍼 기본값(250)에 막혀 요청 수가 멈춰 보이지 않도록 버퍼를 늘려둡니다.
+_RESOURCE_COUNT_SCRIPT = """
+if (performance.setResourceTimingBufferSize) { performance.setResourceTimingBufferSize(100000); }
+return performance.getEntriesByType('resource').length;
+"""
+
+# 캔버스 크기가 0이 아니고, 샘플링한 픽셀 중 배경과 다른 픽셀이 있으면 렌더링된 것으로 봅니다.
+_CANVAS_RENDERED_SCRIPT = """
+const canvases = Array.from(document.querySelectorAll(arguments[0]));
+const visible = canvases.filter(c => c.width > 0 && c.height > 0);
+if (!visible.length) { return false; }
+const canvas = visible.reduce((a, b) => (a.width * a.height >= b.width * b.height ? a : b));
+try {
+    const ctx = canvas.getContext('2d');
+    if (!ctx) { return true; }
+    const data = ctx.getImageData(0, 0, canvas.width, canvas.height).data;
+    const step = Math.max(4, Math.floor(data.length / 4 / 2000) * 4);
+    for (let i = step; i < data.length; i += step) {
+        if (data[i] !== data[0] || data[i + 1] !== data[1] || data[i + 2] !== data[2]) { return true; }
+    }
+    return false;
+} catch (e) {
+    return true;
+}
+"""
+
+
+class PageReadiness:
+    """
+    고정 sleep 대신 DOM/네트워크/캔버스 신호를 기다리는 준비 상태 감지기입니다.
+    각 단계에서 실제로 걸린 시간을 timings 에 기록합니다.
+    """
+    def __init__(self, driver, timeouts=None, network_idle_ms=None):
+        self.driver = driver
+        self.timeouts = {
+            **DEFAULT_TIMEOUTS,
+            **getattr(settings, 'PAGE_READINESS_TIMEOUTS', {}),
+            **(timeouts or {}),
+        }
+        self.network_idle_ms = network_idle_ms or getattr(settings, 'PAGE_NETWORK_IDLE_MS', DEFAULT_NETWORK_IDLE_MS)
+        self.timings = []
+
+    @contextmanager
+    def step(self, name):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.timings.append((name, elapsed))
+            logger.info(f"[readiness] {name}: {elapsed:.2f}s")
+
+    def total_seconds(self):
+        return sum(elapsed for _, elapsed in self.timings)
+
+    def summary(self):
+        return {name: round(elapsed, 3) for name, elapsed in self.timings}
+
+    def document_ready(self):
+        with self.step('document_ready'):
+            WebDriverWait(self.driver, self.timeouts['document_ready']).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+
+    def network_idle(self, name='network_idle'):
+        """
+        리소스 요청 수가 network_idle_ms 동안 늘어나지 않을 때까지 기다립니다.
+        타임아웃이 나더라도 페이지는 이미 쓸 수 있는 경우가 많으므로 경고만 남깁니다.
+        """
+        with self.step(name):
+            deadline = time.monotonic() + self.timeouts['network_idle']
+            poll = self.network_idle_ms / 1000 / 5
+            last_count = self.driver.execute_script(_RESOURCE_COUNT_SCRIPT)
+            stable_since = time.monotonic()
+            while time.monotonic() < deadline:
+                time.sleep(poll)
+                count = self.driver.execute_script(_RESOURCE_COUNT_SCRIPT)
+                if count != last_count:
+                    last_count = count
+                    stable_since = time.monotonic()
+                elif (time.monotonic() - stable_since) * 1000 >= self.network_idle_ms:
+                    return
+            logger.warning(f"{name} 대기 시간이 초과되었습니다. 계속 진행합니다.")
+
+    def canvas_rendered(self, selector='canvas', name='canvas_rendered'):
+        with self.step(name):
+            WebDriverWait(self.driver, self.timeouts['canvas_rendered']).until(
+                lambda d: d.execute_script(_CANVAS_RENDERED_SCRIPT, selector)
+            )
+
+    def click(self, by, value, name, timeout=None):
+        """
+        요소가 나타나고 클릭 가능해지는 즉시 클릭합니다.
+
+        Args:
+            timeout (float): 기다릴 최대 시간(초). None 이면 timeouts['element'] 를 사용합니다.
+        """
+        with self.step(f"click:{name}"):
+            wait = WebDriverWait(self.driver, timeout or self.timeouts['element'])
+            element = wait.until(EC.presence_of_element_located((by, value)))
+            self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+            wait.until(EC.element_to_be_clickable((by, value))).click()
@@ -0,0 +1,119 @@
+# 파이썬 표준 라이브러리
+import time
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+# 서드파티 라이브러리
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 장고 관련 임포트
+from django.conf import settings
+
+# 로컬 애플리케이션 임포트
+from ..models import Price, PriceRollup
+
+logger = logging.getLogger(__name__)
+
+TICKER_URL = "https://api.upbit.com/v1/ticker"
+
+
+def create_session(pool_size=4):
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+class PriceSampler:
+    """
+    업비트 ticker 를 주기적으로 조회해 Price 를 모아두었다가 bulk_create 로 한 번에 저장합니다.
+
+    - 여러 마켓을 한 번의 요청으로 조회하고, 같은 세션(keep-alive)을 계속 재사용합니다.
+    - 마지막 체결 시각이 바뀌지 않은 마켓은 저장하지 않습니다.
+    - 저장 시 PriceRollup 도 함께 갱신합니다.
+    """
+    def __init__(self, markets=None, flush_size=None, timeout=5, session=None):
+        self.markets = markets or getattr(settings, 'PRICE_SAMPLER_MARKETS', ["KRW-BTC"])
+        self.flush_size = flush_size or getattr(settings, 'PRICE_SAMPLER_FLUSH_SIZE', 100)
+        self.timeout = timeout
+        self.session = session or create_session()
+        self.buffer = []
+        self.last_trade = {}
+
+    def poll(self):
+        """
+        Returns:
+            int: 버퍼에 추가된 샘플 수
+        """
+        try:
+            response = self.session.get(TICKER_URL, params={"markets": ",".join(self.markets)}, timeout=self.timeout)
+            response.raise_for_status()
+            tickers = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"ticker 조회 실패: {e}")
+            return 0
+
+        added = 0
+        for ticker in tickers:
+            market = ticker["market"]
+            trade_timestamp = ticker.get("trade_timestamp") or ticker.get("timestamp")
+            if trade_timestamp == self.last_trade.get(market):
+                continue
+            self.last_trade[market] = trade_timestamp
+            self.buffer.append(Price(
+                market=market,
+                trade_price=ticker["trade_price"],
+                timestamp=datetime.fromtimestamp(trade_timestamp / 1000, tz=dt_timezone.utc),
+            ))
+            added += 1
+        return added
+
+    def flush(self):
+        if not self.buffer:
+            return 0
+        samples, self.buffer = self.buffer, []
+        Price.objects.bulk_create(samples, batch_size=500)
+        PriceRollup.record_many(samples)
+        logger.info(f"가격 샘플 {len(samples)}건 저장")
+        return len(samples)
+
+    def run(self, duration, interval=None):
+        """
+        duration 초 동안 interval 초마다 poll 하고, 끝나면 남은 샘플을 저장합니다.
+
+        Returns:
+            int: 저장된 샘플 수
+        """
+        interval = interval or getattr(settings, 'PRICE_SAMPLE_INTERVAL', 5)
+        saved = 0
+        deadline = time.monotonic() + duration
+        try:
+            while True:
+                started = time.monotonic()
+                self.poll()
+                if len(self.buffer) >= self.flush_size:
+                    saved += self.flush()
+                next_poll = started + interval
+                if next_poll >= deadline:
+                    break
+                time.sleep(max(0, next_poll - time.monotonic()))
+        finally:
+            saved += self.flush()
+        return saved
+
+
+_sampler = None
+
+
+def get_price_sampler():
+    # 워커 프로세스마다 세션과 마지막 체결 시각을 유지합니다.
+    global _sampler
+    if _sampler is None:
+        _sampler = PriceSampler()
+    return _sampler
@@ -0,0 +1,170 @@
+# 파이썬 표준 라이브러리
+import math
+import time
+import random
+import logging
+
+# 서드파티 라이브러리
+import msgpack
+
+# 장고 관련 임포트
+from django.conf import settings
+from django.core.cache import cache
+
+# 로컬 애플리케이션 임포트
+from ..models import MainReport
+from .cache_stats import CacheStats
+
+logger = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """
+    리포트 조회 결과를 모델 인스턴스(pickle) 대신 msgpack 으로 직렬화한 dict 로 저장하는 캐시입니다.
+
+    - 캐시 항목에 만료 시각과 계산에 걸린 시간을 함께 저장하고, 만료가 가까워지면 확률적으로 한 요청이 먼저
+      다시 계산합니다. (XFetch, probabilistic early expiration)
+    - 항목이 아예 없을 때는 락을 잡은 요청 하나만 DB 를 조회하고, 나머지는 잠깐 기다렸다가 캐시에서 읽습니다.
+    - 결과별 횟수(hit / early_refresh / lock_wait / miss)를 CacheStats 로 집계합니다.
+    - Redis 에 접근할 수 없으면 로그만 남기고 캐시 없이 loader() 로 진행합니다. (저장/삭제는 건너뜁니다)
+    """
+    STAT_NAMES = ('hit', 'early_refresh', 'lock_wait', 'miss')
+
+    def __init__(self, namespace, ttl=None, beta=None, lock_timeout=None):
+        self.namespace = namespace
+        self.ttl = ttl or getattr(settings, 'REPORT_CACHE_TTL', 60 * 60)
+        self.beta = beta or getattr(settings, 'REPORT_CACHE_XFETCH_BETA', 1.0)
+        self.lock_timeout = lock_timeout or getattr(settings, 'REPORT_CACHE_LOCK_TIMEOUT', 5)
+        self.stats = CacheStats(namespace)
+
+    def _key(self, name):
+        return f"{self.namespace}:v2:{name}"
+
+    def _cache_get(self, key):
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"리포트 캐시(Redis) 조회 실패, DB 에서 읽습니다 ({key}): {e}")
+            return None
+
+    def _cache_add(self, key):
+        # 락을 잡습니다. Redis 오류면 기다리지 않고 바로 DB 에서 읽도록 True 를 반환합니다.
+        try:
+            return cache.add(key, 1, self.lock_timeout)
+        except Exception as e:
+            logger.warning(f"리포트 캐시(Redis) 락 실패 ({key}): {e}")
+            return True
+
+    def _cache_delete(self, *keys):
+        try:
+            cache.delete_many(keys)
+        except Exception as e:
+            logger.warning(f"리포트 캐시(Redis) 삭제 실패 ({', '.join(keys)}): {e}")
+
+    def _read(self, key):
+        raw = self._cache_get(key)
+        if raw is None:
+            return None
+        try:
+            return msgpack.unpackb(raw, timestamp=3)
+        except (ValueError, TypeError, msgpack.UnpackException) as e:
+            logger.warning(f"리포트 캐시 항목을 읽을 수 없습니다 ({key}): {e}")
+            self._cache_delete(key)
+            return None
+
+    def set(self, name, data, delta=0.0):
+        """
+        Args:
+            data (dict): 저장할 값 (msgpack 으로 직렬화 가능한 값, aware datetime 포함)
+            delta (float): 값을 계산하는 데 걸린 시간(초). 클수록 더 일찍 다시 계산합니다.
+        """
+        entry = [time.time() + self.ttl, delta, data]
+        key = self._key(name)
+        try:
+            cache.set(key, msgpack.packb(entry, datetime=True), timeout=self.ttl)
+        except Exception as e:
+            logger.warning(f"리포트 캐시(Redis) 저장 실패 ({key}): {e}")
+
+    def delete(self, *names):
+        self._cache_delete(*[self._key(name) for name in names])
+
+    def _load(self, name, loader, lock_key=None):
+        try:
+            start = time.monotonic()
+            data = loader()
+            if data is not None:
+                self.set(name, data, delta=time.monotonic() - start)
+            return data
+        finally:
+            if lock_key:
+                self._cache_delete(lock_key)
+
+    def get_or_load(self, name, loader):
+        """
+        캐시된 값을 반환하고, 없거나 곧 만료될 값이면 loader() 로 다시 계산해 저장합니다.
+        loader 가 None 을 반환하면 캐시하지 않습니다.
+        """
+        key = self._key(name)
+        lock_key = f"{key}:lock"
+        entry = self._read(key)
+
+        if entry is not None:
+            expiry, delta, data = entry
+            # XFetch: -delta * beta * log(rand) 만큼 앞당긴 시각이 만료 시각을 넘으면 미리 다시 계산합니다.
+            early = time.time() - delta * self.beta * math.log(1.0 - random.random())
+            if early < expiry or not self._cache_add(lock_key):
+                self.stats.hit()
+                return data
+            self.stats.hit('early_refresh')
+            return self._load(name, loader, lock_key)
+
+        if self._cache_add(lock_key):
+            self.stats.miss()
+            return self._load(name, loader, lock_key)
+
+        # 다른 요청이 계산 중입니다. 락이 풀릴 때까지 잠깐 기다렸다가 캐시에서 읽습니다.
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self._read(key)
+            if entry is not None:
+                self.stats.hit('lock_wait')
+                return entry[2]
+            if self._cache_get(lock_key) is None:
+                break  # 계산한 요청이 저장할 값이 없었던 경우 (예: 없는 리포트)
+        self.stats.miss()
+        return self._load(name, loader)
+
+    def get_stats(self):
+        return self.stats.snapshot(self.STAT_NAMES)
+
+
+def report_to_dict(report):
+    return {field.attname: getattr(report, field.attname) for field in MainReport._meta.concrete_fields}
+
+
+def report_from_dict(data):
+    # DB 에서 읽은 것과 같은 상태(_state.adding=False)의 인스턴스로 되돌립니다.
+    return MainReport.from_db('default', list(data), list(data.values()))
+
+
+def cache_report(report):
+    # 새 리포트를 바로 latest 로 채워 두어 생성 직후 몰리는 요청이 DB 를 조회하지 않게 합니다.
+    data = report_to_dict(report)
+    report_cache.set('latest', data)
+    report_cache.set(f'id:{report.id}', data)
+
+
+def invalidate_report(report_id):
+    report_cache.delete(f'id:{report_id}', 'latest')
+
+
+def invalidate_report_list(accuracy=False):
+    # 목록 첫 페이지(좋아요/댓글 수 포함)와, accuracy=True 면 목록의 정확도 헤더도 지웁니다.
+    names = ['list:first']
+    if accuracy:
+        names.append('list:accuracy')
+    report_cache.delete(*names)
+
+
+report_cache = ReportCache('mainreport')
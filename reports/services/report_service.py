@@ -6,18 +6,15 @@ from datetime import datetime
 # 서드파티 라이브러리
 from selenium.webdriver.support import expected_conditions as EC
 
-# 장고 관련 임포트
-from django.db import models
-from django.core.cache import cache
-
 # 로컬 애플리케이션 임포트
 from ..gpt_prompts import (
     get_retrospective_analysis_prompt_template,
     get_main_report_prompt,
     basic_retrospective_analysis_prompt
 )
-from ..models import MainReport, ReportWeights, ChartReport, NewsReport, Price, Accuracy
+from ..models import MainReport, ReportWeights, ChartReport, NewsReport, Price, Accuracy, AccuracyTotal
 from ..services.openai_service import OpenAIService
+from ..services.report_cache import report_cache, report_to_dict, report_from_dict, cache_report, invalidate_report
 from ..utils import get_fear_and_greed_index
 
 logger = logging.getLogger(__name__)
@@ -26,10 +23,6 @@ class ReportService:
     def __init__(self):
         self.openai_service = OpenAIService()
 
-    @staticmethod
-    def get_cache_key(key):
-        return f"mainreport:{key}"
-
     def preprocess_data(self, data):
         chart_analysis = data['chart_analysis']
         market_analysis = data['market_analysis']
@@ -131,10 +124,7 @@ class ReportService:
                 news_report_id=latest_news_report.id if latest_news_report else None,
                 weights_id=latest_weights.id if latest_weights else None
             )
-            main_report.save()
-
-            # 캐시 업데이트
-            self.update_report_cache(main_report)
+            main_report.save()  # post_save 시그널에서 리포트 캐시(latest, id)를 채웁니다.
 
             logger.info(f"Successfully created and saved MainReport with id: {main_report.id}")
             return main_report
@@ -143,34 +133,32 @@ class ReportService:
             return None
         
     def update_report_cache(self, report):
-        cache.set(self.get_cache_key('latest'), report, timeout=3600)  # 1시간 캐시
-        cache.set(self.get_cache_key(f'id:{report.id}'), report, timeout=3600)
+        cache_report(report)
 
     def invalidate_report_cache(self, report_id):
-        cache.delete(self.get_cache_key(f'id:{report_id}'))
-        cache.delete(self.get_cache_key('latest'))
+        invalidate_report(report_id)
+
+    @staticmethod
+    def _load_latest_report():
+        report = MainReport.objects.order_by('-created_at').first()
+        return report_to_dict(report) if report else None
+
+    @staticmethod
+    def _load_report(report_id):
+        report = MainReport.objects.filter(id=report_id).first()
+        return report_to_dict(report) if report else None
 
     def get_latest_main_report(self):
-        cache_key = self.get_cache_key('latest')
-        report = cache.get(cache_key)
-        if report is None:
-            try:
-                report = MainReport.objects.latest('created_at')
-                self.update_report_cache(report)
-            except MainReport.DoesNotExist:
-                return None
-        return report
+        data = report_cache.get_or_load('latest', self._load_latest_report)
+        return report_from_dict(data) if data else None
 
     def get_main_report_by_id(self, report_id):
-        cache_key = self.get_cache_key(f'id:{report_id}')
-        report = cache.get(cache_key)
-        if report is None:
-            try:
-                report = MainReport.objects.get(id=report_id)
-                self.update_report_cache(report)
-            except MainReport.DoesNotExist:
-                return None
-        return report
+        data = report_cache.get_or_load(f'id:{report_id}', lambda: self._load_report(report_id))
+        return report_from_dict(data) if data else None
+
+    @staticmethod
+    def get_cache_stats():
+        return report_cache.get_stats()
 
 
         
@@ -179,7 +167,7 @@ class RetrospectiveReportService:
     def get_latest_data():
         main_report = MainReport.objects.order_by('-created_at').first()
         weights = ReportWeights.objects.order_by('-created_at').first()
-        current_price = Price.objects.order_by('-timestamp').first()
+        current_price = Price.objects.latest_price()
         logger.info(f"Latest Price: {current_price}")
         logger.info(f"Latest Weights: {weights}")
 
@@ -207,17 +195,17 @@ class RetrospectiveReportService:
     def create_retrospective_prompt():
         main_report = MainReport.objects.order_by('-created_at').first()
         latest_accuracy = Accuracy.objects.order_by('-calculated_at').first()
-        current_price = Price.objects.order_by('-timestamp').first()
+        current_price = Price.objects.latest_price()
         
         if not main_report or not current_price or not latest_accuracy:
             logger.warning("No sufficient data for thorough analysis. Returning basic retrospective prompt.")
             return basic_retrospective_analysis_prompt(), None
 
-        avg_accuracy = Accuracy.objects.aggregate(models.Avg('accuracy'))['accuracy__avg']
+        avg_accuracy = AccuracyTotal.average()
         if avg_accuracy is not None:
             avg_accuracy *= 100  # 퍼센트로 변환
 
-        previous_price = Price.objects.filter(timestamp__lt=current_price.timestamp).order_by('-timestamp').first()
+        previous_price = Price.objects.before(current_price.timestamp)
         
         prompt_template = get_retrospective_analysis_prompt_template()
         
@@ -0,0 +1,132 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from accounts.models import Comment
+from paw_drf.conditional import bump_validator_version
+from .models import (
+    Accuracy, Price, PriceRollup, MainReport, ChartReport, NewsReport, ReportWeights,
+    ACCURACY_STAT_FIELDS, record_accuracy_stats,
+)
+from .snapshots import schedule_refresh, delete_snapshot
+from .services.report_cache import cache_report, invalidate_report, invalidate_report_list
+
+
+@receiver(pre_save, sender=Accuracy)
+def remember_accuracy_stats(sender, instance, update_fields=None, **kwargs):
+    # 관리자 수정 등으로 통계 필드가 바뀌는지 post_save 에서 비교할 수 있도록 수정 전 값을 읽어둡니다.
+    # average_accuracy 만 다시 저장하는 경우처럼 통계 필드가 없는 update_fields 는 조회하지 않습니다.
+    instance._stats_before = None
+    if instance._state.adding or (update_fields is not None and not set(update_fields) & set(ACCURACY_STAT_FIELDS)):
+        return
+    instance._stats_before = Accuracy.objects.filter(pk=instance.pk).only(*ACCURACY_STAT_FIELDS).first()
+
+
+@receiver(post_save, sender=Accuracy)
+def update_accuracy_stats(sender, instance, created, **kwargs):
+    if created:
+        record_accuracy_stats(instance)
+    else:
+        before = getattr(instance, '_stats_before', None)
+        if before is not None and any(getattr(before, field) != getattr(instance, field) for field in ACCURACY_STAT_FIELDS):
+            record_accuracy_stats(instance, removed=before)
+    # average_accuracy 는 생성 후 다시 저장되므로 재저장 때도 목록의 정확도 헤더를 지우고 ETag 버전을 올립니다.
+    transaction.on_commit(invalidate_accuracy_header)
+
+
+@receiver(post_delete, sender=Accuracy)
+def remove_accuracy_stats(sender, instance, **kwargs):
+    record_accuracy_stats(removed=instance)
+    transaction.on_commit(invalidate_accuracy_header)
+
+
+def invalidate_accuracy_header():
+    invalidate_report_list(accuracy=True)
+    bump_validator_version('accuracy')
+
+
+def invalidate_list():
+    # 캐시된 목록 첫 페이지를 지우고 목록 ETag 버전을 올립니다. (MainReportListAPIView)
+    invalidate_report_list()
+    bump_validator_version('mainreport')
+
+
+@receiver(post_save, sender=Price)
+def update_price_rollups(sender, instance, created, **kwargs):
+    # bulk_create 로 저장하는 경우에는 시그널이 없으므로 PriceRollup.record_many 를 직접 호출합니다.
+    if created:
+        PriceRollup.record_many([instance])
+
+
+# 리포트 스냅샷 (reports.snapshots) 갱신. 새 리포트는 create_main_report_task 가 렌더링하므로 수정/삭제만 처리합니다.
+@receiver(post_save, sender=MainReport)
+def refresh_main_report_snapshot(sender, instance, created, **kwargs):
+    if not created:
+        schedule_refresh('main', [instance.id])
+
+
+@receiver(post_save, sender=ChartReport)
+@receiver(post_save, sender=NewsReport)
+@receiver(post_save, sender=ReportWeights)
+def refresh_related_report_snapshots(sender, instance, created, **kwargs):
+    # 메인 리포트 스냅샷에 차트/뉴스/가중치 리포트가 포함되어 있으므로 함께 갱신합니다.
+    if created:
+        return
+    field = {ChartReport: 'chart_report_id', NewsReport: 'news_report_id', ReportWeights: 'weights_id'}[sender]
+    if sender is ChartReport:
+        schedule_refresh('chart', [instance.id])
+    elif sender is NewsReport:
+        schedule_refresh('news', [instance.id])
+    schedule_refresh('main', MainReport.objects.filter(**{field: instance.id}).values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=MainReport)
+@receiver(post_delete, sender=ChartReport)
+@receiver(post_delete, sender=NewsReport)
+def delete_report_snapshot(sender, instance, **kwargs):
+    kind = {MainReport: 'main', ChartReport: 'chart', NewsReport: 'news'}[sender]
+    delete_snapshot(kind, instance.id)
+
+
+@receiver(m2m_changed, sender=MainReport.likers.through)
+def refresh_snapshot_on_like(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # user.liked_reports.clear() 는 pk_set 이 None 이므로 지워지기 전에 영향받는 리포트 id 를 모아둡니다.
+        instance._cleared_report_ids = list(sender.objects.filter(user_id=instance.pk).values_list('mainreport_id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    transaction.on_commit(invalidate_list)
+    if not reverse:
+        schedule_refresh('main', [instance.id])
+    elif action == 'post_clear':
+        schedule_refresh('main', getattr(instance, '_cleared_report_ids', []))
+    elif pk_set:
+        # user.liked_reports 쪽에서 변경한 경우 pk_set 이 리포트 id 입니다.
+        schedule_refresh('main', pk_set)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def refresh_snapshot_on_comment(sender, instance, **kwargs):
+    schedule_refresh('main', [instance.report_id])
+    transaction.on_commit(invalidate_list)
+
+
+# 리포트 캐시 (ReportService.get_latest_main_report / get_main_report_by_id)
+@receiver(post_save, sender=MainReport)
+def update_report_cache(sender, instance, created, **kwargs):
+    transaction.on_commit(invalidate_list)
+    if created:
+        transaction.on_commit(lambda: cache_report(instance))
+    else:
+        # 관리자 수정 등. 커밋 전후로 다른 요청이 옛 값을 다시 채우지 않도록 커밋 후에도 한 번 더 지웁니다.
+        invalidate_report(instance.id)
+        transaction.on_commit(lambda: invalidate_report(instance.id))
+
+
+@receiver(post_delete, sender=MainReport)
+def delete_report_cache(sender, instance, **kwargs):
+    report_id = instance.id
+    transaction.on_commit(lambda: invalidate_report(report_id))
+    transaction.on_commit(invalidate_list)
@@ -0,0 +1,119 @@
+"""
+리포트 상세 응답을 미리 렌더링해 두는 스냅샷 모듈입니다.
+
+리포트는 create_main_report_task 이후 바뀌지 않으므로 직렬화 결과를 한 번만 만들어 gzip 으로 저장하고,
+상세 API 는 저장된 바이트와 ETag 를 그대로 사용합니다. 좋아요/댓글/관리자 수정처럼 응답이 바뀌는 경우에는
+signals 에서 다시 렌더링합니다.
+"""
+import gzip
+import hashlib
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from rest_framework.renderers import JSONRenderer
+
+from .models import MainReport, ChartReport, NewsReport, ReportSnapshot
+from .serializers import MainReportSerializer, ChartReportSerializer, NewsReportSerializer
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_LEVEL = 6
+
+SNAPSHOT_TYPES = {
+    'main': (MainReport, MainReportSerializer),
+    'chart': (ChartReport, ChartReportSerializer),
+    'news': (NewsReport, NewsReportSerializer),
+}
+
+
+def _get_object(kind, object_id):
+    model, _ = SNAPSHOT_TYPES[kind]
+    queryset = model.objects.all()
+    if model is MainReport:
+        queryset = MainReport.objects.with_counts().prefetch_related('likers')
+    return queryset.filter(pk=object_id).first()
+
+
+def render_snapshot(kind, obj):
+    """
+    객체를 상세 API 와 같은 형태로 직렬화해 스냅샷을 저장합니다. 내용이 같으면 version 을 올리지 않습니다.
+
+    Returns:
+        ReportSnapshot
+    """
+    _, serializer_class = SNAPSHOT_TYPES[kind]
+    raw = JSONRenderer().render(serializer_class(obj).data)
+    etag = hashlib.sha256(raw).hexdigest()
+    content = gzip.compress(raw, compresslevel=COMPRESS_LEVEL, mtime=0)
+
+    with transaction.atomic():
+        snapshot, created = ReportSnapshot.objects.select_for_update().get_or_create(
+            kind=kind, object_id=obj.pk,
+            defaults={'etag': etag, 'content': content, 'size': len(raw)},
+        )
+        if not created and snapshot.etag != etag:
+            ReportSnapshot.objects.filter(pk=snapshot.pk).update(
+                etag=etag, content=content, size=len(raw), version=F('version') + 1,
+            )
+            snapshot.refresh_from_db()
+    return snapshot
+
+
+def refresh_snapshot(kind, object_id):
+    obj = _get_object(kind, object_id)
+    if obj is None:
+        ReportSnapshot.objects.filter(kind=kind, object_id=object_id).delete()
+        return None
+    return render_snapshot(kind, obj)
+
+
+def get_snapshot(kind, object_id):
+    """
+    저장된 스냅샷을 반환합니다. 없으면(예: 스냅샷 도입 전 리포트) 이 자리에서 렌더링합니다.
+
+    Returns:
+        ReportSnapshot 또는 None (객체가 없는 경우)
+    """
+    snapshot = ReportSnapshot.objects.filter(kind=kind, object_id=object_id).first()
+    if snapshot is None:
+        snapshot = refresh_snapshot(kind, object_id)
+    return snapshot
+
+
+def get_snapshot_etag(kind, object_id):
+    # If-None-Match 비교용. 압축된 본문은 읽지 않습니다.
+    return ReportSnapshot.objects.filter(kind=kind, object_id=object_id).values_list('etag', flat=True).first()
+
+
+def render_report_snapshots(main_report):
+    """
+    메인 리포트와 연결된 차트/뉴스 리포트의 스냅샷을 만듭니다. create_main_report_task 에서 호출합니다.
+    """
+    snapshots = [refresh_snapshot('main', main_report.id)]
+    if main_report.chart_report_id:
+        snapshots.append(refresh_snapshot('chart', main_report.chart_report_id))
+    if main_report.news_report_id:
+        snapshots.append(refresh_snapshot('news', main_report.news_report_id))
+    snapshots = [snapshot for snapshot in snapshots if snapshot]
+    logger.info(f"리포트 {main_report.id} 스냅샷 {len(snapshots)}개 렌더링: {[str(snapshot) for snapshot in snapshots]}")
+    return snapshots
+
+
+def schedule_refresh(kind, object_ids):
+    """
+    이미 스냅샷이 있는 객체만 트랜잭션 커밋 후 다시 렌더링합니다. (없는 객체는 다음 조회 때 렌더링됩니다)
+    """
+    object_ids = list(object_ids)
+
+    def refresh():
+        existing = ReportSnapshot.objects.filter(kind=kind, object_id__in=object_ids).values_list('object_id', flat=True)
+        for object_id in list(existing):
+            refresh_snapshot(kind, object_id)
+
+    if object_ids:
+        transaction.on_commit(refresh)
+
+
+def delete_snapshot(kind, object_id):
+    ReportSnapshot.objects.filter(kind=kind, object_id=object_id).delete()
@@ -0,0 +1,951 @@
+import io
+import os
+import gzip
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+import numpy as np
+import requests
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Comment
+from news.models import NewsItem
+from . import backtest, indicators
+from .models import (
+    ChartReport, NewsReport, ReportWeights, MainReport, Accuracy, Price,
+    AccuracyDailyStat, AccuracyTotal, AccuracySummary, ReportSnapshot, BacktestResult, PriceRollup,
+)
+from .schemas import ResponseSchema, SchemaError
+from .serializers import MainReportSerializer
+from .services.chart_renderer import ChartRenderer, RecordedCandleSource
+from .services.llm_cache import llm_cache
+from .services.openai_service import OpenAIService
+from .services.price_sampler import PriceSampler
+from .services.report_cache import ReportCache, report_cache, report_from_dict
+from .services.report_service import ReportService
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'reports-tests'}}
+
+
+class QueryPlanTests(TestCase):
+    """
+    자주 호출되는 조회 경로가 인덱스를 사용하고 정렬 단계가 없는지 EXPLAIN 으로 확인합니다. (SQLite, PostgreSQL)
+    테이블이 작으면 PostgreSQL 은 seq scan 을 고르므로 enable_seqscan 을 끄고 확인합니다.
+    """
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} 인덱스를 사용하지 않습니다:\n{plan}")
+        if connection.vendor == 'sqlite':
+            self.assertNotIn('TEMP B-TREE', plan, f"별도 정렬 단계가 있습니다:\n{plan}")
+        elif connection.vendor == 'postgresql':
+            self.assertNotIn('Sort', plan, f"별도 정렬 단계가 있습니다:\n{plan}")
+
+    def test_latest_chart_report(self):
+        self.assertUsesIndex(ChartReport.objects.order_by('-timestamp')[:1], 'chartreport_ts_idx')
+
+    def test_latest_news_report(self):
+        self.assertUsesIndex(NewsReport.objects.order_by('-created_at')[:1], 'newsreport_created_idx')
+
+    def test_latest_weights(self):
+        self.assertUsesIndex(ReportWeights.objects.order_by('-created_at')[:1], 'weights_created_idx')
+
+    def test_main_report_list(self):
+        self.assertUsesIndex(MainReport.objects.order_by('-created_at', '-id')[:10], 'mainreport_created_id_idx')
+        # MainReportListAPIView 의 조회 형태
+        self.assertUsesIndex(MainReport.objects.filter(id__lte=100).order_by('-created_at')[:10], 'mainreport_created_id_idx')
+
+    def test_latest_accuracy(self):
+        self.assertUsesIndex(Accuracy.objects.order_by('-calculated_at')[:1], 'accuracy_calculated_idx')
+
+    def test_news_item_list(self):
+        self.assertUsesIndex(NewsItem.objects.order_by('-published_date')[:20], 'newsitem_published_idx')
+
+
+class ReportFactoryMixin:
+    """
+    차트/뉴스/가중치 리포트와 좋아요/댓글이 달린 MainReport 를 만드는 테스트 도우미입니다.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = [
+            User.objects.create_user(email=f'user{i}@example.com', password='password', nickname=f'user{i}', username=f'user{i}')
+            for i in range(2)
+        ]
+
+    def create_report(self, likes=0, comments=0):
+        analysis = {'analysis': '', 'recommendation': 'Hold'}
+        chart_report = ChartReport.objects.create(
+            technical_analysis=analysis, candlestick_analysis=analysis, moving_average_analysis=analysis,
+            bollinger_bands_analysis=analysis, rsi_analysis=analysis, fibonacci_retracement_analysis=analysis,
+            macd_analysis=analysis, support_resistance_analysis=analysis, overall_recommendation='Hold',
+        )
+        news_report = NewsReport.objects.create(news_analysis={'market_sentiment': 'neutral'})
+        weights = ReportWeights.objects.create()
+        report = MainReport.objects.create(
+            title='report', recommendation='Hold, 50', reasoning='', overall_analysis='', market_analysis='', chart_analysis='',
+            chart_report_id=chart_report.id, news_report_id=news_report.id, weights_id=weights.id,
+        )
+        report.likers.add(*self.users[:likes])
+        for i in range(comments):
+            Comment.objects.create(user=self.users[i % len(self.users)], report=report, content='comment')
+        return report
+
+
+class ReportBundleTests(ReportFactoryMixin, TestCase):
+    """
+    MainReportSerializer 가 리포트 수와 관계없이 같은 수의 쿼리로 차트/뉴스/가중치 리포트와 좋아요/댓글 수를 불러오는지 확인합니다.
+    """
+    def serialize(self, reports):
+        queryset = MainReport.objects.with_counts().prefetch_related('likers').filter(id__in=[report.id for report in reports])
+        with CaptureQueriesContext(connection) as queries:
+            data = MainReportSerializer(queryset.order_by('id'), many=True).data
+        return data, len(queries)
+
+    def test_query_count_is_constant(self):
+        _, single = self.serialize([self.create_report(likes=1, comments=1)])
+        _, many = self.serialize([self.create_report(likes=i % 3, comments=i % 4) for i in range(10)])
+        self.assertEqual(single, many)
+        self.assertLessEqual(many, 5)
+
+    def test_bundle_contents(self):
+        report = self.create_report(likes=2, comments=3)
+        data, _ = self.serialize([report])
+        self.assertEqual(data[0]['chart_report']['id'], report.chart_report_id)
+        self.assertEqual(data[0]['news_report']['id'], report.news_report_id)
+        self.assertEqual(data[0]['weights']['id'], report.weights_id)
+        self.assertEqual(data[0]['like_count'], 2)
+        self.assertEqual(data[0]['comment_count'], 3)
+
+
+class ChartRendererTests(TestCase):
+    """
+    저장해둔 업비트 캔들 응답(fixtures/upbit_candles_krw_btc_60m.json, 최신순)으로 실시간 API 없이 차트를 렌더링합니다.
+    """
+    def setUp(self):
+        self.source = RecordedCandleSource(os.path.join(FIXTURE_DIR, 'upbit_candles_krw_btc_60m.json'))
+
+    def test_recorded_source_returns_oldest_first(self):
+        candles = self.source(count=50)
+        self.assertEqual(len(candles), 50)
+        timestamps = [candle['timestamp'] for candle in candles]
+        self.assertEqual(timestamps, sorted(timestamps))
+        # count 개수만큼 가장 최근 캔들을 반환합니다.
+        self.assertEqual(candles[-1], max(self.source(count=200), key=lambda candle: candle['timestamp']))
+
+    def test_render_png(self):
+        renderer = ChartRenderer(candle_source=self.source, size=(800, 500))
+        png = renderer.render_png(self.source(count=renderer.count))
+        image = Image.open(io.BytesIO(png))
+        self.assertEqual(image.format, 'PNG')
+        self.assertEqual(image.size, (800, 500))
+
+    def test_capture_chart_saves_image_and_price(self):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/'):
+            renderer = ChartRenderer(candle_source=self.source)
+            image_url = renderer.capture_chart()
+            self.assertTrue(image_url.startswith('/media/capture_chart/'))
+            self.assertTrue(os.path.exists(os.path.join(media_root, image_url[len('/media/'):])))
+        self.assertEqual(Price.objects.get().trade_price, renderer.last_candles[-1]['trade_price'])
+
+
+def reference_ema(values, period=None, alpha=None):
+    alpha = alpha if alpha is not None else 2.0 / (period + 1)
+    out, prev = [], None
+    for value in values:
+        if prev is None:
+            prev = None if np.isnan(value) else value
+        else:
+            prev = (1 - alpha) * prev + alpha * value
+        out.append(np.nan if prev is None else prev)
+    return np.array(out)
+
+
+def reference_rsi(close, period=14):
+    out = [np.nan] * len(close)
+    if len(close) <= period:
+        return np.array(out)
+    gains = [max(close[i] - close[i - 1], 0) for i in range(1, len(close))]
+    losses = [max(close[i - 1] - close[i], 0) for i in range(1, len(close))]
+    avg_gain, avg_loss = sum(gains[:period]) / period, sum(losses[:period]) / period
+    for i in range(period, len(close)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        out[i] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.array(out)
+
+
+def reference_bollinger(close, period=20, width=2.0):
+    upper, middle, lower = [], [], []
+    for i in range(len(close)):
+        if i < period - 1:
+            upper.append(np.nan), middle.append(np.nan), lower.append(np.nan)
+            continue
+        window = close[i - period + 1:i + 1]
+        mean = sum(window) / period
+        std = (sum((value - mean) ** 2 for value in window) / period) ** 0.5
+        upper.append(mean + width * std), middle.append(mean), lower.append(mean - width * std)
+    return np.array(upper), np.array(middle), np.array(lower)
+
+
+class IndicatorTests(TestCase):
+    """
+    indicators 모듈의 블록 단위 닫힌 식 계산을 단순 반복문 구현과 비교합니다.
+    EMA 블록 길이(12: 119개, RSI: 269개)를 여러 번 넘도록 긴 시계열도 확인합니다.
+    """
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.close = 80_000_000 * np.cumprod(1 + rng.normal(0, 0.004, 1000))
+
+    def assertSeriesEqual(self, actual, expected):
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-6, equal_nan=True)
+
+    def test_ema(self):
+        for period in (2, 12, 26, 200):
+            self.assertSeriesEqual(indicators.ema(self.close, period), reference_ema(self.close, period))
+
+    def test_ema_skips_leading_nan(self):
+        values = np.concatenate(([np.nan] * 5, self.close[:100]))
+        self.assertSeriesEqual(indicators.ema(values, 9), reference_ema(values, 9))
+
+    def test_macd(self):
+        macd_line, signal_line, histogram = indicators.macd(self.close)
+        expected_macd = reference_ema(self.close, 12) - reference_ema(self.close, 26)
+        expected_signal = reference_ema(expected_macd, 9)
+        self.assertSeriesEqual(macd_line, expected_macd)
+        self.assertSeriesEqual(signal_line, expected_signal)
+        self.assertSeriesEqual(histogram, expected_macd - expected_signal)
+
+    def test_rsi(self):
+        for period in (6, 14):
+            self.assertSeriesEqual(indicators.rsi(self.close, period), reference_rsi(list(self.close), period))
+
+    def test_rsi_without_losses(self):
+        self.assertEqual(indicators.rsi(np.arange(1.0, 31.0))[-1], 100.0)
+
+    def test_bollinger_bands(self):
+        for actual, expected in zip(indicators.bollinger_bands(self.close), reference_bollinger(list(self.close))):
+            self.assertSeriesEqual(actual, expected)
+
+    def test_short_series(self):
+        for length in (1, 2, 14, 15, 19, 20, 30):
+            close = self.close[:length]
+            self.assertSeriesEqual(indicators.ema(close, 12), reference_ema(close, 12))
+            self.assertSeriesEqual(indicators.rsi(close), reference_rsi(list(close)))
+            for actual, expected in zip(indicators.bollinger_bands(close), reference_bollinger(list(close))):
+                self.assertSeriesEqual(actual, expected)
+        self.assertEqual(len(indicators.ema([], 12)), 0)
+
+    def test_crossover(self):
+        def candles(close):
+            return {'open': close, 'high': close, 'low': close, 'close': close}
+
+        histogram = reference_ema(self.close, 12) - reference_ema(self.close, 26)
+        histogram -= reference_ema(histogram, 9)
+        bullish = next(i for i in range(1, len(histogram)) if histogram[i - 1] <= 0 < histogram[i])
+        bearish = next(i for i in range(1, len(histogram)) if histogram[i - 1] >= 0 > histogram[i])
+        crossover = lambda close: indicators.compute_indicators(candles(close))['macd_analysis']['crossover']
+        self.assertEqual(crossover(self.close[:bullish + 1]), 'bullish')
+        self.assertEqual(crossover(self.close[:bearish + 1]), 'bearish')
+        self.assertEqual(crossover(self.close[:bullish + 2]), 'none')
+        self.assertIsNone(crossover(self.close[:1]))
+        # 직전 히스토그램 값이 없으면(NaN) 교차 여부를 판단하지 않습니다.
+        self.assertIsNone(indicators.compute_indicators(candles(np.array([np.nan, 1.0])))['macd_analysis']['crossover'])
+
+
+class AccuracyStatsTests(TestCase):
+    """
+    Accuracy 생성/수정/삭제가 누적 통계에 반영되어, 전체 기록으로 다시 계산한 값과 같은지 확인합니다.
+    """
+    def create(self, recommendation='BUY', is_correct=True):
+        return Accuracy.objects.create(
+            accuracy=1.0 if is_correct else 0.0, recommendation=recommendation, is_correct=is_correct,
+        )
+
+    def assertStatsMatchRecords(self):
+        records = list(Accuracy.objects.all())
+        total = AccuracyTotal.objects.get(name='all')
+        self.assertEqual(total.count, len(records))
+        self.assertAlmostEqual(total.total, sum(record.accuracy for record in records))
+        self.assertEqual(total.correct, sum(record.is_correct for record in records))
+        for recommendation in ('BUY', 'SELL', 'HOLD'):
+            rows = [record for record in records if record.recommendation == recommendation]
+            self.assertEqual(AccuracyDailyStat.window(1, recommendation)['count'], len(rows))
+            self.assertEqual(AccuracyDailyStat.window(1, recommendation)['correct'], sum(row.is_correct for row in rows))
+            summary = AccuracySummary.objects.get(window='1d', recommendation=recommendation)
+            self.assertEqual((summary.count, summary.correct), (len(rows), sum(row.is_correct for row in rows)))
+
+    def test_create_update_delete(self):
+        first = self.create('BUY', True)
+        second = self.create('SELL', False)
+        self.create('HOLD', True)
+        self.assertStatsMatchRecords()
+
+        # 관리자 수정: 정답 여부와 추천을 바꿉니다.
+        second.is_correct, second.accuracy, second.recommendation = True, 1.0, 'BUY'
+        second.save()
+        self.assertStatsMatchRecords()
+
+        first.delete()
+        self.assertStatsMatchRecords()
+
+    def test_average_accuracy_save_skips_stats(self):
+        accuracy = self.create()
+        accuracy.average_accuracy = 50
+        with CaptureQueriesContext(connection) as queries:
+            accuracy.save(update_fields=['average_accuracy'])
+        self.assertEqual(len(queries), 1)
+        self.assertStatsMatchRecords()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReportSnapshotTests(ReportFactoryMixin, TestCase):
+    """
+    상세 API 가 스냅샷(gzip 바이트)을 그대로 보내고, 응답이 바뀌는 변경이 있을 때만 version 이 올라가는지 확인합니다.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+        self.report = self.create_report(likes=1, comments=1)
+
+    def get(self, report_id=None, **headers):
+        return self.client.get(reverse('main_report_detail', args=[report_id or self.report.id]), **headers)
+
+    def version(self):
+        return int(self.get()['X-Snapshot-Version'])
+
+    def test_gzip_passthrough_and_plain_response(self):
+        compressed = self.get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(bytes(compressed.content), bytes(ReportSnapshot.objects.get(kind='main', object_id=self.report.id).content))
+
+        plain = self.get()
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(json.loads(gzip.decompress(compressed.content)), json.loads(plain.content))
+        self.assertEqual(json.loads(plain.content)['like_count'], 1)
+        self.assertEqual(compressed['ETag'], plain['ETag'])
+
+    def test_if_none_match(self):
+        etag = self.get()['ETag']
+        for header in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.get(HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304, header)
+            self.assertEqual(response['ETag'], etag)
+            self.assertFalse(response.content)
+            self.assertLessEqual(len(queries), 3)  # 인증 사용자 + etag 조회
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_version_bumps(self):
+        version = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.report.likers.add(self.users[1])
+        self.assertEqual(self.version(), version + 1)
+        self.assertEqual(json.loads(self.get().content)['like_count'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(user=self.users[1], report=self.report, content='comment')
+        self.assertEqual(self.version(), version + 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.report.title = 'edited'
+            self.report.save()
+        self.assertEqual(self.version(), version + 3)
+        self.assertEqual(json.loads(self.get().content)['title'], 'edited')
+
+        # 사용자 쪽에서 좋아요를 모두 지우는 경우(pk_set 없음)에도 다시 렌더링합니다.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users[1].liked_reports.clear()
+        self.assertEqual(self.version(), version + 4)
+        self.assertEqual(json.loads(self.get().content)['like_count'], 1)
+
+    def test_missing_report(self):
+        self.assertEqual(self.get(report_id=self.report.id + 1000).status_code, 404)
+        self.assertFalse(ReportSnapshot.objects.filter(object_id=self.report.id + 1000).exists())
+
+    def test_delete_removes_snapshot(self):
+        report_id = self.report.id
+        self.get()
+        self.assertTrue(ReportSnapshot.objects.filter(kind='main', object_id=report_id).exists())
+        self.report.delete()
+        self.assertFalse(ReportSnapshot.objects.filter(kind='main', object_id=report_id).exists())
+        self.assertEqual(self.get(report_id=report_id).status_code, 404)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReportCacheTests(TestCase):
+    """
+    ReportCache.get_or_load 의 적중/미리 갱신(XFetch)/락 대기/미스 경로를 확인합니다.
+    """
+    def setUp(self):
+        cache.clear()
+        self.cache = ReportCache('test', ttl=60, lock_timeout=2)
+        self.calls = 0
+
+    def loader(self, value='fresh'):
+        def load():
+            self.calls += 1
+            return value
+        return load
+
+    def test_miss_then_hit(self):
+        self.assertEqual(self.cache.get_or_load('item', self.loader()), 'fresh')
+        self.assertEqual(self.cache.get_or_load('item', self.loader('other')), 'fresh')
+        self.assertEqual(self.calls, 1)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['miss'], stats['hit']), (1, 1))
+
+    def test_none_is_not_cached(self):
+        self.assertIsNone(self.cache.get_or_load('item', self.loader(None)))
+        self.assertIsNone(self.cache.get_or_load('item', self.loader(None)))
+        self.assertEqual(self.calls, 2)
+
+    def test_early_refresh(self):
+        # 계산 시간(delta)이 TTL 보다 훨씬 크면 만료 전에 한 요청이 미리 다시 계산합니다.
+        self.cache.set('item', 'stale', delta=1000)
+        with mock.patch('reports.services.report_cache.random.random', return_value=0.5):
+            self.assertEqual(self.cache.get_or_load('item', self.loader()), 'fresh')
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.get_stats()['early_refresh'], 1)
+        self.assertIsNone(cache.get(self.cache._key('item') + ':lock'))
+
+    def test_early_refresh_while_locked_serves_stale(self):
+        self.cache.set('item', 'stale', delta=1000)
+        cache.add(self.cache._key('item') + ':lock', 1, 10)
+        with mock.patch('reports.services.report_cache.random.random', return_value=0.5):
+            self.assertEqual(self.cache.get_or_load('item', self.loader()), 'stale')
+        self.assertEqual(self.calls, 0)
+
+    def test_lock_wait_reads_value_from_other_request(self):
+        cache.add(self.cache._key('item') + ':lock', 1, 10)
+
+        def other_request():
+            time.sleep(0.1)
+            self.cache.set('item', 'computed')
+        thread = threading.Thread(target=other_request)
+        thread.start()
+        self.assertEqual(self.cache.get_or_load('item', self.loader()), 'computed')
+        thread.join()
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(self.cache.get_stats()['lock_wait'], 1)
+
+    def test_lock_released_without_value_loads(self):
+        lock_key = self.cache._key('item') + ':lock'
+        cache.add(lock_key, 1, 10)
+        thread = threading.Timer(0.1, cache.delete, args=[lock_key])
+        thread.start()
+        started = time.monotonic()
+        self.assertEqual(self.cache.get_or_load('item', self.loader()), 'fresh')
+        thread.join()
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(self.calls, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReportCacheSignalTests(ReportFactoryMixin, TestCase):
+    """
+    새 리포트는 캐시에 바로 채워지고, 수정/삭제하면 캐시에서 지워지는지 확인합니다.
+    """
+    def setUp(self):
+        cache.clear()
+
+    def latest(self):
+        data = report_cache.get_or_load('latest', ReportService._load_latest_report)
+        return report_from_dict(data) if data else None
+
+    def test_create_warms_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            report = self.create_report()
+        with CaptureQueriesContext(connection) as queries:
+            latest = self.latest()
+            by_id = report_cache.get_or_load(f'id:{report.id}', lambda: ReportService._load_report(report.id))
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(latest.id, report.id)
+        self.assertEqual(by_id['id'], report.id)
+
+    def test_edit_invalidates(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            report = self.create_report()
+        with self.captureOnCommitCallbacks(execute=True):
+            report.title = 'edited'
+            report.save()
+        self.assertIsNone(report_cache._read(report_cache._key('latest')))
+        self.assertIsNone(report_cache._read(report_cache._key(f'id:{report.id}')))
+        self.assertEqual(self.latest().title, 'edited')
+
+    def test_delete_invalidates(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            older = self.create_report()
+            report = self.create_report()
+        report_id = report.id
+        with self.captureOnCommitCallbacks(execute=True):
+            report.delete()
+        self.assertIsNone(report_cache._read(report_cache._key(f'id:{report_id}')))
+        self.assertEqual(self.latest().id, older.id)
+
+
+class ReportCacheUnavailableTests(ReportFactoryMixin, TestCase):
+    """
+    Redis 에 접근할 수 없어도 좋아요/댓글/수정이 저장되고, 조회는 DB 에서 읽는지 확인합니다.
+    """
+    def setUp(self):
+        broken = mock.Mock()
+        for method in ('get', 'set', 'add', 'delete', 'delete_many', 'get_many', 'incr'):
+            getattr(broken, method).side_effect = ConnectionError('redis unavailable')
+        patcher = mock.patch('reports.services.report_cache.cache', broken)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_writes_succeed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            report = self.create_report()
+        with self.captureOnCommitCallbacks(execute=True):
+            report.likers.add(self.users[1])
+            Comment.objects.create(user=self.users[1], report=report, content='comment')
+            report.title = 'edited'
+            report.save()
+        self.assertEqual(report.likers.count(), 1)
+        self.assertEqual(Comment.objects.filter(report=report).count(), 1)
+
+        data = report_cache.get_or_load('latest', ReportService._load_latest_report)
+        self.assertEqual((data['id'], data['title']), (report.id, 'edited'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ALLOWED_HOSTS=['*'])
+class MainReportListTests(ReportFactoryMixin, TestCase):
+    """
+    목록의 cursor 페이지네이션과, 캐시된 첫 페이지의 링크/무효화를 확인합니다.
+    """
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reports = [self.create_report() for _ in range(25)]
+
+    def get(self, url=None, **headers):
+        response = self.client.get(url or reverse('main_report_list'), **headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_paging(self):
+        ids, url, pages = [], None, 0
+        while True:
+            data = self.get(url)
+            ids += [report['id'] for report in data['results']]
+            pages += 1
+            url = data['next']
+            if not url:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, sorted((report.id for report in self.reports), reverse=True))
+
+    def test_cached_first_page_links_follow_request_host(self):
+        first = self.get(HTTP_HOST='a.example.com')
+        self.assertTrue(first['next'].startswith('http://a.example.com/'))
+        hits = report_cache.get_stats()['hit']
+        second = self.get(HTTP_HOST='b.example.com')
+        self.assertGreater(report_cache.get_stats()['hit'], hits)  # 캐시된 첫 페이지
+        self.assertTrue(second['next'].startswith('http://b.example.com/'))
+        self.assertEqual(first['next'].split('?')[1], second['next'].split('?')[1])
+        self.assertEqual(first['results'], second['results'])
+
+    def test_first_page_invalidation(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            report = self.create_report()
+        self.assertEqual(self.get()['results'][0]['id'], report.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report.likers.add(self.users[1])
+        self.assertEqual(self.get()['results'][0]['like_count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(user=self.users[1], report=report, content='comment')
+        self.assertEqual(self.get()['results'][0]['comment_count'], 1)
+
+    def conditional_get(self, etag, **headers):
+        return self.client.get(reverse('main_report_list'), HTTP_IF_NONE_MATCH=etag, **headers)
+
+    def test_if_none_match(self):
+        etag = self.client.get(reverse('main_report_list'))['ETag']
+        # ETag 는 캐시의 버전 값으로 만들므로 304 응답에는 DB 쿼리가 없습니다.
+        with self.assertNumQueries(0):
+            not_modified = self.conditional_get(etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+        self.assertFalse(not_modified.has_header('Last-Modified'))
+        self.assertEqual(self.conditional_get('"other"').status_code, 200)
+
+    def test_without_cache_responds_without_etag(self):
+        with mock.patch('paw_drf.conditional.cache.get_many', side_effect=ConnectionError('redis unavailable')):
+            response = self.client.get(reverse('main_report_list'), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_weak_etag_round_trip(self):
+        # CompressionMiddleware 가 압축한 응답의 약한 ETag 를 그대로 보내도 304 입니다.
+        response = self.client.get(reverse('main_report_list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertEqual(self.conditional_get(response['ETag'], HTTP_ACCEPT_ENCODING='gzip').status_code, 304)
+
+    def assertEtagChanges(self, change):
+        etag = self.client.get(reverse('main_report_list'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        response = self.conditional_get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response.json()
+
+    def test_etag_changes(self):
+        report = self.reports[-1]
+        self.assertEqual(self.assertEtagChanges(lambda: report.likers.add(self.users[1]))['results'][0]['like_count'], 1)
+        self.assertEtagChanges(lambda: report.likers.remove(self.users[1]))
+        comment = Comment.objects.create(user=self.users[1], report=report, content='comment')
+        self.assertEtagChanges(comment.delete)
+
+        accuracy = Accuracy(accuracy=1.0, recommendation='BUY', is_correct=True)
+        self.assertEqual(self.assertEtagChanges(accuracy.save)['average_accuracy'], '0.00%')
+
+        # calculate_and_save_accuracy 처럼 calculated_at 을 바꾸지 않고 average_accuracy 만 다시 저장하는 경우
+        def resave():
+            accuracy.average_accuracy = 77
+            accuracy.save(update_fields=['average_accuracy'])
+        self.assertEqual(self.assertEtagChanges(resave)['average_accuracy'], '77.00%')
+
+
+class BacktestEvaluateTests(TestCase):
+    """
+    evaluate 의 진입/청산 가격(searchsorted), 채점 여부, 방향/임계값별 정답 판정을 작은 시계열로 확인합니다.
+    """
+    def setUp(self):
+        self.price_times = np.array([0, 100, 200, 300, 400], dtype=np.float64)
+        self.prices = np.array([100, 101, 99, 102, 100], dtype=np.float64)
+        # BUY, SELL, HOLD, BUY(horizon 이 시계열 끝을 넘음), BUY(진입 가격 없음)
+        self.report_times = np.array([50, 150, 250, 350, -10], dtype=np.float64)
+        self.directions = np.array([1, -1, 0, 1, 1], dtype=np.int8)
+        self.result = backtest.evaluate(
+            self.report_times, self.directions, self.price_times, self.prices,
+            horizons=[10, 100, 200], thresholds=[0.0, 1.5], hold_band=0.5,
+        )
+
+    def test_entry_and_exit_prices(self):
+        np.testing.assert_array_equal(self.result['entry_price'], [100, 101, 99, 102, np.nan])
+        # horizon 10 은 진입 이후 새 가격이 없으므로 채점하지 않습니다.
+        np.testing.assert_array_equal(self.result['scored'], [
+            [False, False, False, False, False],
+            [True, True, True, False, False],
+            [True, True, False, False, False],
+        ])
+        np.testing.assert_array_equal(self.result['exit_price'][1], [101, 99, 102, np.nan, np.nan])
+        np.testing.assert_allclose(self.result['return_pct'][1, :3], [1.0, -2 / 101 * 100, 3 / 99 * 100])
+
+    def test_is_correct(self):
+        correct = self.result['is_correct']
+        self.assertFalse(correct[0].any())
+        np.testing.assert_array_equal(correct[1, 0], [True, True, False, False, False])  # threshold 0
+        np.testing.assert_array_equal(correct[1, 1], [False, True, False, False, False])  # threshold 1.5
+        self.assertFalse(correct[2].any())  # BUY -1%, SELL +0.99%
+
+    def test_empty_inputs(self):
+        result = backtest.evaluate(self.report_times, self.directions, np.array([]), np.array([]), [100], [0.0])
+        self.assertFalse(result['scored'].any())
+        self.assertEqual(result['is_correct'].shape, (1, 1, 5))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RunBacktestCommandTests(ReportFactoryMixin, TestCase):
+    """
+    run_backtest 명령의 --days / --clear 범위와, 채점 구간만 읽는 load_price_series 를 확인합니다.
+    """
+    def setUp(self):
+        self.now = timezone.now().replace(microsecond=0)
+        self.old = self.create_report_at(self.now - timedelta(days=10), 'Buy, 70')
+        self.recent = self.create_report_at(self.now - timedelta(days=1), 'Sell, 60')
+        # 11일 전부터 1시간 간격으로 오르는 가격
+        Price.objects.bulk_create(
+            Price(market='KRW-BTC', timestamp=self.now - timedelta(hours=hours), trade_price=1000 - hours)
+            for hours in range(11 * 24)
+        )
+
+    def create_report_at(self, created_at, recommendation):
+        report = self.create_report()
+        MainReport.objects.filter(pk=report.pk).update(created_at=created_at, recommendation=recommendation)
+        return report
+
+    def run_command(self, *args):
+        call_command('run_backtest', '--horizons', '1h', '--thresholds', '0', *args, stdout=io.StringIO())
+
+    def results(self):
+        return dict(BacktestResult.objects.values_list('main_report_id', 'return_pct'))
+
+    def test_scores_reports(self):
+        self.run_command()
+        results = {result.main_report_id: result for result in BacktestResult.objects.all()}
+        self.assertEqual(set(results), {self.old.id, self.recent.id})
+        self.assertTrue(results[self.old.id].is_correct)  # BUY, 가격 상승
+        self.assertFalse(results[self.recent.id].is_correct)  # SELL, 가격 상승
+        self.assertAlmostEqual(results[self.old.id].return_pct, 1 / (1000 - 240) * 100)
+
+    def test_clear_with_days_only_clears_window(self):
+        self.run_command()
+        BacktestResult.objects.update(return_pct=999)
+        self.run_command('--days', '3', '--clear')
+        results = self.results()
+        self.assertEqual(results[self.old.id], 999)  # 기간 밖 결과는 지우지도 다시 채점하지도 않습니다.
+        self.assertNotEqual(results[self.recent.id], 999)
+
+        self.run_command('--clear')
+        self.assertNotIn(999, self.results().values())
+
+    def test_price_series_is_limited_to_window(self):
+        start, end = self.now - timedelta(days=2, minutes=30), self.now - timedelta(days=1, minutes=30)
+        times, prices = backtest.load_price_series(start=start, end=end)
+        # 진입/청산 가격을 찾을 수 있도록 start 이전의 마지막 가격과 end 이후의 첫 가격까지 포함합니다.
+        self.assertEqual(len(times), 26)
+        self.assertLessEqual(times[0], start.timestamp())
+        self.assertGreaterEqual(times[-1], end.timestamp())
+        self.assertEqual(len(backtest.load_price_series()[0]), 11 * 24)
+
+
+class PriceRollupTests(TestCase):
+    """
+    PriceRollup.record_many 의 OHLC 버킷 집계(분/시간 경계, 여러 번 나눠 기록한 값의 병합)와 rebuild_price_rollups 를 확인합니다.
+    """
+    def price(self, minute, second, trade_price, market='KRW-BTC'):
+        timestamp = datetime(2024, 10, 14, 10, 0, tzinfo=dt_timezone.utc) + timedelta(minutes=minute, seconds=second)
+        return Price(market=market, timestamp=timestamp, trade_price=Decimal(trade_price))
+
+    def rollup(self, interval, hour, minute=0, market='KRW-BTC'):
+        bucket = datetime(2024, 10, 14, hour, minute, tzinfo=dt_timezone.utc)
+        row = PriceRollup.objects.get(market=market, interval=interval, bucket=bucket)
+        return row.open, row.high, row.low, row.close, row.count
+
+    def ohlc(self, *values):
+        return tuple(Decimal(value) for value in values[:4]) + (values[4],)
+
+    def record_across_boundary(self):
+        # 10:59 -> 11:00 경계를 넘는 가격을 두 번에 나눠 기록합니다. 두 번째 호출에는 더 이른 시각의 가격이 섞여 있습니다.
+        PriceRollup.record_many([self.price(59, 30, 100), self.price(59, 50, 105), self.price(60, 40, 98)])
+        PriceRollup.record_many([self.price(60, 50, 97), self.price(60, 10, 95), self.price(59, 10, 101)])
+
+    def test_buckets_across_boundary(self):
+        self.record_across_boundary()
+        self.assertEqual(self.rollup('1m', 10, 59), self.ohlc(101, 105, 100, 105, 3))
+        self.assertEqual(self.rollup('1m', 11, 0), self.ohlc(95, 98, 95, 97, 3))
+        self.assertEqual(self.rollup('1h', 10), self.ohlc(101, 105, 100, 105, 3))
+        self.assertEqual(self.rollup('1h', 11), self.ohlc(95, 98, 95, 97, 3))
+        self.assertEqual(self.rollup('1d', 0), self.ohlc(101, 105, 95, 97, 6))
+        self.assertEqual(PriceRollup.objects.count(), 5)
+
+    def test_saving_price_updates_rollups(self):
+        self.price(59, 30, 100).save()
+        self.assertEqual(self.rollup('1m', 10, 59), self.ohlc(100, 100, 100, 100, 1))
+
+    def test_rebuild_command(self):
+        prices = [self.price(59, 30, 100), self.price(59, 50, 105), self.price(60, 40, 98), self.price(60, 50, 97),
+                  self.price(60, 10, 95), self.price(59, 10, 101), self.price(0, 0, 1, market='KRW-ETH')]
+        Price.objects.bulk_create(prices)  # 시그널이 없으므로 롤업이 없습니다.
+        PriceRollup.record_many([self.price(59, 0, 999)])  # 지워져야 하는 잘못된 롤업
+
+        call_command('rebuild_price_rollups', '--market', 'KRW-BTC', '--chunk-size', '4', stdout=io.StringIO())
+        self.assertEqual(self.rollup('1m', 10, 59), self.ohlc(101, 105, 100, 105, 3))
+        self.assertEqual(self.rollup('1d', 0), self.ohlc(101, 105, 95, 97, 6))
+        self.assertFalse(PriceRollup.objects.filter(market='KRW-ETH').exists())
+
+        call_command('rebuild_price_rollups', stdout=io.StringIO())
+        self.assertEqual(self.rollup('1m', 10, 0, market='KRW-ETH'), self.ohlc(1, 1, 1, 1, 1))
+        self.assertEqual(self.rollup('1h', 11), self.ohlc(95, 98, 95, 97, 3))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PriceSeriesTests(ReportFactoryMixin, TestCase):
+    """
+    PriceQuerySet 의 시점 조회와, 이를 쓰는 Accuracy.calculate_and_save_accuracy 의 기준 가격을 확인합니다.
+    """
+    def setUp(self):
+        self.start = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+        self.prices = Price.objects.bulk_create(
+            Price(market='KRW-BTC', timestamp=self.start + timedelta(minutes=minutes), trade_price=price)
+            for minutes, price in ((0, 100), (10, 110), (20, 121))
+        )
+        Price.objects.bulk_create([Price(market='KRW-ETH', timestamp=self.start + timedelta(minutes=15), trade_price=1)])
+
+    def test_at_or_before(self):
+        at = lambda **delta: Price.objects.at_or_before(self.start + timedelta(**delta))
+        self.assertEqual(at(minutes=10).pk, self.prices[1].pk)  # 같은 시각 포함
+        self.assertEqual(at(minutes=9, seconds=59).pk, self.prices[0].pk)
+        self.assertEqual(at(minutes=16).pk, self.prices[1].pk)  # 다른 마켓은 보지 않습니다.
+        self.assertEqual(at(hours=2).pk, self.prices[2].pk)
+        self.assertIsNone(at(seconds=-1))
+        self.assertEqual(Price.objects.before(self.prices[1].timestamp).pk, self.prices[0].pk)
+
+    def create_report_at(self, created_at, recommendation='Buy, 70'):
+        report = self.create_report()
+        MainReport.objects.filter(pk=report.pk).update(created_at=created_at, recommendation=recommendation)
+
+    def test_accuracy_uses_price_at_report_time(self):
+        self.create_report_at(self.start + timedelta(minutes=5))
+        accuracy = Accuracy.calculate_and_save_accuracy()
+        self.assertAlmostEqual(accuracy.price_change, 21.0)  # 100 -> 121 (직전 샘플이 아니라 리포트 시점 가격 기준)
+        self.assertTrue(accuracy.is_correct)
+
+    def test_accuracy_falls_back_to_previous_sample(self):
+        # 리포트 이후 새 가격이 없으면 최신 가격의 직전 샘플과 비교합니다.
+        self.create_report_at(self.start + timedelta(minutes=30), recommendation='Sell, 70')
+        accuracy = Accuracy.calculate_and_save_accuracy()
+        self.assertAlmostEqual(accuracy.price_change, 10.0)
+        self.assertFalse(accuracy.is_correct)
+
+
+class FakeTickerSession:
+    def __init__(self, *payloads):
+        self.payloads = list(payloads)
+
+    def get(self, url, params=None, timeout=None):
+        payload = self.payloads.pop(0)
+        if isinstance(payload, Exception):
+            raise payload
+        return mock.Mock(json=mock.Mock(return_value=payload), raise_for_status=mock.Mock())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PriceSamplerTests(TestCase):
+    """
+    PriceSampler 가 체결 시각이 같은 ticker 를 건너뛰고 모아서 저장하는지, sample_prices_task 가 락으로 겹쳐 실행되지 않는지 확인합니다.
+    """
+    def ticker(self, market, trade_timestamp, trade_price):
+        return {'market': market, 'trade_timestamp': trade_timestamp, 'trade_price': trade_price}
+
+    def test_dedupes_by_trade_timestamp(self):
+        session = FakeTickerSession(
+            [self.ticker('KRW-BTC', 1_700_000_000_000, 100), self.ticker('KRW-ETH', 1_700_000_000_000, 10)],
+            [self.ticker('KRW-BTC', 1_700_000_000_000, 100), self.ticker('KRW-ETH', 1_700_000_005_000, 11)],
+            requests.ConnectionError('down'),
+            [self.ticker('KRW-BTC', 1_700_000_010_000, 101)],
+        )
+        sampler = PriceSampler(markets=['KRW-BTC', 'KRW-ETH'], session=session)
+        self.assertEqual([sampler.poll() for _ in range(4)], [2, 1, 0, 1])
+        self.assertFalse(Price.objects.exists())  # flush 전에는 저장하지 않습니다.
+
+        self.assertEqual(sampler.flush(), 4)
+        self.assertEqual(sampler.flush(), 0)
+        self.assertEqual(list(Price.objects.filter(market='KRW-BTC').order_by('timestamp').values_list('trade_price', flat=True)),
+                         [Decimal(100), Decimal(101)])
+        self.assertEqual(Price.objects.get(market='KRW-ETH', trade_price=11).timestamp,
+                         datetime.fromtimestamp(1_700_000_005, tz=dt_timezone.utc))
+        self.assertEqual(PriceRollup.objects.get(market='KRW-BTC', interval='1d').count, 2)
+
+    def test_task_lock(self):
+        from paw_drf.tasks import sample_prices_task
+
+        sampler = mock.Mock(run=mock.Mock(return_value=3))
+        with mock.patch('paw_drf.tasks.get_price_sampler', return_value=sampler):
+            cache.add('sample_prices_lock', 'true', 60)
+            self.assertFalse(sample_prices_task()['success'])
+            sampler.run.assert_not_called()
+
+            cache.delete('sample_prices_lock')
+            self.assertEqual(sample_prices_task()['saved'], 3)
+            self.assertIsNone(cache.get('sample_prices_lock'))  # 끝나면 락을 풉니다.
+
+            sampler.run.side_effect = RuntimeError('boom')
+            self.assertFalse(sample_prices_task()['success'])
+            self.assertIsNone(cache.get('sample_prices_lock'))
+
+
+class SectionsSchema(ResponseSchema):
+    a: str
+    b: int
+    c: bool = False
+
+
+class FakeStream:
+    def __init__(self, parts):
+        self.parts = list(parts)
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for part in self.parts:
+            self.read += 1
+            yield mock.Mock(choices=[mock.Mock(delta=mock.Mock(content=part))])
+
+    def close(self):
+        self.closed = True
+
+
+@override_settings(CACHES=LOCMEM_CACHES, OPENAI_SCHEMA_ATTEMPTS=2)
+class StreamSectionsTests(TestCase):
+    """
+    스트리밍 응답의 섹션 전달, 복구로 얻은 섹션의 전달 시점, 재요청 전 섹션 폐기, 복구용 추가 수신 상한을 확인합니다.
+    """
+    def setUp(self):
+        self.streams = []
+        self.events = []
+        client = mock.Mock()
+        client.chat.completions.create.side_effect = lambda **request: self.streams.pop(0)
+        patcher = mock.patch('reports.services.openai_service.get_openai_client', return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache_patcher = mock.patch.object(llm_cache, 'enabled', False)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.service = OpenAIService()
+
+    def request(self, *streams):
+        self.streams = [FakeStream(parts) for parts in streams]
+        self.opened = list(self.streams)
+        return self.service._request_structured(
+            {'model': 'test', 'messages': []}, SectionsSchema, stream=True,
+            on_section=lambda name, value: self.events.append(('section', name, value)),
+            on_discard=lambda names: self.events.append(('discard', names)),
+        )
+
+    def test_discards_sections_of_invalid_attempt(self):
+        result = self.request(['{"a": "first"', '}'], ['{"a": "second",', ' "b": 2}'])
+        self.assertEqual((result.a, result.b), ('second', 2))
+        self.assertEqual(self.events, [
+            ('section', 'a', 'first'), ('discard', ['a']), ('section', 'a', 'second'), ('section', 'b', 2),
+        ])
+
+    def test_repaired_sections_are_sent_after_validation(self):
+        # Python 리터럴(True)에서 증분 파싱이 멈추고, 나머지는 repair_json 으로 복구합니다.
+        result = self.request(['{"a": "x", ', '"c": True, "b": 2}'])
+        self.assertEqual((result.b, result.c), (2, True))
+        self.assertEqual(self.events, [('section', 'a', 'x'), ('section', 'c', True), ('section', 'b', 2)])
+        self.assertEqual(len(self.opened), 1)
+
+    def test_repair_read_is_capped(self):
+        parts = ['{"a": "x", ', '"b": True, "c": "'] + ['y' * 500] * 20 + ['"}']
+        with self.settings(OPENAI_STREAM_REPAIR_MAX_CHARS=1000, OPENAI_SCHEMA_ATTEMPTS=1):
+            with self.assertRaises(SchemaError):
+                self.request(parts)
+        # 상한을 넘으면 max_tokens 까지 기다리지 않고 스트림을 닫습니다.
+        stream = self.opened[0]
+        self.assertEqual(stream.read, 5)
+        self.assertTrue(stream.closed)
+        self.assertEqual(self.events, [('section', 'a', 'x'), ('discard', ['a'])])
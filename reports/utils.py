@@ -16,6 +16,24 @@ def get_current_price(market="KRW-BTC"):
             return data[0]["trade_price"]
     return None
 
+def get_candles(market="KRW-BTC", unit="minutes/60", count=200):
+    """
+    업비트 캔들 데이터를 오래된 순서로 반환합니다.
+
+    Args:
+        market (str): 마켓 코드
+        unit (str): 캔들 단위 (minutes/1, minutes/60, minutes/240, days 등)
+        count (int): 캔들 개수 (최대 200)
+
+    Returns:
+        list: 업비트 캔들 응답 dict 리스트
+    """
+    url = f"https://api.upbit.com/v1/candles/{unit}"
+    params = {"market": market, "count": count}
+    response = requests.get(url, params=params, timeout=10)
+    response.raise_for_status()
+    return list(reversed(response.json()))
+
 def calculate_price_change(current_price, previous_price):
     current_price = Decimal(str(current_price))
     previous_price = Decimal(str(previous_price))
@@ -1,84 +1,141 @@
+import re
+import gzip
 import logging
+from urllib.parse import urlparse, parse_qs
+from django.http import Http404, HttpResponse, HttpResponseNotModified
 from rest_framework import generics
-from django.db.models import Avg
-from django.core.cache import cache
-from django.utils import timezone
-from datetime import timedelta
 from rest_framework.permissions import AllowAny
-from ..models import ChartReport, NewsReport, MainReport, ReportWeights, Accuracy
-from ..services import ReportService
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from paw_drf.conditional import ConditionalResponseMixin
+from ..models import ChartReport, NewsReport, MainReport, ReportWeights, Accuracy, AccuracySummary
+from ..snapshots import get_snapshot, get_snapshot_etag
+from ..pagination import MainReportCursorPagination
+from ..services.report_cache import report_cache
 from ..serializers import SevenDayAverageAccuracySerializer, ChartReportSerializer, NewsReportSerializer, ReportWeightsSerializer, MainReportSerializer, MainReportListSerializer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-report_service = ReportService()
+accepts_gzip = re.compile(r"\bgzip\b")
 
-class ChartReportDetailAPIView(generics.RetrieveAPIView):
+class SnapshotRetrieveMixin:
+    """
+    상세 조회를 직렬화 대신 미리 렌더링한 ReportSnapshot 으로 응답합니다.
+    If-None-Match 가 일치하면 본문을 읽지 않고 304 를, gzip 을 받는 클라이언트에는 압축된 바이트를 그대로 보냅니다.
+    """
+    snapshot_kind = None
+
+    def retrieve(self, request, *args, **kwargs):
+        object_id = int(self.kwargs[self.lookup_field])
+        etags = {tag.strip().strip('"').removeprefix('W/"') for tag in request.headers.get('If-None-Match', '').split(',')}
+        etag = get_snapshot_etag(self.snapshot_kind, object_id) if etags - {''} else None
+        if etag and (etag in etags or '*' in etags):
+            response = HttpResponseNotModified()
+            response['ETag'] = f'"{etag}"'
+            return response
+
+        snapshot = get_snapshot(self.snapshot_kind, object_id)
+        if snapshot is None:
+            raise Http404
+        content = bytes(snapshot.content)
+        if accepts_gzip.search(request.headers.get('Accept-Encoding', '')):
+            response = HttpResponse(content, content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(content), content_type='application/json')
+        response['ETag'] = f'"{snapshot.etag}"'
+        response['Vary'] = 'Accept-Encoding'
+        response['X-Snapshot-Version'] = str(snapshot.version)
+        return response
+
+class ChartReportDetailAPIView(SnapshotRetrieveMixin, generics.RetrieveAPIView):
     queryset = ChartReport.objects.all()
     serializer_class = ChartReportSerializer
+    snapshot_kind = 'chart'
 
-class NewsReportDetailAPIView(generics.RetrieveAPIView):
+class NewsReportDetailAPIView(SnapshotRetrieveMixin, generics.RetrieveAPIView):
     queryset = NewsReport.objects.all()
     serializer_class = NewsReportSerializer
+    snapshot_kind = 'news'
 
 class ReportWeightsDetailAPIView(generics.RetrieveAPIView):
     queryset = ReportWeights.objects.all()
     serializer_class = ReportWeightsSerializer
 
-class MainReportDetailAPIView(generics.RetrieveAPIView):
+class MainReportDetailAPIView(SnapshotRetrieveMixin, generics.RetrieveAPIView):
     queryset = MainReport.objects.all()
     serializer_class = MainReportSerializer
+    snapshot_kind = 'main'
 
     def get_queryset(self):
-        return MainReport.objects.all().select_related('chart_report', 'news_report', 'weights')
+        # 차트/뉴스/가중치 리포트는 MainReportSerializer 가 MainReport.load_bundles 로 한 번에 불러옵니다.
+        return MainReport.objects.with_counts().prefetch_related('likers')
     
-class MainReportListAPIView(generics.ListAPIView):
+class MainReportListAPIView(ConditionalResponseMixin, generics.ListAPIView):
     serializer_class = MainReportListSerializer
+    pagination_class = MainReportCursorPagination
+
+    # 리포트/좋아요/댓글(mainreport)과 정확도 헤더(accuracy) 버전은 signals 에서 올립니다.
+    validator_versions = ('mainreport', 'accuracy')
 
     def get_queryset(self):
-        latest_report = report_service.get_latest_main_report()
-        if latest_report:
-            # 최신 리포트부터 최대 10개의 리포트를 가져옵니다.
-            queryset = MainReport.objects.filter(id__lte=latest_report.id).order_by('-created_at')[:10]
-            # select_related를 사용하여 관련 객체들을 함께 로드합니다.
-            return queryset.select_related('chart_report', 'news_report', 'weights')
-        return MainReport.objects.none()
-
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        try:
-            latest_accuracy = Accuracy.objects.latest('calculated_at')
-            context['average_accuracy'] = f"{latest_accuracy.average_accuracy:.2f}%"
-        except Accuracy.DoesNotExist:
-            context['average_accuracy'] = None
-        return context
+        # 좋아요/댓글 수는 서브쿼리로 같은 쿼리에서 함께 가져옵니다. 정렬은 MainReportCursorPagination 이 맡습니다.
+        return MainReport.objects.with_counts()
+
+    @staticmethod
+    def get_average_accuracy():
+        def load():
+            latest_accuracy = Accuracy.objects.order_by('-calculated_at').first()
+            return {'average_accuracy': f"{latest_accuracy.average_accuracy:.2f}%" if latest_accuracy else None}
+        return report_cache.get_or_load('list:accuracy', load)['average_accuracy']
+
+    def list(self, request, *args, **kwargs):
+        # 첫 페이지는 새 리포트/좋아요/댓글이 생길 때 signals 에서 지워지므로 그때까지 캐시를 그대로 사용합니다.
+        if self.paginator.cursor_query_param in request.query_params:
+            response = super().list(request, *args, **kwargs)
+            response.data['average_accuracy'] = self.get_average_accuracy()
+            return response
+
+        cursor_param = self.paginator.cursor_query_param
+
+        def load():
+            # 링크는 요청한 호스트/스킴에 따라 달라지므로 결과와 다음 페이지 cursor 값만 캐시합니다.
+            page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+            next_link = self.paginator.get_next_link()
+            return {
+                'results': list(self.get_serializer(page, many=True).data),
+                'next_cursor': parse_qs(urlparse(next_link).query)[cursor_param][0] if next_link else None,
+            }
+        page = report_cache.get_or_load('list:first', load)
+        next_cursor = page['next_cursor']
+        return Response({
+            'next': replace_query_param(request.build_absolute_uri(), cursor_param, next_cursor) if next_cursor else None,
+            'previous': None,
+            'results': page['results'],
+            'average_accuracy': self.get_average_accuracy(),
+        })
     
 class SevenDayAverageAccuracyAPIView(generics.RetrieveAPIView):
     serializer_class = SevenDayAverageAccuracySerializer
     permission_classes = [AllowAny]
 
     def get_object(self):
-        cache_key = "seven_day_average_accuracy"
-        cached_data = cache.get(cache_key)
-
-        if cached_data is not None:
-            return cached_data
-
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=7)
-        
-        seven_day_accuracy = Accuracy.objects.filter(
-            calculated_at__range=(start_date, end_date)
-        ).aggregate(avg_accuracy=Avg('average_accuracy'))
-
-        result = {
-            'seven_day_average_accuracy': f"{seven_day_accuracy['avg_accuracy']:.2f}%" if seven_day_accuracy['avg_accuracy'] else None,
-            'start_date': start_date.date(),
-            'end_date': end_date.date()
-        }
+        # calculate_accuracy_task 가 갱신해 둔 AccuracySummary 를 그대로 읽습니다. (집계 쿼리 없음)
+        summaries = AccuracySummary.current()
+        seven_day = summaries[('7d', AccuracySummary.ALL)]
 
-        # 캐시에 결과 저장 (예: 1시간 동안)
-        cache.set(cache_key, result, 3600)
-
-        return result   
\ No newline at end of file
+        return {
+            'seven_day_average_accuracy': f"{seven_day.average_accuracy:.2f}%" if seven_day.average_accuracy is not None else None,
+            'start_date': seven_day.start_date,
+            'end_date': seven_day.end_date,
+            'refreshed_at': seven_day.refreshed_at,
+            'windows': {
+                window: {
+                    recommendation: f"{summary.average_accuracy:.2f}%" if summary.average_accuracy is not None else None
+                    for (summary_window, recommendation), summary in summaries.items()
+                    if summary_window == window
+                }
+                for window in AccuracySummary.WINDOWS
+            },
+        }